@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from backend.services.acta_service import ActaService
-from backend.schemas.acta_schema import ActaRead, ActaCreate
+from backend.schemas.acta_schema import ActaRead, ActaCreate, ActaListItem
 from backend.database.connection import get_db
 from typing import List
 from fastapi import Query
@@ -13,7 +13,7 @@ from backend.services.audit_logger import AuditLogger
 router = APIRouter(prefix="/actas", tags=["Actas"])
 
 
-@router.get("", response_model=List[ActaRead])
+@router.get("", response_model=List[ActaListItem])
 def listar_actas(
     db: Session = Depends(get_db),
     response: Response = None,
@@ -22,44 +22,26 @@ def listar_actas(
     current_user=Depends(get_current_user)
 ):
     service = ActaService(db)
-    items = service.get_all()
-    print(f"[DEBUG] Param filter recibido: {filter}")
-    if filter:
-        import json
-        try:
-            filter_dict = json.loads(filter)
-            print(f"[DEBUG] filter_dict: {filter_dict}")
-            if 'IdExpediente' in filter_dict:
-                id_expediente = int(filter_dict['IdExpediente'])
-                print(f"[DEBUG] Buscando expediente con IdExpediente = {id_expediente}")
-                # Buscar el expediente y su IdTransaccion
-                from backend.repositories.expediente_respositorie import ExpedienteRepository
-                expediente_repo = ExpedienteRepository(db)
-                expediente = expediente_repo.get_by_id(id_expediente)
-                if expediente and hasattr(expediente, 'IdTransaccion'):
-                    id_transaccion = expediente.IdTransaccion
-                    print(f"[DEBUG] IdTransaccion del expediente: {id_transaccion}")
-                    # Buscar actas por IdTransaccionPadre (join con Transaccion)
-                    items = service.get_by_transaccion_padre(id_transaccion)
-                else:
-                    print(f"[DEBUG] Expediente no encontrado o sin IdTransaccion")
-                    items = []
-        except Exception as e:
-            print(f"[DEBUG] Error al parsear filter o buscar actas por transaccion: {e}")
-    total = len(items)
 
-    # Parse range param (ejemplo: '[0,9]')
-    start, end = 0, total - 1
+    # Parse range param (ejemplo: '[0,9]'); sin range devuelve todas
+    start, limit = 0, None
     if range:
         import json
         try:
             start, end = json.loads(range)
+            limit = end - start + 1
         except Exception:
             pass
 
-    paginated_items = items[start:end+1]
-    response.headers["Content-Range"] = f"actas {start}-{end}/{total}"
-    return paginated_items
+    try:
+        items, total = service.get_filtered_paginated(filter, offset=start, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if items:
+        response.headers["Content-Range"] = f"actas {start}-{start + len(items) - 1}/{total}"
+    else:
+        response.headers["Content-Range"] = f"actas */{total}"
+    return items
 
 @router.get("/{id_acta}", response_model=dict)
 def obtener_acta(id_acta: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
@@ -106,7 +88,6 @@ def actualizar_acta(id_acta: int, acta_data: dict, db: Session = Depends(get_db)
     AuditLogger(db, current_user).log_update(
         entidad="Acta",
         entity_id=id_acta,
-        changes=acta_data,
     )
     return updated
 
@@ -3,16 +3,22 @@ from backend.models.acta_model import Acta
 from backend.models.resolucion_model import Resolucion
 from backend.models.transaccion_model import Transaccion
 
-from fastapi import APIRouter, Depends, HTTPException, Response, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query, Header
 from sqlalchemy.orm import Session, joinedload
 from backend.services.alerta_service import AlertaService
-from backend.schemas.alerta_schema import AlertaCreate, AlertaUpdate, AlertaOut
+from backend.repositories.alerta_repositorie import ORDENABLES
+from backend.schemas.alerta_schema import AlertaCreate, AlertaUpdate, AlertaOut, AlertaListItem, AlertaBulkEstado, AlertaBulkResultado
 from backend.schemas.transaccion_schema import TransaccionOut
-from backend.database.connection import get_db
+from backend.database.connection import get_db, SessionLocal
 from typing import List, Any, Optional
+from datetime import datetime
+import json
 from backend.models.alerta_model import Alerta
-from fastapi.responses import JSONResponse
-from backend.services.auth_jwt import get_current_user
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from backend.services.auth_jwt import get_current_user, get_current_user_sse
+from backend.services.alerta_events import FiltroEventos, alerta_event_bus, eventos_disponibles
+from backend.models.usuario_model import Usuario
 from backend.services.audit_logger import AuditLogger
 
 # Endpoint flexible para traer alertas por el IdTransaccion del padre
@@ -21,74 +27,158 @@ router = APIRouter(
     tags=["alertas"]
 )
 
-@router.get("/by-parent", response_model=List[AlertaOut])
+# Tope de filas por página cuando no se pide `range` o se pide uno mayor
+MAX_PAGE_SIZE = 1000
+
+
+def _parse_range(range: Optional[str]):
+    start, end = 0, MAX_PAGE_SIZE - 1
+    if range:
+        try:
+            start, end = json.loads(range)
+            start, end = max(0, int(start)), int(end)
+        except Exception:
+            start, end = 0, MAX_PAGE_SIZE - 1
+    return start, max(1, min(MAX_PAGE_SIZE, end - start + 1))
+
+
+def _parse_sort(sort: Optional[str]):
+    """`sort` estilo react-admin: ["AudFecha","DESC"]."""
+    if not sort:
+        return "idAlerta", False
+    try:
+        campo, orden = json.loads(sort)
+    except Exception:
+        raise HTTPException(status_code=400, detail="sort inválido")
+    if campo not in ORDENABLES:
+        raise HTTPException(
+            status_code=400, detail=f"No se puede ordenar por {campo}. Opciones: {', '.join(ORDENABLES)}"
+        )
+    return campo, str(orden).upper() == "DESC"
+
+
+def _listar_alertas(db: Session, response: Response, range: Optional[str], sort: Optional[str], **filtros):
+    start, limit = _parse_range(range)
+    campo, descending = _parse_sort(sort)
+    items, total = AlertaService(db).get_alertas_filtradas(
+        skip=start, limit=limit, sort=campo, descending=descending, **filtros
+    )
+    if response is not None:
+        response.headers["Content-Range"] = f"alertas {start}-{start + len(items) - 1}/{total}"
+    return items
+
+
+@router.get("/by-parent", response_model=List[AlertaListItem])
 def get_alertas_by_parent(
     tipo_padre: str,
     id_padre: int,
     db: Session = Depends(get_db),
     response: Response = None,
     range: str = Query(None, alias="range"),
+    sort: Optional[str] = Query(None),
+    id_estado: Optional[int] = Query(None),
+    IdTipoAlerta: Optional[int] = Query(None),
+    fechaDesde: Optional[datetime] = Query(None),
+    fechaHasta: Optional[datetime] = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
     tipo_padre = tipo_padre.lower()
     if tipo_padre == "expediente":
-        padre = db.query(Expediente).filter(Expediente.IdExpediente == id_padre).first()
+        columna, clave = Expediente.IdTransaccion, Expediente.IdExpediente
     elif tipo_padre == "acta":
-        padre = db.query(Acta).filter(Acta.IdActa == id_padre).first()
+        columna, clave = Acta.IdTransaccion, Acta.IdActa
     elif tipo_padre == "resolucion":
-        padre = db.query(Resolucion).filter(Resolucion.IdResolucion == id_padre).first()
+        columna, clave = Resolucion.IdTransaccion, Resolucion.IdResolucion
     else:
         raise HTTPException(status_code=400, detail="Tipo de padre no válido")
-    if not padre or not getattr(padre, "IdTransaccion", None):
+    id_transaccion = db.query(columna).filter(clave == id_padre).scalar()
+    if not id_transaccion:
         raise HTTPException(status_code=404, detail="Padre no encontrado o sin IdTransaccion")
-    id_transaccion = padre.IdTransaccion
-    query = db.query(Alerta).filter(Alerta.IdTransaccion == id_transaccion)
-    items = query.order_by(Alerta.idAlerta).all()
-    total = len(items)
-    start, end = 0, total - 1
-    if range:
-        import json
+    return _listar_alertas(
+        db, response, range, sort,
+        id_estado=id_estado, id_tipo_alerta=IdTipoAlerta, id_transacciones=[id_transaccion],
+        fecha_desde=fechaDesde, fecha_hasta=fechaHasta,
+    )
+
+def _email_usuario(id_usuario: Optional[int]) -> Optional[str]:
+    if not id_usuario:
+        return None
+    db = SessionLocal()
+    try:
+        usuario = db.get(Usuario, id_usuario)
+        return usuario.Email.lower() if usuario and usuario.Email else None
+    finally:
+        db.close()
+
+@router.get("/stream")
+async def stream_alertas(
+    request: Request,
+    id_estado: Optional[int] = Query(None),
+    id_transaccion: List[int] = Query([]),
+    solo_mias: bool = Query(False, description="Solo alertas creadas por el usuario o dirigidas a su email"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    lastEventId: Optional[int] = Query(None, description="Alternativa a Last-Event-ID para la primera conexión"),
+    current_user: dict = Depends(get_current_user_sse),
+):
+    """
+    Server-sent events con las altas, modificaciones, cambios de estado y bajas de alertas.
+    Cada evento lleva `id:` = IdEvento; al reconectar, EventSource manda Last-Event-ID y se
+    reenvía lo ocurrido desde ese evento. El token puede ir en ?token= (EventSource no
+    permite headers).
+    """
+    if not await run_in_threadpool(eventos_disponibles):
+        raise HTTPException(status_code=503, detail="Falta crear AlertaEvento (database/sql/alerta_evento.sql)")
+    desde = lastEventId
+    if last_event_id:
         try:
-            start, end = json.loads(range)
-        except Exception:
-            pass
-    paginated_items = items[start:end+1]
-    if response is not None:
-        response.headers["Content-Range"] = f"alertas {start}-{end}/{total}"
-    return paginated_items
+            desde = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID inválido")
+    filtro = FiltroEventos(id_estado=id_estado, id_transacciones=set(id_transaccion))
+    if solo_mias:
+        filtro.id_usuario = current_user.get("id")
+        filtro.email = await run_in_threadpool(_email_usuario, filtro.id_usuario)
+    sub = await alerta_event_bus.subscribe(filtro, desde)
+    return StreamingResponse(
+        alerta_event_bus.stream(sub, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-@router.get("/", response_model=List[AlertaOut])
+@router.get("/", response_model=List[AlertaListItem])
 def list_alertas(
     id_estado: Optional[int] = Query(None),
+    IdTipoAlerta: Optional[int] = Query(None),
+    id_transaccion: List[int] = Query([]),
+    fechaDesde: Optional[datetime] = Query(None, description="FechaInicio desde"),
+    fechaHasta: Optional[datetime] = Query(None, description="FechaInicio hasta"),
     db: Session = Depends(get_db),
     response: Response = None,
     range: str = Query(None, alias="range"),
+    sort: Optional[str] = Query(None, description='Ej: ["AudFecha","DESC"]'),
     current_user: dict = Depends(get_current_user)
 ):
-    service = AlertaService(db)
-    if id_estado is not None:
-        items = service.get_alertas_by_id_estado(id_estado)
-    else:
-        items = service.get_alertas()
-    # Mapear para incluir el nombre del estado
-    result = []
-    for alerta in items:
-        estado_nombre = alerta.estado.nombre if alerta.estado else None
-        alerta_dict = alerta.__dict__.copy()
-        alerta_dict['estado_nombre'] = estado_nombre
-        result.append(alerta_dict)
-    total = len(result)
-    start, end = 0, total - 1
-    if range:
-        import json
-        try:
-            start, end = json.loads(range)
-        except Exception:
-            pass
-    paginated_items = result[start:end+1]
-    if response is not None:
-        response.headers["Content-Range"] = f"alertas {start}-{end}/{total}"
-    return paginated_items
+    return _listar_alertas(
+        db, response, range, sort,
+        id_estado=id_estado, id_tipo_alerta=IdTipoAlerta, id_transacciones=id_transaccion,
+        fecha_desde=fechaDesde, fecha_hasta=fechaHasta,
+    )
+
+@router.patch("/bulk", response_model=AlertaBulkResultado)
+def bulk_update_estado_alertas(
+    cambio: AlertaBulkEstado,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Pasa muchas alertas a `IdEstado` en un solo pedido, por lista de `ids` o por `filtro`
+    (mismos filtros que GET /alertas/). Genera un único registro de auditoría.
+    """
+    try:
+        ids = AlertaService(db).bulk_update_estado(cambio, current_user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"actualizadas": len(ids), "ids": ids}
 
 @router.get("/{id}", response_model=AlertaOut)
 def get_alerta(id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -128,7 +218,6 @@ def update_alerta(
     AuditLogger(db, current_user).log_update(
         entidad="Alerta",
         entity_id=id,
-        changes=alerta.model_dump(exclude_unset=True),
     )
     return obj
 
@@ -152,24 +241,20 @@ def delete_alerta(
     )
     return {"ok": True}
 
-@router.get("/by-transaccion/{id_transaccion}", response_model=List[AlertaOut])
+@router.get("/by-transaccion/{id_transaccion}", response_model=List[AlertaListItem])
 def get_alertas_by_transaccion(
     id_transaccion: int,
     db: Session = Depends(get_db),
     response: Response = None,
-    range: str = Query(None, alias="range")
+    range: str = Query(None, alias="range"),
+    sort: Optional[str] = Query(None),
+    id_estado: Optional[int] = Query(None),
+    IdTipoAlerta: Optional[int] = Query(None),
+    fechaDesde: Optional[datetime] = Query(None),
+    fechaHasta: Optional[datetime] = Query(None),
 ):
-    query = db.query(Alerta).filter(Alerta.IdTransaccion == id_transaccion)
-    items = query.order_by(Alerta.idAlerta).all()
-    total = len(items)
-    start, end = 0, total - 1
-    if range:
-        import json
-        try:
-            start, end = json.loads(range)
-        except Exception:
-            pass
-    paginated_items = items[start:end+1]
-    if response is not None:
-        response.headers["Content-Range"] = f"alertas {start}-{end}/{total}"
-    return paginated_items
+    return _listar_alertas(
+        db, response, range, sort,
+        id_estado=id_estado, id_tipo_alerta=IdTipoAlerta, id_transacciones=[id_transaccion],
+        fecha_desde=fechaDesde, fecha_hasta=fechaHasta,
+    )
@@ -7,42 +7,112 @@ from backend.schemas.auditoria_schema import (
     AuditoriaOut,
     AuditoriaExportFilters,
 )
-from backend.database.connection import get_db
-from typing import List
-from backend.services.auth_jwt import get_current_user
-from fastapi.responses import StreamingResponse
-from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-import json
+from backend.database.connection import get_db, SessionLocal
+from typing import List, Optional
+from backend.services.auth_jwt import get_current_user, require_role
+from backend.services.auditoria_archivo_service import AuditoriaArchivoService
+from backend.services.auditoria_report_service import (
+    build_auditorias_pdf,
+    filtrar_auditorias,
+    iter_auditorias_csv,
+    write_auditorias_xlsx,
+)
+from backend.services.report_job_service import ReportJobService
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from datetime import datetime
+import base64
+import json
+import os
+import tempfile
 
 router = APIRouter(prefix="/auditorias", tags=["auditorias"])
 
 
+def _encode_cursor(clave) -> str:
+    fecha, id_auditoria = clave
+    raw = f"{fecha.isoformat()}|{id_auditoria}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        fecha, id_auditoria = raw.split("|", 1)
+        return datetime.fromisoformat(fecha), int(id_auditoria)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
 @router.get("/", response_model=List[AuditoriaOut])
 def list_auditorias(
     db: Session = Depends(get_db),
     response: Response = None,
     range: str = Query(None, alias="range"),
+    usuario: Optional[str] = Query(None),
+    entidad: List[str] = Query([]),
+    accion: List[str] = Query([]),
+    idTransaccion: Optional[str] = Query(None),
+    fechaDesde: Optional[datetime] = Query(None),
+    fechaHasta: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    limit: int = Query(100, ge=1, le=1000),
+    count: bool = Query(False, description="Incluir el total exacto en Content-Range"),
     current_user: int = Depends(get_current_user),
 ):
+    """
+    Lista las auditorías con los mismos filtros que la exportación, paginando por
+    keyset sobre (AudFecha, IdAuditoria). La clave de la página siguiente se
+    devuelve en el header X-Next-Cursor. `range` sigue funcionando por offset.
+    """
     service = AuditoriaService(db)
-    items = service.get_auditorias()
-    total = len(items)
-    start, end = 0, total - 1
-    if range:
-        try:
-            start, end = json.loads(range)
-        except Exception:
-            pass
-    paginated_items = items[start : end + 1]
+    filtros = AuditoriaExportFilters(
+        usuario=usuario,
+        entidad=entidad,
+        accion=accion,
+        idTransaccion=idTransaccion,
+        fechaDesde=fechaDesde,
+        fechaHasta=fechaHasta,
+    )
+    start = 0
+    if cursor:
+        clave = _decode_cursor(cursor)
+    else:
+        clave = None
+        if range:
+            try:
+                start, end = json.loads(range)
+                limit = max(1, min(1000, end - start + 1))
+            except Exception:
+                start = 0
+    items, siguiente = service.list_auditorias(filtros, limit=limit, cursor=clave, offset=start)
     if response is not None:
+        # react-admin necesita el total numérico cuando pagina con `range`
+        total = service.count_auditorias(filtros) if count or (range and not cursor) else "*"
+        end = start + len(items) - 1
         response.headers["Content-Range"] = f"auditorias {start}-{end}/{total}"
+        if siguiente is not None:
+            response.headers["X-Next-Cursor"] = _encode_cursor(siguiente)
     # Convierte los diccionarios a modelos Pydantic para la serialización correcta
-    return [AuditoriaOut(**item) for item in paginated_items]
+    return [AuditoriaOut(**item) for item in items]
+
+
+@router.post("/archivo")
+def archivar_auditorias(
+    meses_calientes: int = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_role("Administrador")),
+):
+    """
+    Ejecuta el archivado de los meses fríos (normalmente lo corre el job nocturno).
+    """
+    service = AuditoriaArchivoService(db)
+    try:
+        if meses_calientes:
+            return service.archivar(meses_calientes=meses_calientes)
+        return service.archivar()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{id}", response_model=AuditoriaOut)
@@ -95,102 +165,6 @@ def delete_auditoria(
     return obj
 
 
-def _matches_text(value: str | None, filtro: str | None) -> bool:
-    if not filtro:
-        return True
-    return (value or "").lower().find(filtro.lower()) != -1
-
-
-def _matches_date_range(
-    aud_fecha: datetime | None,
-    fecha_desde: datetime | None,
-    fecha_hasta: datetime | None,
-) -> bool:
-    if not fecha_desde and not fecha_hasta:
-        return True
-    if not aud_fecha:
-        return False
-    if fecha_desde and aud_fecha < fecha_desde:
-        return False
-    if fecha_hasta and aud_fecha > fecha_hasta:
-        return False
-    return True
-
-
-def _matches_id_transaccion(descripcion: str | None, filtro: str | None) -> bool:
-    if not filtro:
-        return True
-    if not descripcion:
-        return False
-    try:
-        data = json.loads(descripcion)
-    except Exception:
-        # si no es JSON, buscar texto plano
-        return filtro.lower() in descripcion.lower()
-
-    # recorrido recursivo para encontrar cualquier clave que contenga "idtransaccion"
-    def search(obj):
-        if isinstance(obj, dict):
-            for k, v in obj.items():
-                if (
-                    "idtransaccion" in str(k).lower()
-                    and filtro.lower() in str(v).lower()
-                ):
-                    return True
-                if search(v):
-                    return True
-        elif isinstance(obj, list):
-            for item in obj:
-                if search(item):
-                    return True
-        return False
-
-    return search(data)
-
-
-def _flatten_descripcion(value, prefix=""):
-    """
-    Aplana la estructura de descripcion (similar al frontend) para poder mostrarla en el PDF.
-    Devuelve una lista de (label, value).
-    """
-    entries = []
-
-    if value is None:
-        return [("Detalle", "Sin datos")]
-
-    if isinstance(value, list):
-        if not value:
-            return [("Detalle", "[]")]
-        for index, item in enumerate(value):
-            new_prefix = f"{prefix}[{index}]" if prefix else f"[{index}]"
-            entries.extend(_flatten_descripcion(item, new_prefix))
-        return entries
-
-    if isinstance(value, dict):
-        for key, val in value.items():
-            new_prefix = f"{prefix}.{key}" if prefix else key
-            entries.extend(_flatten_descripcion(val, new_prefix))
-        return entries
-
-    label = prefix or "Detalle"
-    return [(label, str(value))]
-
-
-def _build_descripcion_text(descripcion: str | None) -> str:
-    if not descripcion:
-        return "Sin detalle disponible"
-
-    try:
-        parsed = json.loads(descripcion)
-        entries = _flatten_descripcion(parsed)
-        # armo un texto tipo "campo: valor" por línea
-        parts = [f"{label}: {val}" for label, val in entries]
-        return "<br/>".join(parts)
-    except Exception:
-        # si no es JSON, devuelvo el texto crudo
-        return descripcion
-
-
 @router.post("/export/pdf")
 def export_auditorias_pdf(
     filtros: AuditoriaExportFilters,
@@ -203,177 +177,78 @@ def export_auditorias_pdf(
     """
     service = AuditoriaService(db)
     items = service.get_auditorias(skip=0, limit=10000)  # límite alto para el reporte
+    filtered_items = filtrar_auditorias(items, filtros)
+    buffer = build_auditorias_pdf(filtered_items, filtros)
 
-    usuario_filter = (filtros.usuario or "").strip().lower() or None
-    entidad_filter = [e.lower() for e in (filtros.entidad or [])]
-    accion_filter = [a.lower() for a in (filtros.accion or [])]
-    id_transaccion_filter = (filtros.idTransaccion or "").strip().lower() or None
-    fecha_desde = filtros.fechaDesde
-    fecha_hasta = filtros.fechaHasta
-
-    filtered_items = []
-    for item in items:
-        usuario_nombre = item.get("UsuarioNombre") or ""
-        aud_usuario = item.get("AudUsuario")
-        usuario_id = str(aud_usuario) if aud_usuario is not None else ""
-
-        if usuario_filter:
-            if (
-                usuario_filter not in usuario_nombre.lower()
-                and usuario_filter not in usuario_id.lower()
-            ):
-                continue
+    headers = {
+        "Content-Disposition": 'attachment; filename="auditorias.pdf"',
+        "Content-Type": "application/pdf",
+    }
 
-        if entidad_filter:
-            entidad_val = (item.get("Entidad") or "").lower()
-            if entidad_val not in entidad_filter:
-                continue
+    return StreamingResponse(buffer, media_type="application/pdf", headers=headers)
 
-        if accion_filter:
-            accion_val = (item.get("Accion") or "").lower()
-            if accion_val not in accion_filter:
-                continue
 
-        if id_transaccion_filter and not _matches_id_transaccion(
-            item.get("Descripcion"), id_transaccion_filter
-        ):
-            continue
+@router.post("/export/csv")
+def export_auditorias_csv(
+    filtros: AuditoriaExportFilters,
+    current_user: int = Depends(get_current_user),
+):
+    """
+    Exporta las auditorías filtradas a CSV en streaming desde el cursor de la base.
+    """
 
-        aud_fecha = item.get("AudFecha")
-        if isinstance(aud_fecha, str):
-            try:
-                aud_fecha_dt = datetime.fromisoformat(aud_fecha)
-            except Exception:
-                aud_fecha_dt = None
-        else:
-            aud_fecha_dt = aud_fecha
+    def generate():
+        # Sesión propia: el generador sigue leyendo después de que el endpoint retorna
+        db = SessionLocal()
+        try:
+            yield from iter_auditorias_csv(AuditoriaService(db).iter_auditorias_export(filtros))
+        finally:
+            db.close()
 
-        if not _matches_date_range(aud_fecha_dt, fecha_desde, fecha_hasta):
-            continue
+    headers = {"Content-Disposition": 'attachment; filename="auditorias.csv"'}
+    return StreamingResponse(generate(), media_type="text/csv; charset=utf-8", headers=headers)
 
-        filtered_items.append(item)
 
-    # Genero PDF version tabla usando ReportLab Platypus
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        leftMargin=30,
-        rightMargin=30,
-        topMargin=40,
-        bottomMargin=40,
+@router.post("/export/xlsx")
+def export_auditorias_xlsx(
+    filtros: AuditoriaExportFilters,
+    db: Session = Depends(get_db),
+    current_user: int = Depends(get_current_user),
+):
+    """
+    Exporta las auditorías filtradas a XLSX usando un workbook write-only sobre un archivo temporal.
+    """
+    service = AuditoriaService(db)
+    tmp = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+    tmp.close()
+    try:
+        write_auditorias_xlsx(service.iter_auditorias_export(filtros), tmp.name)
+    except Exception:
+        os.remove(tmp.name)
+        raise
+    return FileResponse(
+        tmp.name,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename="auditorias.xlsx",
+        background=BackgroundTask(os.remove, tmp.name),
     )
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Título
-    title = Paragraph("Reporte de Auditorías", styles["Title"])
-    elements.append(title)
 
-    # Resumen de filtros
-    resumen = f"Total de registros: {len(filtered_items)}"
-    if (
-        usuario_filter
-        or entidad_filter
-        or accion_filter
-        or id_transaccion_filter
-        or fecha_desde
-        or fecha_hasta
-    ):
-        filtros_text = []
-        if usuario_filter:
-            filtros_text.append(f"Usuario: {usuario_filter}")
-        if entidad_filter:
-            filtros_text.append(f"Entidades: {', '.join(entidad_filter)}")
-        if accion_filter:
-            filtros_text.append(f"Acciones: {', '.join(accion_filter)}")
-        if id_transaccion_filter:
-            filtros_text.append(f"ID Transacción: {id_transaccion_filter}")
-        if fecha_desde:
-            filtros_text.append(f"Desde: {fecha_desde.strftime('%d/%m/%Y')}")
-        if fecha_hasta:
-            filtros_text.append(f"Hasta: {fecha_hasta.strftime('%d/%m/%Y')}")
-        resumen += " | Filtros: " + " - ".join(filtros_text)
 
-    elements.append(Spacer(1, 8))
-    elements.append(Paragraph(resumen, styles["Normal"]))
-    elements.append(Spacer(1, 12))
-
-    # Encabezados de tabla
-    data = [
-        ["ID", "Fecha", "Acción", "Entidad", "Usuario", "Detalle"],
-    ]
-
-    # Filas de datos
-    for item in filtered_items:
-        fecha_val = item.get("AudFecha")
-        if isinstance(fecha_val, datetime):
-            fecha_str = fecha_val.strftime("%d/%m/%Y %H:%M:%S")
-        elif isinstance(fecha_val, str):
-            try:
-                fecha_dt = datetime.fromisoformat(fecha_val)
-                fecha_str = fecha_dt.strftime("%d/%m/%Y %H:%M:%S")
-            except Exception:
-                fecha_str = fecha_val
-        else:
-            fecha_str = ""
-
-        usuario_str = item.get("UsuarioNombre") or item.get("AudUsuario") or ""
-
-        desc_html = _build_descripcion_text(item.get("Descripcion"))
-        detalle_para = Paragraph(desc_html, styles["Normal"])
-
-        data.append(
-            [
-                str(item.get("IdAuditoria", "")),
-                fecha_str,
-                item.get("Accion") or "",
-                item.get("Entidad") or "",
-                str(usuario_str),
-                detalle_para,
-            ]
-        )
-
-    # Configuración de tabla
-    table = Table(
-        data,
-        colWidths=[35, 80, 70, 80, 80, 200],
-        repeatRows=1,
-    )
-
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#416759")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 9),
-                ("FONTSIZE", (0, 1), (-1, -1), 8),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                (
-                    "ROWBACKGROUNDS",
-                    (0, 1),
-                    (-1, -1),
-                    [colors.whitesmoke, colors.lightgrey],
-                ),
-                ("LEFTPADDING", (0, 0), (-1, -1), 4),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-                ("TOPPADDING", (0, 0), (-1, -1), 2),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-            ]
+@router.post("/export/{formato}/jobs", status_code=202)
+def export_auditorias_job(
+    formato: str,
+    filtros: AuditoriaExportFilters,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Encola la exportación de auditorías (pdf, csv o xlsx) en segundo plano.
+    Devuelve el job_id; el estado y la descarga se consultan en /reportes/jobs/{job_id}.
+    """
+    try:
+        return ReportJobService().submit(
+            f"auditorias_{formato.lower()}",
+            filtros.model_dump(mode="json"),
+            usuario=current_user.get("sub") if isinstance(current_user, dict) else None,
         )
-    )
-
-    elements.append(table)
-
-    doc.build(elements)
-    buffer.seek(0)
-
-    headers = {
-        "Content-Disposition": 'attachment; filename="auditorias.pdf"',
-        "Content-Type": "application/pdf",
-    }
-
-    return StreamingResponse(buffer, media_type="application/pdf", headers=headers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
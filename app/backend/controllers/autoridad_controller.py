@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
-from backend.schemas.autoridad_schema import Autoridad, AutoridadCreate, AutoridadUpdate
+from backend.schemas.autoridad_schema import Autoridad, AutoridadCreate, AutoridadUpdate, AutoridadMatch
 from backend.services import autoridad_service
 from backend.database.connection import get_db
 from typing import List
@@ -11,12 +11,19 @@ router = APIRouter(
     tags=["autoridades"]
 )
 
-@router.get("/search", response_model=List[Autoridad])
+@router.get("/search", response_model=List[AutoridadMatch])
 def search_autoridades(
     nombre: str = Query(..., min_length=1),
-    db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100),
+    min_score: float = Query(0.5, ge=0, le=1, description="Fracción mínima de trigramas coincidentes"),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user)
 ):
-    return autoridad_service.search_autoridades_by_nombre(db, nombre)
+    resultados = autoridad_service.search_autoridades_by_nombre(db, nombre, limit, min_score)
+    return [
+        AutoridadMatch(**Autoridad.model_validate(autoridad, from_attributes=True).model_dump(), score=score)
+        for autoridad, score in resultados
+    ]
 
 @router.get("", response_model=List[Autoridad])
 def read_autoridades(
@@ -64,14 +71,6 @@ def delete_autoridad(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Autoridad not found")
     return db_obj
 
-@router.get("/search", response_model=List[Autoridad])
-def search_autoridades(
-    nombre: str = Query(..., min_length=1),
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
-):
-    return autoridad_service.search_autoridades_by_nombre(db, nombre)
-
 @router.get("", response_model=List[Autoridad])
 def read_autoridades(
     db: Session = Depends(get_db),
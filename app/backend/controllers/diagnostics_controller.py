@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from backend.database.connection import get_db
+from backend.schemas.diagnostics_schema import QueryShapesReport, IndexAdvisorReport
+from backend.services.index_advisor_service import IndexAdvisorService
+from backend.services.auth_jwt import require_role
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/queries", response_model=QueryShapesReport)
+def listar_queries(
+    limit: int = Query(50, ge=1, le=500),
+    orden: str = Query("total_ms", description="total_ms, ejecuciones, max_ms o promedio_ms"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role("Administrador")),
+):
+    """Sentencias ejecutadas por este worker, agrupadas por forma, con sus tiempos."""
+    try:
+        return IndexAdvisorService(db).queries(limit=limit, orden=orden)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/queries", status_code=204)
+def reiniciar_queries(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role("Administrador")),
+):
+    """Descarta lo registrado, por ejemplo después de crear un índice sugerido."""
+    IndexAdvisorService(db).reset()
+
+
+@router.get("/indexes", response_model=IndexAdvisorReport)
+def sugerir_indices(
+    limit: int = Query(20, ge=1, le=200),
+    min_ejecuciones: int = Query(1, ge=1),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role("Administrador")),
+):
+    """Índices sugeridos a partir de la carga observada y de sys.dm_db_missing_index_*."""
+    return IndexAdvisorService(db).report(limit=limit, min_ejecuciones=min_ejecuciones)
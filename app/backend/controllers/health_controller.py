@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from backend.services.alerta_scheduler import ALERTAS_SCHEDULER_ENABLED, alerta_leader, alerta_scheduler
+from backend.services.auth_jwt import require_role
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/scheduler")
+def scheduler_health():
+    """Para balanceadores y monitoreo: solo si el scheduler de alertas corre en este worker."""
+    return {"ok": not ALERTAS_SCHEDULER_ENABLED or alerta_leader.snapshot()["activo"]}
+
+
+@router.get("/scheduler/detalle")
+def scheduler_health_detalle(current_user=Depends(require_role("Administrador"))):
+    """Estado del lock de líder y del scheduler de alertas en este worker (host, pid, último error)."""
+    return {
+        "habilitado": ALERTAS_SCHEDULER_ENABLED,
+        "leader": alerta_leader.snapshot(),
+        "scheduler": alerta_scheduler.snapshot(),
+    }
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from backend.services.propiedad_minera_service import PropiedadMineraService
-from backend.schemas.propiedad_minera_schema import PropiedadMineraRead, PropiedadMineraCreate
+from backend.schemas.propiedad_minera_schema import PropiedadMineraRead, PropiedadMineraCreate, PropiedadMineraListadoRead
 from backend.database.connection import get_db
 from typing import List
 from fastapi import Query, APIRouter, Request
@@ -16,7 +16,7 @@ from backend.services.audit_logger import AuditLogger
 
 router = APIRouter(prefix="/propiedades-mineras", tags=["Propiedades Mineras"])
 
-@router.get("", response_model=List[PropiedadMineraRead])
+@router.get("", response_model=List[PropiedadMineraListadoRead])
 def listar_propiedades(
     db: Session = Depends(get_db),
     response: Response = None,
@@ -24,20 +24,6 @@ def listar_propiedades(
     filter: str = Query(None)
 ):
     service = PropiedadMineraService(db)
-    filters = {}
-    if filter:
-        filters_json = json.loads(filter)
-        if "Nombre" in filters_json:
-            filters["nombre"] = filters_json["Nombre"]
-        if "Provincia" in filters_json:
-            filters["provincia"] = filters_json["Provincia"]
-        if "IdTitular" in filters_json:
-            try:
-                filters["id_titular"] = int(filters_json["IdTitular"])
-            except Exception:
-                pass
-        if "Expediente" in filters_json:
-            filters["expediente"] = filters_json["Expediente"]
     start, end = 0, 9
     if range:
         try:
@@ -45,10 +31,21 @@ def listar_propiedades(
         except Exception:
             pass
     limit = end - start + 1
-    items, total = service.get_filtered_paginated(filters, offset=start, limit=limit)
+    try:
+        items, total = service.get_filtered_paginated(filter, offset=start, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     response.headers["Content-Range"] = f"propiedades-mineras {start}-{start+len(items)-1}/{total}"
     return items
 
+@router.post("/listado/reconstruir")
+def reconstruir_listado(db: Session = Depends(get_db), current_user=Depends(require_role("Administrador"))):
+    """Vuelve a calcular toda la proyección del listado (p.ej. después de cargas por SQL directo)."""
+    try:
+        return {"propiedades": PropiedadMineraService(db).reconstruir_listado()}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{id_propiedad}", response_model=PropiedadMineraRead)
 def obtener_propiedad(id_propiedad: int, db: Session = Depends(get_db)):
     service = PropiedadMineraService(db)
@@ -94,7 +91,6 @@ def actualizar_propiedad(
         AuditLogger(db, current_user).log_update(
             entidad="PropiedadMinera",
             entity_id=id_propiedad,
-            changes=propiedad_data,
         )
         return updated
     except ValueError as e:
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from backend.services.report_job_service import ReportJobService, ESTADO_ERROR
+from backend.services.auth_jwt import get_current_user
+
+router = APIRouter(prefix="/reportes/jobs", tags=["reportes"])
+
+
+def _get_owned_job(job_id: str, current_user: dict):
+    meta = ReportJobService().get_status(job_id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Reporte no encontrado o vencido")
+    usuario = current_user.get("sub") if isinstance(current_user, dict) else None
+    if meta.get("usuario") and meta.get("usuario") != usuario:
+        raise HTTPException(status_code=404, detail="Reporte no encontrado o vencido")
+    return meta
+
+
+@router.get("/{job_id}")
+def get_report_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Estado del reporte: pendiente, en_proceso, listo o error."""
+    return _get_owned_job(job_id, current_user)
+
+
+@router.get("/{job_id}/download")
+def download_report_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    meta = _get_owned_job(job_id, current_user)
+    if meta.get("estado") == ESTADO_ERROR:
+        raise HTTPException(status_code=500, detail=f"El reporte falló: {meta.get('error')}")
+    result = ReportJobService().get_result(job_id)
+    if not result:
+        raise HTTPException(status_code=409, detail="El reporte todavía no está listo")
+    path, media_type, filename = result
+    return FileResponse(path, media_type=media_type, filename=filename)
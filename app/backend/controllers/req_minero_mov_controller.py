@@ -5,8 +5,7 @@ from backend.services.req_minero_mov_service import ReqMineroMovService
 from backend.schemas.req_minero_mov_schema import (
     ReqMineroMovOut, 
     ReqMineroMovCreate, 
-    ReqMineroMovUpdate,
-    ReqMineroMovFilter
+    ReqMineroMovUpdate
 )
 from typing import List, Optional
 import json
@@ -29,21 +28,10 @@ def get_req_minero_movs(
     Obtener lista de requerimientos mineros con filtros opcionales
     """
     try:
-        # Procesar filtros
-        filters = ReqMineroMovFilter()
+        range_data = json.loads(range) if range else None
         
-        if filter:
-            filter_data = json.loads(filter)
-            for key, value in filter_data.items():
-                if hasattr(filters, key):
-                    setattr(filters, key, value)
-        
-        if range:
-            range_data = json.loads(range)
-            filters.range = range_data
-        
-        # Obtener datos
-        result = service.search_with_filters(filters)
+        # Obtener datos (el filtro se valida contra la lista de campos del repositorio)
+        result = service.search_with_filters(filter, range_data)
         
         # Configurar headers de respuesta
         start = result['skip']
@@ -57,6 +45,8 @@ def get_req_minero_movs(
         
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Formato de filtro o rango inválido")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from backend.schemas.resolucion_schema import ResolucionRead, ResolucionCreate, ResolucionUpdate
+from backend.schemas.resolucion_schema import ResolucionRead, ResolucionCreate, ResolucionUpdate, ResolucionListItem
 from backend.services.resolucion_service import ResolucionService
 from backend.database.connection import get_db
 from backend.models.alerta_model import Alerta
@@ -11,7 +11,7 @@ from backend.services.auth_jwt import get_current_user
 router = APIRouter(prefix="/resoluciones", tags=["Resoluciones"])
 
 
-@router.get("", response_model=List[ResolucionRead])
+@router.get("", response_model=List[ResolucionListItem])
 def listar_resoluciones(
     db: Session = Depends(get_db),
     response: Response = None,
@@ -19,46 +19,26 @@ def listar_resoluciones(
     filter: str = Query(None)
 ):
     service = ResolucionService(db)
-    items = service.get_all()
-    print(f"[DEBUG] Param filter recibido: {filter}")
-    if filter:
-        import json
-        try:
-            filter_dict = json.loads(filter)
-            print(f"[DEBUG] filter_dict: {filter_dict}")
-            if 'IdExpediente' in filter_dict:
-                id_expediente = int(filter_dict['IdExpediente'])
-                print(f"[DEBUG] Buscando expediente con IdExpediente = {id_expediente}")
-                # Buscar el expediente y su IdTransaccion
-                from backend.repositories.expediente_respositorie import ExpedienteRepository
-                expediente_repo = ExpedienteRepository(db)
-                expediente = expediente_repo.get_by_id(id_expediente)
-                if expediente and hasattr(expediente, 'IdTransaccion'):
-                    id_transaccion = expediente.IdTransaccion
-                    print(f"[DEBUG] IdTransaccion del expediente: {id_transaccion}")
-                    # Buscar resoluciones por IdTransaccionPadre (join con Transaccion)
-                    from sqlalchemy.orm import aliased
-                    from backend.models.resolucion_model import Resolucion
-                    from backend.models.transaccion_model import Transaccion
-                    query = db.query(Resolucion).join(Transaccion, Resolucion.IdTransaccion == Transaccion.IdTransaccion).filter(Transaccion.IdTransaccionPadre == id_transaccion)
-                    items = query.order_by(Resolucion.IdResolucion).all()
-                else:
-                    print(f"[DEBUG] Expediente no encontrado o sin IdTransaccion")
-                    items = []
-        except Exception as e:
-            print(f"[DEBUG] Error al parsear filter o buscar resoluciones por transaccion: {e}")
-    total = len(items)
-    # Paginación
-    start, end = 0, total - 1
+
+    # Parse range param (ejemplo: '[0,9]'); sin range devuelve todas
+    start, limit = 0, None
     if range:
         import json
         try:
             start, end = json.loads(range)
+            limit = end - start + 1
         except Exception:
             pass
-    paginated_items = items[start:end+1]
-    response.headers["Content-Range"] = f"resoluciones {start}-{end}/{total}"
-    return paginated_items
+
+    try:
+        items, total = service.get_filtered_paginated(filter, offset=start, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if items:
+        response.headers["Content-Range"] = f"resoluciones {start}-{start + len(items) - 1}/{total}"
+    else:
+        response.headers["Content-Range"] = f"resoluciones */{total}"
+    return items
 
 @router.get("/{id_resolucion}", response_model=dict)
 def obtener_resolucion(id_resolucion: int, db: Session = Depends(get_db)):
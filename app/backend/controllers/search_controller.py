@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+from backend.database.connection import get_db
+from backend.schemas.search_schema import SearchResult, FullTextResult
+from backend.services.search_service import search_service
+from backend.services.fulltext_service import FullTextService
+from backend.services.auth_jwt import get_current_user
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResult)
+@router.get("/", response_model=SearchResult)
+def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    tipo: List[str] = Query([], description="expediente, propiedad, titular, autoridad, acta, resolucion"),
+    limit: int = Query(20, ge=1, le=100),
+    min_score: float = Query(0.5, ge=0, le=1, description="Fracción mínima de trigramas coincidentes"),
+    current_user: dict = Depends(get_current_user),
+):
+    """Búsqueda por código o nombre parcial en todas las entidades, ordenada por relevancia."""
+    if not search_service.listo:
+        raise HTTPException(status_code=503, detail="El índice de búsqueda se está construyendo")
+    try:
+        hits = search_service.search(q, tipos=tipo, limit=limit, min_score=min_score)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"q": q, "hits": hits}
+
+
+@router.get("/texto", response_model=FullTextResult)
+def search_texto(
+    q: str = Query(..., min_length=1, max_length=200),
+    tipo: List[str] = Query([], description="resolucion, acta, alerta, observacion"),
+    modo: str = Query("contains", description="contains (todas las palabras, como prefijo) o freetext"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Búsqueda de texto completo en contenidos, descripciones, mensajes y observaciones."""
+    try:
+        service = FullTextService(db)
+        if not service.disponible():
+            raise HTTPException(status_code=503, detail="El índice de texto completo se está construyendo")
+        hits = service.search(q, tipos=tipo, modo=modo, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"q": q, "modo": modo, "motor": service.motor, "hits": hits}
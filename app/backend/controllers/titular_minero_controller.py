@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
 from sqlalchemy.orm import Session
 from backend.services.titular_minero_service import TitularMineroService
-from backend.schemas.titular_minero_schema import TitularMineroRead, TitularMineroCreate
+from backend.schemas.titular_minero_schema import TitularMineroRead, TitularMineroCreate, TitularMineroMatch
 from backend.database.connection import get_db
 from typing import List
 from backend.services.auth_jwt import get_current_user
@@ -34,6 +34,29 @@ def listar_titulares(
     response.headers["Content-Range"] = f"titulares-mineros {start}-{end}/{total}"
     return paginated_items
 
+@router.get("/search", response_model=List[TitularMineroMatch])
+def buscar_titulares(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    min_score: float = Query(0.5, ge=0, le=1, description="Fracción mínima de trigramas coincidentes"),
+    db: Session = Depends(get_db),
+    _: dict = Depends(get_current_user)
+):
+    """Búsqueda aproximada por nombre (sin acentos, tolera errores) o por DNI/CUIT."""
+    service = TitularMineroService(db)
+    return [
+        TitularMineroMatch(**TitularMineroRead.model_validate(titular).model_dump(), score=score)
+        for titular, score in service.search(q, limit, min_score)
+    ]
+
+@router.get("/dni/{dni_cuit}", response_model=List[TitularMineroRead])
+def obtener_titulares_por_dni(dni_cuit: str, db: Session = Depends(get_db), _: dict = Depends(get_current_user)):
+    service = TitularMineroService(db)
+    try:
+        return service.get_by_dni_cuit(dni_cuit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{id_titular}", response_model=TitularMineroRead)
 def obtener_titular(id_titular: int, db: Session = Depends(get_db), _: dict = Depends(get_current_user)):
     service = TitularMineroService(db)
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
 from sqlalchemy.orm import Session
 from backend.services.transaccion_service import TransaccionService
-from backend.schemas.transaccion_schema import TransaccionCreate, TransaccionUpdate, TransaccionOut
+from backend.services.transaccion_arbol_service import TransaccionArbolService, parse_includes
+from backend.schemas.transaccion_schema import TransaccionCreate, TransaccionUpdate, TransaccionOut, TransaccionRelativaOut
 from backend.database.connection import get_db
-from typing import List, Dict, Any
-from backend.services.auth_jwt import get_current_user
+from typing import List, Dict, Any, Optional
+from backend.services.auth_jwt import get_current_user, require_role
+from backend.services.integridad_service import IntegridadService
 
 router = APIRouter(
     prefix="/transacciones",
@@ -41,6 +43,70 @@ def get_transaccion(id: int, db: Session = Depends(get_db), current_user: int =
         raise HTTPException(status_code=404, detail="Transaccion not found")
     return obj
 
+def _con_profundidad(filas) -> List[TransaccionRelativaOut]:
+    return [
+        TransaccionRelativaOut(
+            **TransaccionOut.model_validate(t, from_attributes=True).model_dump(), Profundidad=profundidad
+        )
+        for t, profundidad in filas
+    ]
+
+@router.get("/{id}/descendientes", response_model=List[TransaccionRelativaOut])
+def get_descendientes(
+    id: int,
+    depth: Optional[int] = Query(None, ge=1, description="Profundidad máxima; sin valor devuelve todo el subárbol"),
+    tabla: Optional[str] = Query(None, description="Filtra por Tabla (ej: 'Acta', 'Expediente')"),
+    db: Session = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """
+    Todos los descendientes de una transacción, a cualquier profundidad, en una sola consulta.
+    """
+    service = TransaccionService(db)
+    return _con_profundidad(service.get_descendants(id, depth, tabla))
+
+@router.get("/{id}/ancestros", response_model=List[TransaccionRelativaOut])
+def get_ancestros(id: int, db: Session = Depends(get_db), current_user: int = Depends(get_current_user)):
+    """
+    Cadena de ancestros de una transacción, del padre directo hacia la raíz.
+    """
+    service = TransaccionService(db)
+    return _con_profundidad(service.get_ancestors(id))
+
+@router.get("/{id}/tree", response_model=Dict[str, Any])
+def get_arbol(
+    id: int,
+    depth: Optional[int] = Query(None, ge=0, description="Niveles a incluir debajo del nodo; sin valor trae todo"),
+    include: Optional[str] = Query(None, description="Lista separada por comas: alertas, observaciones, archivos"),
+    db: Session = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """
+    Devuelve el subárbol de una transacción como documento anidado: cada nodo trae
+    su registro (Expediente, Acta, ...), sus hijos y, opcionalmente, sus alertas,
+    observaciones y archivos.
+    """
+    try:
+        includes = parse_includes(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    arbol = TransaccionArbolService(db).get_tree(id, depth, includes)
+    if arbol is None:
+        raise HTTPException(status_code=404, detail="Transaccion not found")
+    return arbol
+
+@router.post("/integridad", response_model=Dict[str, Any])
+def barrer_integridad(
+    reparar: bool = Query(False, description="Corrige los vínculos que se pueden deducir sin ambigüedad"),
+    desde_cero: bool = Query(False, description="Ignora los checkpoints y revisa todas las transacciones y entidades"),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_role("Administrador"))
+):
+    """
+    Barrido de integridad de la jerarquía de transacciones (normalmente lo corre el job nocturno).
+    """
+    return IntegridadService(db).barrer(reparar=reparar, desde_cero=desde_cero)
+
 @router.post("/", response_model=TransaccionOut)
 def create_transaccion(transaccion: TransaccionCreate, db: Session = Depends(get_db), current_user: int = Depends(get_current_user)):
     service = TransaccionService(db)
@@ -62,6 +128,25 @@ def delete_transaccion(id: int, db: Session = Depends(get_db), current_user: int
         raise HTTPException(status_code=404, detail="Transaccion not found")
     return obj
 
+@router.get("/informacion/{tabla}", response_model=Dict[int, List[Dict[str, Any]]])
+def get_informacion_transacciones(
+    tabla: str,
+    ids: List[int] = Query(..., description="Ids de transacción (repetir el parámetro: ?ids=1&ids=2)"),
+    db: Session = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """
+    Variante por lote de InformacionTransaccion para los listados: devuelve
+    un objeto {id_transaccion: filas} en una sola llamada.
+    """
+    if len(ids) > 500:
+        raise HTTPException(status_code=400, detail="Se admiten hasta 500 ids por llamada")
+    service = TransaccionService(db)
+    try:
+        return service.get_informacion_transacciones(tabla, ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ejecutando procedure: {str(e)}")
+
 @router.get("/informacion/{tabla}/{id_transaccion}", response_model=List[Dict[str, Any]])
 def get_informacion_transaccion(
     tabla: str, 
@@ -134,7 +134,6 @@ def actualizar_usuario(
         AuditLogger(db, current_user).log_update(
             entidad="Usuario",
             entity_id=id_usuario,
-            changes=_pydantic_to_dict(usuario, exclude_none=True),
         )
         return usuario_actualizado
     except ValueError as e:
@@ -233,7 +232,6 @@ def cambiar_password(
         AuditLogger(db, current_user).log_update(
             entidad="Usuario",
             entity_id=id_usuario,
-            changes={"password_cambiada": True},
         )
         return usuario_actualizado
     except ValueError as e:
@@ -258,7 +256,6 @@ def activar_desactivar_usuario(
         AuditLogger(db, current_user).log_update(
             entidad="Usuario",
             entity_id=id_usuario,
-            changes={"Activo": request.activo},
         )
         return usuario_actualizado
     except Exception as e:
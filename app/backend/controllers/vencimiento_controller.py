@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, Query
+from sqlalchemy.orm import Session
+from backend.database.connection import get_db
+from backend.schemas.vencimiento_schema import VencimientoOut
+from backend.services.vencimiento_service import VencimientoService
+from backend.services.auth_jwt import get_current_user
+from typing import List, Optional
+from datetime import datetime
+import base64
+
+router = APIRouter(prefix="/vencimientos", tags=["vencimientos"])
+
+
+def _encode_cursor(clave) -> str:
+    fecha, tipo, id_registro = clave
+    raw = f"{fecha.isoformat()}|{tipo}|{id_registro}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        fecha, tipo, id_registro = raw.split("|", 2)
+        return datetime.fromisoformat(fecha), tipo, int(id_registro)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+@router.get("/", response_model=List[VencimientoOut])
+def list_vencimientos(
+    response: Response,
+    db: Session = Depends(get_db),
+    desde: Optional[datetime] = Query(None, description="Por defecto, ahora"),
+    hasta: Optional[datetime] = Query(None, description="Por defecto, desde + 7 días (exclusivo)"),
+    tipo: List[str] = Query([], description="alerta y/o notificacion; vacío = ambos"),
+    idEstado: Optional[int] = Query(None, description="Solo alertas en este estado"),
+    codExp: Optional[str] = Query(None, description="Solo notificaciones de este expediente"),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor de la página anterior"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Vencimientos de alertas y de plazos de notificaciones en un solo listado ordenado
+    por fecha, paginado por keyset: la clave de la página siguiente va en X-Next-Cursor.
+    """
+    clave = _decode_cursor(cursor) if cursor else None
+    try:
+        items, siguiente = VencimientoService(db).list_vencimientos(
+            desde, hasta, limit, clave, tipo, idEstado, codExp
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers["Content-Range"] = f"vencimientos 0-{len(items) - 1}/*" if items else "vencimientos */0"
+    if siguiente is not None:
+        response.headers["X-Next-Cursor"] = _encode_cursor(siguiente)
+    return items
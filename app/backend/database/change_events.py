@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+_SESSION_KEY = "change_events_pendientes"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    Cambio confirmado sobre una fila mapeada por el ORM.
+
+    `valores` es una copia de las columnas tomada en el flush (después del commit
+    las instancias están expiradas y no se puede consultar la base), y `anteriores`
+    trae el valor previo de las columnas modificadas en un UPDATE.
+    """
+
+    entidad: str
+    accion: str
+    identity: Tuple[Any, ...]
+    valores: Dict[str, Any] = field(default_factory=dict)
+    anteriores: Dict[str, Any] = field(default_factory=dict)
+
+
+ChangeListener = Callable[[List[ChangeEvent]], None]
+_listeners: List[ChangeListener] = []
+
+
+def on_commit(listener: ChangeListener) -> ChangeListener:
+    """
+    Registra una función que recibe los cambios de cada commit exitoso.
+    Se puede usar como decorador. Los errores del listener se loguean y no
+    afectan al request que hizo el commit.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def _snapshot(obj, accion: str) -> ChangeEvent:
+    estado = inspect(obj)
+    valores = {}
+    anteriores = {}
+    for attr in estado.mapper.column_attrs:
+        valores[attr.key] = estado.dict.get(attr.key)
+        if accion == UPDATE:
+            historial = estado.attrs[attr.key].history
+            if historial.added and historial.deleted:
+                anteriores[attr.key] = historial.deleted[0]
+    identity = estado.identity or tuple(
+        valores.get(col.key) for col in estado.mapper.primary_key
+    )
+    return ChangeEvent(type(obj).__name__, accion, tuple(identity), valores, anteriores)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    if not _listeners:
+        return
+    pendientes = session.info.setdefault(_SESSION_KEY, [])
+    for obj in session.new:
+        pendientes.append(_snapshot(obj, INSERT))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            pendientes.append(_snapshot(obj, UPDATE))
+    for obj in session.deleted:
+        pendientes.append(_snapshot(obj, DELETE))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch(session: Session) -> None:
+    pendientes = session.info.pop(_SESSION_KEY, None)
+    if not pendientes:
+        return
+    for listener in list(_listeners):
+        try:
+            listener(pendientes)
+        except Exception:
+            logger.exception(f"Error en el listener de cambios {getattr(listener, '__name__', listener)}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+# SQL Server admite hasta 2100 parámetros por sentencia: las listas de un IN se
+# parten en tandas de este tamaño
+IN_CHUNK_SIZE = 1000
+
+
+def chunked(values: Iterable[T], size: int = IN_CHUNK_SIZE) -> Iterator[List[T]]:
+    """Parte `values` en listas de a lo sumo `size` elementos, respetando el orden."""
+    valores = values if isinstance(values, list) else list(values)
+    for inicio in range(0, len(valores), size):
+        yield valores[inicio : inicio + size]
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import and_
+
+EQ = "eq"
+IN = "in"
+RANGE = "range"
+PREFIX = "prefix"
+CONTAINS = "contains"
+OPERADORES = (EQ, IN, RANGE, PREFIX, CONTAINS)
+
+MAX_IN = 1000
+
+
+class FiltroInvalido(ValueError):
+    """Filtro con un campo fuera de la lista permitida, un operador no admitido o un valor mal formado."""
+
+
+@dataclass(frozen=True)
+class Campo:
+    """
+    Un campo filtrable. `columna` es el atributo mapeado (también define a qué tipo se
+    convierte el valor); `expresion(operador, valor)` reemplaza la comparación directa
+    cuando el filtro no es sobre una columna de la tabla (por ejemplo un EXISTS).
+    `defecto` es el operador que se aplica cuando el JSON trae el valor sin operador.
+    """
+
+    columna: Any = None
+    operadores: Tuple[str, ...] = (EQ, IN)
+    defecto: str = EQ
+    expresion: Optional[Callable[[str, Any], Any]] = None
+    tipo: Optional[type] = None
+
+
+def texto(columna, defecto: str = PREFIX, **kwargs) -> Campo:
+    """Campo de texto: por defecto busca por prefijo, que puede usar el índice."""
+    return Campo(columna, operadores=(EQ, IN, PREFIX, CONTAINS), defecto=defecto, **kwargs)
+
+
+def rango(columna, **kwargs) -> Campo:
+    """Campo de fecha o número: igualdad, lista o rango [desde, hasta]."""
+    return Campo(columna, operadores=(EQ, IN, RANGE), defecto=EQ, **kwargs)
+
+
+def _like(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("[", "\\[")
+
+
+def _tipo_de(campo: Campo) -> Optional[type]:
+    if campo.tipo is not None:
+        return campo.tipo
+    try:
+        return campo.columna.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def _a_hora_local(dt: datetime) -> datetime:
+    # Las columnas guardan hora local sin tzinfo: un valor con zona (p.ej. "...Z") se pasa a local antes de descartarla
+    return dt.astimezone().replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+
+def _convertir(nombre: str, campo: Campo, valor: Any) -> Any:
+    """
+    Convierte el valor al tipo de la columna antes de compararlo: comparar una columna
+    int con un string obliga a SQL Server a convertir la columna y deja de usar el índice.
+    """
+    tipo = _tipo_de(campo)
+    if valor is None or tipo is None:
+        return valor
+    if tipo is bool:
+        return str(valor).lower() in ("1", "true", "si", "yes")
+    if isinstance(valor, tipo) and not isinstance(valor, bool):
+        return valor
+    try:
+        if tipo is datetime:
+            return _a_hora_local(datetime.fromisoformat(str(valor).replace("Z", "+00:00")))
+        if tipo is date:
+            return _a_hora_local(datetime.fromisoformat(str(valor).replace("Z", "+00:00"))).date()
+        if tipo in (int, float, Decimal):
+            return tipo(valor)
+        return str(valor)
+    except (TypeError, ValueError):
+        raise FiltroInvalido(f"Valor inválido para '{nombre}': {valor!r}")
+
+
+def _condicion(nombre: str, campo: Campo, operador: str, valor: Any):
+    if operador not in campo.operadores:
+        raise FiltroInvalido(
+            f"Operador '{operador}' no permitido para '{nombre}'. Opciones: {', '.join(campo.operadores)}"
+        )
+    if operador == IN:
+        if not isinstance(valor, (list, tuple)) or not valor:
+            raise FiltroInvalido(f"'{nombre}.in' espera una lista no vacía")
+        if len(valor) > MAX_IN:
+            raise FiltroInvalido(f"'{nombre}.in' admite hasta {MAX_IN} valores")
+        valor = list(dict.fromkeys(_convertir(nombre, campo, v) for v in valor))
+    elif operador == RANGE:
+        if isinstance(valor, dict):
+            valor = [valor.get("desde", valor.get("gte")), valor.get("hasta", valor.get("lte"))]
+        if not isinstance(valor, (list, tuple)) or len(valor) != 2 or valor == [None, None]:
+            raise FiltroInvalido(f"'{nombre}.range' espera [desde, hasta] (uno de los dos puede ser null)")
+        valor = [_convertir(nombre, campo, v) for v in valor]
+    elif operador in (PREFIX, CONTAINS):
+        if not isinstance(valor, (str, int)) or str(valor) == "":
+            raise FiltroInvalido(f"'{nombre}.{operador}' espera un texto no vacío")
+        valor = str(valor)
+    else:
+        valor = _convertir(nombre, campo, valor)
+
+    if campo.expresion is not None:
+        return campo.expresion(operador, valor)
+    return comparar(campo.columna, operador, valor)
+
+
+def comparar(columna, operador: str, valor: Any):
+    """Expresión de SQLAlchemy para `columna <operador> valor` (valor ya convertido)."""
+    if operador == EQ:
+        return columna.is_(None) if valor is None else columna == valor
+    if operador == IN:
+        return columna.in_(valor)
+    if operador == RANGE:
+        desde, hasta = valor
+        partes = []
+        if desde is not None:
+            partes.append(columna >= desde)
+        if hasta is not None:
+            partes.append(columna <= hasta)
+        return and_(*partes)
+    # LIKE sin LOWER(): con la intercalación CI de SQL Server ya no distingue mayúsculas
+    # y 'x%' se resuelve con un seek; '%x%' (contains) siempre recorre el índice entero
+    if operador == PREFIX:
+        return columna.like(f"{_like(valor)}%", escape="\\")
+    return columna.like(f"%{_like(valor)}%", escape="\\")
+
+
+def compilar_filtro(filtro: Union[str, Dict[str, Any], None], campos: Dict[str, Campo]) -> List[Any]:
+    """
+    Traduce el parámetro `filter` de react-admin a condiciones de SQLAlchemy.
+
+    Cada clave tiene que estar en `campos`. El valor puede ser directo (se aplica el
+    operador por defecto del campo; una lista equivale a `in`) o un objeto con uno o
+    más operadores: {"Nombre": {"prefix": "San"}, "IdTitular": {"in": [1, 2]},
+    "Fecha": {"range": ["2024-01-01", null]}}. Valores vacíos ("" o null) se ignoran,
+    como hacían los filtros anteriores.
+    """
+    if filtro in (None, ""):
+        return []
+    if isinstance(filtro, str):
+        try:
+            filtro = json.loads(filtro)
+        except json.JSONDecodeError:
+            raise FiltroInvalido("El parámetro filter no es un JSON válido")
+    if not isinstance(filtro, dict):
+        raise FiltroInvalido("El parámetro filter tiene que ser un objeto JSON")
+
+    condiciones = []
+    for nombre, valor in filtro.items():
+        campo = campos.get(nombre)
+        if campo is None:
+            raise FiltroInvalido(f"No se puede filtrar por '{nombre}'. Campos permitidos: {', '.join(campos)}")
+        if valor is None or valor == "":
+            continue
+        if isinstance(valor, dict):
+            if not valor:
+                continue
+            desconocidos = [op for op in valor if op not in OPERADORES]
+            if desconocidos:
+                raise FiltroInvalido(f"Operador desconocido en '{nombre}': {', '.join(desconocidos)}")
+            condiciones.extend(_condicion(nombre, campo, op, v) for op, v in valor.items())
+        elif isinstance(valor, list):
+            condiciones.append(_condicion(nombre, campo, IN, valor))
+        else:
+            condiciones.append(_condicion(nombre, campo, campo.defecto, valor))
+    return condiciones
+
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() in ("1", "true", "si", "yes")
+# Formas distintas que se guardan; las que llegan después se cuentan juntas en OTRAS
+QUERY_STATS_MAX_SHAPES = int(os.getenv("QUERY_STATS_MAX_SHAPES", "2000"))
+OTRAS = "<otras>"
+
+_LITERAL_TEXTO = re.compile(r"N?'(?:[^']|'')*'")
+_LITERAL_NUMERO = re.compile(r"(?<![\w\].])-?\d+(?:\.\d+)?\b")
+_LISTA_PARAMETROS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_PARAMETRO = re.compile(r"%\([^)]*\)s|:\w+|\?")
+_ESPACIOS = re.compile(r"\s+")
+
+# [Nombre] en SQL Server, "Nombre" en otros dialectos
+_IDENT = r"[\[\"]?(\w+)[\]\"]?"
+# FROM/JOIN [dbo].[Tabla] AS [alias]
+_TABLA = re.compile(
+    rf"\b(?:FROM|JOIN|UPDATE|INTO)\s+(?:{_IDENT}\.)?{_IDENT}(?:\s+(?:AS\s+)?(?!(?:WHERE|ON|JOIN|INNER|LEFT|RIGHT|FULL|CROSS|ORDER|GROUP|SET|WITH|VALUES|OUTPUT)\b){_IDENT})?",
+    re.IGNORECASE,
+)
+# [alias].[Columna] <op> ...  y  ... <op> [alias].[Columna] (lado derecho de un JOIN)
+_PREDICADO = re.compile(
+    rf"{_IDENT}\.{_IDENT}\s*(=|<>|!=|<=|>=|<|>|\bNOT\s+IN\b|\bIN\b|\bNOT\s+LIKE\b|\bLIKE\b|\bIS\b|\bBETWEEN\b)",
+    re.IGNORECASE,
+)
+_PREDICADO_DERECHO = re.compile(rf"=\s*{_IDENT}\.{_IDENT}", re.IGNORECASE)
+_ORDEN = re.compile(r"\bORDER\s+BY\s+(.+?)(?:\bOFFSET\b|\bFOR\b|\)|$)", re.IGNORECASE)
+_COLUMNA = re.compile(rf"{_IDENT}\.{_IDENT}")
+
+
+@dataclass(frozen=True)
+class Predicado:
+    """Uso de una columna en un WHERE/ON: `igualdad` si se puede buscar con seek por igualdad."""
+
+    tabla: str
+    columna: str
+    igualdad: bool
+
+
+@dataclass
+class Forma:
+    """Estadísticas acumuladas de una sentencia normalizada (sin literales ni listas IN)."""
+
+    sql: str
+    ejecuciones: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    filas: int = 0
+    primera: datetime = field(default_factory=datetime.now)
+    ultima: datetime = field(default_factory=datetime.now)
+    predicados: Tuple[Predicado, ...] = ()
+    orden: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def promedio_ms(self) -> float:
+        return self.total_ms / self.ejecuciones if self.ejecuciones else 0.0
+
+    def snapshot(self) -> Dict:
+        return {
+            "sql": self.sql,
+            "ejecuciones": self.ejecuciones,
+            "total_ms": round(self.total_ms, 2),
+            "promedio_ms": round(self.promedio_ms, 3),
+            "max_ms": round(self.max_ms, 2),
+            "filas": self.filas,
+            "primera": self.primera,
+            "ultima": self.ultima,
+        }
+
+
+def normalizar_sql(sql: str) -> str:
+    """
+    Forma de la sentencia: literales y parámetros pasan a `?` y las listas IN de
+    cualquier largo a `(?, ...)`, así `IN (?, ?)` e `IN (?, ?, ?)` cuentan como la misma.
+    """
+    sql = _LITERAL_TEXTO.sub("?", sql)
+    sql = _LITERAL_NUMERO.sub("?", sql)
+    sql = _PARAMETRO.sub("?", sql)
+    sql = _LISTA_PARAMETROS.sub("(?, ...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def _alias(sql: str) -> Dict[str, str]:
+    alias: Dict[str, str] = {}
+    for _, tabla, nombre in _TABLA.findall(sql):
+        alias[tabla] = tabla
+        if nombre:
+            alias[nombre] = tabla
+    return alias
+
+
+def analizar(sql: str) -> Tuple[Tuple[Predicado, ...], Tuple[Tuple[str, str], ...]]:
+    """
+    Columnas que la sentencia usa para filtrar o unir (con la tabla real detrás de cada
+    alias) y columnas del ORDER BY. Es un análisis por patrones sobre el SQL que genera
+    SQLAlchemy, no un parser: alcanza para saber qué columnas conviene indexar.
+    """
+    alias = _alias(sql)
+    if not alias:
+        return (), ()
+    predicados: Dict[Tuple[str, str], Predicado] = {}
+
+    def agregar(nombre_alias: str, columna: str, igualdad: bool) -> None:
+        tabla = alias.get(nombre_alias)
+        if tabla is None:
+            return
+        clave = (tabla, columna)
+        previo = predicados.get(clave)
+        # Si la columna aparece por igualdad y por rango, la igualdad manda
+        predicados[clave] = Predicado(tabla, columna, igualdad or bool(previo and previo.igualdad))
+
+    for nombre_alias, columna, operador in _PREDICADO.findall(sql):
+        operador = operador.upper()
+        agregar(nombre_alias, columna, operador in ("=", "IN", "IS"))
+    for nombre_alias, columna in _PREDICADO_DERECHO.findall(sql):
+        agregar(nombre_alias, columna, True)
+
+    orden: List[Tuple[str, str]] = []
+    coincidencia = _ORDEN.search(sql)
+    if coincidencia:
+        for nombre_alias, columna in _COLUMNA.findall(coincidencia.group(1)):
+            if nombre_alias in alias:
+                orden.append((alias[nombre_alias], columna))
+    return tuple(predicados.values()), tuple(orden)
+
+
+class QueryStats:
+    """
+    Registro en memoria de las sentencias que ejecuta el engine, agrupadas por forma.
+    La normalización se cachea por texto de sentencia: SQLAlchemy repite el mismo SQL
+    compilado, así que el costo por ejecución es un lookup en un diccionario.
+    """
+
+    def __init__(self, max_formas: int = QUERY_STATS_MAX_SHAPES):
+        self.max_formas = max_formas
+        self.desde = datetime.now()
+        self._formas: Dict[str, Forma] = {}
+        self._por_sentencia: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _forma(self, sql: str) -> str:
+        clave = self._por_sentencia.get(sql)
+        if clave is not None:
+            return clave
+        clave = normalizar_sql(sql)
+        if clave not in self._formas and len(self._formas) >= self.max_formas:
+            clave = OTRAS
+        if len(self._por_sentencia) < self.max_formas * 4:
+            self._por_sentencia[sql] = clave
+        return clave
+
+    def registrar(self, sql: str, duracion_ms: float, filas: int = 0) -> None:
+        with self._lock:
+            clave = self._forma(sql)
+            forma = self._formas.get(clave)
+            if forma is None:
+                predicados, orden = analizar(clave) if clave != OTRAS else ((), ())
+                forma = self._formas[clave] = Forma(clave, predicados=predicados, orden=orden)
+            forma.ejecuciones += 1
+            forma.total_ms += duracion_ms
+            forma.max_ms = max(forma.max_ms, duracion_ms)
+            forma.filas += max(filas, 0)
+            forma.ultima = datetime.now()
+
+    def formas(self) -> List[Forma]:
+        with self._lock:
+            return list(self._formas.values())
+
+    def top(self, limit: int = 50, orden: str = "total_ms") -> List[Dict]:
+        if orden not in ("total_ms", "ejecuciones", "max_ms", "promedio_ms"):
+            raise ValueError("orden debe ser total_ms, ejecuciones, max_ms o promedio_ms")
+        formas = sorted(self.formas(), key=lambda f: getattr(f, orden), reverse=True)
+        return [forma.snapshot() for forma in formas[:limit]]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._formas.clear()
+            self._por_sentencia.clear()
+            self.desde = datetime.now()
+
+
+query_stats = QueryStats()
+
+_INICIO_KEY = "query_stats_inicio"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes(conn, cursor, statement, parameters, context, executemany) -> None:
+    if QUERY_STATS_ENABLED:
+        conn.info.setdefault(_INICIO_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues(conn, cursor, statement, parameters, context, executemany) -> None:
+    inicios = conn.info.get(_INICIO_KEY)
+    if not inicios:
+        return
+    duracion_ms = (time.perf_counter() - inicios.pop()) * 1000
+    try:
+        query_stats.registrar(statement, duracion_ms, getattr(cursor, "rowcount", 0) or 0)
+    except Exception:
+        logger.exception("Error registrando estadísticas de consultas")
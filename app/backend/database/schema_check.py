@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+
+logger = logging.getLogger(__name__)
+
+# Las tablas, columnas e índices de backend/database/sql no los crea la aplicación:
+# lo que depende de ellos pregunta acá y queda apagado mientras el script no se corra.
+# Se consulta una vez por proceso; después de correr un script hay que reiniciar.
+_existentes: Dict[Tuple[str, Optional[str]], bool] = {}
+_lock = threading.Lock()
+
+
+def existe(tabla: str, columna: Optional[str] = None, bind=None) -> bool:
+    """
+    True si `tabla` (o la columna `columna` de `tabla`) existe en la base. `bind` es la
+    conexión a usar (p. ej. la de la sesión dentro de un listener de flush); por defecto
+    el engine de la aplicación. Si la consulta falla no se guarda el resultado.
+    """
+    clave = (tabla, columna)
+    with _lock:
+        if clave in _existentes:
+            return _existentes[clave]
+    if bind is None:
+        from backend.database.connection import engine
+
+        bind = engine
+    try:
+        inspector = inspect(bind)
+        encontrado = inspector.has_table(tabla)
+        if encontrado and columna is not None:
+            encontrado = any(c["name"].lower() == columna.lower() for c in inspector.get_columns(tabla))
+    except Exception:
+        logger.exception(f"No se pudo verificar si existe {tabla}")
+        return False
+    with _lock:
+        _existentes[clave] = encontrado
+    if not encontrado:
+        objeto = f"{tabla}.{columna}" if columna else tabla
+        logger.warning(f"{objeto} no existe en la base: falta correr su script de backend/database/sql")
+    return encontrado
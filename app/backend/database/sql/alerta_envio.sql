@@ -0,0 +1,33 @@
+-- Disparos de alertas realizados por el scheduler (backend/services/alerta_scheduler.py).
+-- Cada ocurrencia (IdAlerta, FechaProgramada) se registra antes de enviarse:
+-- la restricción única evita envíos duplicados entre procesos.
+
+IF OBJECT_ID('dbo.AlertaEnvio', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.AlertaEnvio (
+        IdEnvio          INT IDENTITY(1,1) NOT NULL,
+        IdAlerta         INT           NOT NULL,
+        FechaProgramada  DATETIME      NOT NULL,
+        FechaEnvio       DATETIME      NULL,
+        Medio            VARCHAR(50)   NULL,
+        Estado           VARCHAR(20)   NOT NULL,
+        Error            VARCHAR(500)  NULL,
+        Intentos         INT           NOT NULL CONSTRAINT DF_AlertaEnvio_Intentos DEFAULT 1,
+        CONSTRAINT PK_AlertaEnvio PRIMARY KEY CLUSTERED (IdEnvio),
+        CONSTRAINT UQ_AlertaEnvio_Ocurrencia UNIQUE (IdAlerta, FechaProgramada)
+    );
+END
+GO
+
+-- Envíos fallidos: se reintentan hasta ALERTAS_REINTENTOS intentos
+IF COL_LENGTH('dbo.AlertaEnvio', 'Intentos') IS NULL
+    ALTER TABLE dbo.AlertaEnvio
+        ADD Intentos INT NOT NULL CONSTRAINT DF_AlertaEnvio_Intentos DEFAULT 1;
+GO
+
+-- El scheduler carga las alertas activas por estado
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Alerta_IdEstado')
+    CREATE NONCLUSTERED INDEX IX_Alerta_IdEstado
+        ON dbo.Alerta (IdEstado)
+        INCLUDE (IdPeriodicidad, FechaInicio, FechaFin, DiasPers);
+GO
@@ -0,0 +1,23 @@
+-- Eventos de cambios de alertas para el stream SSE (backend/services/alerta_events.py).
+-- Se escriben en la misma transacción que el cambio; cada worker lee los nuevos por
+-- IdEvento mientras tenga clientes conectados y se purgan después de
+-- ALERTAS_SSE_RETENTION_HOURS.
+
+IF OBJECT_ID('dbo.AlertaEvento', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.AlertaEvento (
+        IdEvento          INT IDENTITY(1,1) NOT NULL,
+        Fecha             DATETIME       NOT NULL,
+        IdAlerta          INT            NOT NULL,
+        Tipo              VARCHAR(30)    NOT NULL,
+        IdEstadoAnterior  INT            NULL,
+        Datos             NVARCHAR(4000) NULL,
+        CONSTRAINT PK_AlertaEvento PRIMARY KEY CLUSTERED (IdEvento)
+    );
+END
+GO
+
+-- Purga por antigüedad
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_AlertaEvento_Fecha')
+    CREATE NONCLUSTERED INDEX IX_AlertaEvento_Fecha ON dbo.AlertaEvento (Fecha);
+GO
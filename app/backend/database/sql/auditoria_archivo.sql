@@ -0,0 +1,38 @@
+-- Almacenamiento por meses de la auditoría.
+-- AuditoriaTest conserva solo los meses calientes; el job de archivado
+-- (python -m backend.services.auditoria_archivo_service) mueve los meses
+-- anteriores a AuditoriaTestArchivo, agrupada por periodo y con compresión PAGE.
+
+IF OBJECT_ID('dbo.AuditoriaTestArchivo', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.AuditoriaTestArchivo (
+        Periodo      INT            NOT NULL,  -- AAAAMM de AudFecha
+        IdAuditoria  INT            NOT NULL,
+        Accion       VARCHAR(50)    NOT NULL,
+        Entidad      VARCHAR(100)   NOT NULL,
+        Descripcion  VARCHAR(5000)  NOT NULL,
+        AudFecha     DATETIME       NOT NULL,
+        AudUsuario   INT            NOT NULL,
+        CONSTRAINT PK_AuditoriaTestArchivo PRIMARY KEY CLUSTERED (Periodo, IdAuditoria)
+            WITH (DATA_COMPRESSION = PAGE)
+    );
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_AuditoriaTestArchivo_AudFecha')
+    CREATE NONCLUSTERED INDEX IX_AuditoriaTestArchivo_AudFecha
+        ON dbo.AuditoriaTestArchivo (AudFecha DESC, IdAuditoria DESC)
+        WITH (DATA_COMPRESSION = PAGE);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_AuditoriaTestArchivo_IdAuditoria')
+    CREATE UNIQUE NONCLUSTERED INDEX IX_AuditoriaTestArchivo_IdAuditoria
+        ON dbo.AuditoriaTestArchivo (IdAuditoria)
+        WITH (DATA_COMPRESSION = PAGE);
+GO
+
+-- Tabla caliente: el listado y las exportaciones ordenan por AudFecha DESC.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_AuditoriaTest_AudFecha')
+    CREATE NONCLUSTERED INDEX IX_AuditoriaTest_AudFecha
+        ON dbo.AuditoriaTest (AudFecha DESC, IdAuditoria DESC);
+GO
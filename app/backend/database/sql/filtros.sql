@@ -0,0 +1,29 @@
+-- Índices para los filtros de listados (backend/database/filter_dsl.py).
+-- Los filtros de texto usan LIKE 'x%' por defecto: con estos índices se resuelven con
+-- un seek. 'contains' ('%x%') sigue recorriendo el índice completo.
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PropiedadMinera_Nombre')
+    CREATE NONCLUSTERED INDEX IX_PropiedadMinera_Nombre
+        ON dbo.PropiedadMinera (Nombre);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PropiedadMinera_Provincia')
+    CREATE NONCLUSTERED INDEX IX_PropiedadMinera_Provincia
+        ON dbo.PropiedadMinera (Provincia);
+GO
+
+-- EXISTS del filtro Expediente de propiedades
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Expediente_Propiedad_Codigo')
+    CREATE NONCLUSTERED INDEX IX_Expediente_Propiedad_Codigo
+        ON dbo.Expediente (IdPropiedadMinera, CodigoExpediente);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Acta_IdTransaccion')
+    CREATE NONCLUSTERED INDEX IX_Acta_IdTransaccion
+        ON dbo.Acta (IdTransaccion);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ReqMineroMov_Propiedad')
+    CREATE NONCLUSTERED INDEX IX_ReqMineroMov_Propiedad
+        ON dbo.ReqMineroMov (IdPropiedadMinera, IdReqMineroMov DESC);
+GO
@@ -0,0 +1,40 @@
+-- Catálogo e índices de texto completo para GET /search/texto
+-- (backend/repositories/fulltext_repositorie.py).
+-- Requiere el componente Full-Text Search instalado en la instancia.
+-- Idioma 3082 = español (moderno): separación de palabras y flexiones para FREETEXT.
+-- El KEY INDEX tiene que ser el índice único de una sola columna: se usa el de la PK.
+
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'FT_PropiedadMinera')
+    CREATE FULLTEXT CATALOG FT_PropiedadMinera WITH ACCENT_SENSITIVITY = OFF;
+GO
+
+DECLARE @pk SYSNAME;
+
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('dbo.Resolucion'))
+BEGIN
+    SELECT @pk = name FROM sys.indexes WHERE object_id = OBJECT_ID('dbo.Resolucion') AND is_primary_key = 1;
+    EXEC('CREATE FULLTEXT INDEX ON dbo.Resolucion (Contenido LANGUAGE 3082)
+          KEY INDEX ' + @pk + ' ON FT_PropiedadMinera WITH CHANGE_TRACKING AUTO');
+END
+
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('dbo.Acta'))
+BEGIN
+    SELECT @pk = name FROM sys.indexes WHERE object_id = OBJECT_ID('dbo.Acta') AND is_primary_key = 1;
+    EXEC('CREATE FULLTEXT INDEX ON dbo.Acta (Descripcion LANGUAGE 3082, Obs LANGUAGE 3082)
+          KEY INDEX ' + @pk + ' ON FT_PropiedadMinera WITH CHANGE_TRACKING AUTO');
+END
+
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('dbo.Alerta'))
+BEGIN
+    SELECT @pk = name FROM sys.indexes WHERE object_id = OBJECT_ID('dbo.Alerta') AND is_primary_key = 1;
+    EXEC('CREATE FULLTEXT INDEX ON dbo.Alerta (Mensaje LANGUAGE 3082)
+          KEY INDEX ' + @pk + ' ON FT_PropiedadMinera WITH CHANGE_TRACKING AUTO');
+END
+
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('dbo.Observaciones'))
+BEGIN
+    SELECT @pk = name FROM sys.indexes WHERE object_id = OBJECT_ID('dbo.Observaciones') AND is_primary_key = 1;
+    EXEC('CREATE FULLTEXT INDEX ON dbo.Observaciones (Observaciones LANGUAGE 3082)
+          KEY INDEX ' + @pk + ' ON FT_PropiedadMinera WITH CHANGE_TRACKING AUTO');
+END
+GO
@@ -0,0 +1,52 @@
+-- Checkpoint del barrido de integridad de Transaccion
+-- (python -m backend.services.integridad_service).
+
+IF OBJECT_ID('dbo.IntegridadCheckpoint', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.IntegridadCheckpoint (
+        Nombre               VARCHAR(50) NOT NULL,
+        UltimoIdTransaccion  INT         NOT NULL CONSTRAINT DF_IntegridadCheckpoint_Ultimo DEFAULT 0,
+        AudFecha             DATETIME    NULL,
+        CONSTRAINT PK_IntegridadCheckpoint PRIMARY KEY CLUSTERED (Nombre)
+    );
+END
+GO
+
+-- Las búsquedas de entidades sin transacción filtran por IdTransaccion IS NULL
+-- y las de registros por (Tabla, IdRegistro).
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Transaccion_Tabla_IdRegistro')
+    CREATE NONCLUSTERED INDEX IX_Transaccion_Tabla_IdRegistro
+        ON dbo.Transaccion (Tabla, IdRegistro);
+GO
+
+-- Entidades sin transacción: índices filtrados, el barrido solo lee las filas NULL
+-- a partir del checkpoint de cada tabla (sin_transaccion:<Tabla>).
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TitularMinero_SinTransaccion')
+    CREATE NONCLUSTERED INDEX IX_TitularMinero_SinTransaccion
+        ON dbo.TitularMinero (IdTitular) WHERE IdTransaccion IS NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PropiedadMinera_SinTransaccion')
+    CREATE NONCLUSTERED INDEX IX_PropiedadMinera_SinTransaccion
+        ON dbo.PropiedadMinera (IdPropiedadMinera) WHERE IdTransaccion IS NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Expediente_SinTransaccion')
+    CREATE NONCLUSTERED INDEX IX_Expediente_SinTransaccion
+        ON dbo.Expediente (IdExpediente) WHERE IdTransaccion IS NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Acta_SinTransaccion')
+    CREATE NONCLUSTERED INDEX IX_Acta_SinTransaccion
+        ON dbo.Acta (IdActa) WHERE IdTransaccion IS NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Resolucion_SinTransaccion')
+    CREATE NONCLUSTERED INDEX IX_Resolucion_SinTransaccion
+        ON dbo.Resolucion (IdResolucion) WHERE IdTransaccion IS NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Notificacion_SinTransaccion')
+    CREATE NONCLUSTERED INDEX IX_Notificacion_SinTransaccion
+        ON dbo.Notificacion (IdNotificacion) WHERE IdTransaccion IS NULL;
+GO
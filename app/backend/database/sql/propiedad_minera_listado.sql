@@ -0,0 +1,70 @@
+-- Proyección del listado de propiedades (GET /propiedades-mineras).
+-- Una fila por propiedad con el nombre del titular, la cantidad de expedientes y la
+-- fecha del último movimiento (MAX(ReqMineroMov.FechaInicio)). La aplicación la mantiene
+-- en el mismo flush que modifica PropiedadMinera, TitularMinero, Expediente o ReqMineroMov
+-- (backend/repositories/propiedad_minera_listado_repositorie.py); este script crea la tabla
+-- y la completa. Para rehacerla desde la API: POST /propiedades-mineras/listado/reconstruir.
+--
+-- No es una vista indexada porque éstas no admiten LEFT JOIN, subconsultas ni MAX.
+
+IF OBJECT_ID('dbo.PropiedadMineraListado', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.PropiedadMineraListado (
+        IdPropiedadMinera     INT           NOT NULL,
+        IdTransaccion         INT           NULL,
+        IdTitular             INT           NULL,
+        Nombre                VARCHAR(100)  NULL,
+        Solicitud             DATETIME      NULL,
+        Registro              DATETIME      NULL,
+        Notificacion          DATETIME      NULL,
+        Provincia             VARCHAR(100)  NULL,
+        Mensura               DATETIME      NULL,
+        AreaHectareas         FLOAT         NULL,
+        DescubrimientoDirecto VARCHAR(50)   NULL,
+        Referente             BIT           NULL,
+        TitularNombre         VARCHAR(100)  NULL,
+        CantidadExpedientes   INT           NOT NULL CONSTRAINT DF_PropiedadMineraListado_Cantidad DEFAULT 0,
+        UltimoMovimiento      DATETIME      NULL,
+        CONSTRAINT PK_PropiedadMineraListado PRIMARY KEY NONCLUSTERED (IdPropiedadMinera)
+    );
+END
+GO
+
+-- Clustered en el orden del listado: cada página es un rango contiguo del índice
+-- que ya trae todas las columnas, sin sort ni lookups.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PropiedadMineraListado_Orden')
+    CREATE UNIQUE CLUSTERED INDEX IX_PropiedadMineraListado_Orden
+        ON dbo.PropiedadMineraListado (Referente DESC, IdPropiedadMinera);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PropiedadMineraListado_Nombre')
+    CREATE NONCLUSTERED INDEX IX_PropiedadMineraListado_Nombre
+        ON dbo.PropiedadMineraListado (Nombre);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_PropiedadMineraListado_IdTitular')
+    CREATE NONCLUSTERED INDEX IX_PropiedadMineraListado_IdTitular
+        ON dbo.PropiedadMineraListado (IdTitular);
+GO
+
+-- Recalcular la cantidad de expedientes y el último movimiento de una propiedad
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ReqMineroMov_Propiedad_FechaInicio')
+    CREATE NONCLUSTERED INDEX IX_ReqMineroMov_Propiedad_FechaInicio
+        ON dbo.ReqMineroMov (IdPropiedadMinera, FechaInicio);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM dbo.PropiedadMineraListado)
+    INSERT INTO dbo.PropiedadMineraListado (
+        IdPropiedadMinera, IdTransaccion, IdTitular, Nombre, Solicitud, Registro, Notificacion,
+        Provincia, Mensura, AreaHectareas, DescubrimientoDirecto, Referente,
+        TitularNombre, CantidadExpedientes, UltimoMovimiento
+    )
+    SELECT
+        p.IdPropiedadMinera, p.IdTransaccion, p.IdTitular, p.Nombre, p.Solicitud, p.Registro, p.Notificacion,
+        p.Provincia, p.Mensura, p.AreaHectareas, p.DescubrimientoDirecto, p.Referente,
+        t.Nombre,
+        (SELECT COUNT(*) FROM dbo.Expediente e WHERE e.IdPropiedadMinera = p.IdPropiedadMinera),
+        (SELECT MAX(m.FechaInicio) FROM dbo.ReqMineroMov m WHERE m.IdPropiedadMinera = p.IdPropiedadMinera)
+    FROM dbo.PropiedadMinera p
+    LEFT JOIN dbo.TitularMinero t ON t.IdTitular = p.IdTitular;
+GO
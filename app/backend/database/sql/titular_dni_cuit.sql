@@ -0,0 +1,20 @@
+-- DniCuit normalizado para la búsqueda de titulares por documento
+-- (GET /titulares-mineros/dni/{dni_cuit} y /titulares-mineros/search).
+-- Se quitan los mismos separadores que backend.services.search_index.normalizar_documento.
+
+IF COL_LENGTH('dbo.TitularMinero', 'DniCuitNormalizado') IS NULL
+    ALTER TABLE dbo.TitularMinero
+        ADD DniCuitNormalizado AS
+            CAST(REPLACE(REPLACE(REPLACE(REPLACE(DniCuit, '-', ''), '.', ''), '/', ''), ' ', '') AS VARCHAR(20))
+            PERSISTED;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TitularMinero_DniCuit')
+    CREATE NONCLUSTERED INDEX IX_TitularMinero_DniCuit
+        ON dbo.TitularMinero (DniCuit);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TitularMinero_DniCuitNormalizado')
+    CREATE NONCLUSTERED INDEX IX_TitularMinero_DniCuitNormalizado
+        ON dbo.TitularMinero (DniCuitNormalizado);
+GO
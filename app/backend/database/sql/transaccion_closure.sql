@@ -0,0 +1,53 @@
+-- Tabla de clausura de la jerarquía de Transaccion (IdTransaccionPadre).
+-- Una fila por par (ancestro, descendiente), con la distancia entre ambos.
+-- La aplicación la mantiene al crear, mover o borrar transacciones
+-- (eventos en backend/models/transaccion_model.py); este script crea la tabla
+-- y la completa con la jerarquía existente.
+
+IF OBJECT_ID('dbo.TransaccionClosure', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.TransaccionClosure (
+        IdAncestro      INT NOT NULL,
+        IdDescendiente  INT NOT NULL,
+        Profundidad     INT NOT NULL,
+        CONSTRAINT PK_TransaccionClosure PRIMARY KEY CLUSTERED (IdAncestro, IdDescendiente)
+    );
+END
+GO
+
+-- Ancestros de un nodo: búsqueda por descendiente
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TransaccionClosure_Descendiente')
+    CREATE NONCLUSTERED INDEX IX_TransaccionClosure_Descendiente
+        ON dbo.TransaccionClosure (IdDescendiente, Profundidad)
+        INCLUDE (IdAncestro);
+GO
+
+-- Hijos directos (listados por padre y el CTE de respaldo)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Transaccion_IdTransaccionPadre')
+    CREATE NONCLUSTERED INDEX IX_Transaccion_IdTransaccionPadre
+        ON dbo.Transaccion (IdTransaccionPadre)
+        INCLUDE (Tabla, IdRegistro);
+GO
+
+-- Backfill: recorre la jerarquía desde cada nodo. El tope de profundidad
+-- protege contra ciclos accidentales en IdTransaccionPadre.
+IF NOT EXISTS (SELECT 1 FROM dbo.TransaccionClosure)
+BEGIN
+    WITH arbol (IdAncestro, IdDescendiente, Profundidad) AS (
+        SELECT t.IdTransaccion, t.IdTransaccion, 0
+        FROM dbo.Transaccion t
+        UNION ALL
+        SELECT a.IdAncestro, t.IdTransaccion, a.Profundidad + 1
+        FROM arbol a
+        JOIN dbo.Transaccion t
+          ON t.IdTransaccionPadre = a.IdDescendiente
+         AND t.IdTransaccion <> t.IdTransaccionPadre
+        WHERE a.Profundidad < 32
+    )
+    INSERT INTO dbo.TransaccionClosure (IdAncestro, IdDescendiente, Profundidad)
+    SELECT IdAncestro, IdDescendiente, MIN(Profundidad)
+    FROM arbol
+    GROUP BY IdAncestro, IdDescendiente
+    OPTION (MAXRECURSION 0);
+END
+GO
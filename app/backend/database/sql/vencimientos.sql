@@ -0,0 +1,28 @@
+-- Fechas de vencimiento calculadas para el endpoint GET /vencimientos
+-- (backend/repositories/vencimiento_repositorie.py).
+-- Las columnas son PERSISTED para poder indexarlas; SQL Server las mantiene solo
+-- al insertar o modificar Emision/Plazo o FechaInicio/FechaFin.
+
+IF COL_LENGTH('dbo.Notificacion', 'Vencimiento') IS NULL
+    ALTER TABLE dbo.Notificacion
+        ADD Vencimiento AS DATEADD(day, Plazo, Emision) PERSISTED;
+GO
+
+IF COL_LENGTH('dbo.Alerta', 'Vencimiento') IS NULL
+    ALTER TABLE dbo.Alerta
+        ADD Vencimiento AS COALESCE(FechaFin, FechaInicio) PERSISTED;
+GO
+
+-- Orden de la paginación por keyset: (Vencimiento, Id).
+-- Sin WHERE: SQL Server no admite índices filtrados por columnas calculadas.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Notificacion_Vencimiento')
+    CREATE NONCLUSTERED INDEX IX_Notificacion_Vencimiento
+        ON dbo.Notificacion (Vencimiento, IdNotificacion)
+        INCLUDE (Emision, Plazo, CodExp, Titular, IdTransaccion);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Alerta_Vencimiento')
+    CREATE NONCLUSTERED INDEX IX_Alerta_Vencimiento
+        ON dbo.Alerta (Vencimiento, idAlerta)
+        INCLUDE (IdTransaccion, IdTipoAlerta, IdEstado, Asunto, FechaInicio, FechaFin);
+GO
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from backend.database.connection import Base
+
+class AlertaEnvio(Base):
+    """
+    Registro de cada disparo de una alerta. La restricción única sobre
+    (IdAlerta, FechaProgramada) hace que cada ocurrencia se envíe una sola vez,
+    aunque haya más de un proceso evaluando alertas.
+    """
+    __tablename__ = 'AlertaEnvio'
+    __table_args__ = (
+        UniqueConstraint('IdAlerta', 'FechaProgramada', name='UQ_AlertaEnvio_Ocurrencia'),
+    )
+
+    IdEnvio = Column(Integer, primary_key=True, autoincrement=True)
+    IdAlerta = Column(Integer, nullable=False)
+    FechaProgramada = Column(DateTime, nullable=False)
+    FechaEnvio = Column(DateTime, nullable=True)
+    Medio = Column(String(50), nullable=True)
+    Estado = Column(String(20), nullable=False)  # enviando / enviado / error
+    Error = Column(String(500), nullable=True)
+    Intentos = Column(Integer, nullable=False, default=1)
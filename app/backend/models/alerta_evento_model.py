@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from backend.database.connection import Base
+
+class AlertaEvento(Base):
+    """
+    Cambio de una alerta para el stream SSE de /alertas/stream. Se inserta en la misma
+    transacción que el cambio, así todos los workers ven los mismos eventos con el mismo
+    IdEvento, que es lo que el cliente manda en Last-Event-ID al reconectarse.
+    """
+    __tablename__ = 'AlertaEvento'
+    __table_args__ = {'implicit_returning': False}
+
+    IdEvento = Column(Integer, primary_key=True, autoincrement=True)
+    Fecha = Column(DateTime, nullable=False)
+    IdAlerta = Column(Integer, nullable=False)
+    Tipo = Column(String(30), nullable=False)  # alerta_creada / alerta_modificada / alerta_estado / alerta_eliminada
+    IdEstadoAnterior = Column(Integer, nullable=True)
+    Datos = Column(String(4000), nullable=True)  # JSON con los campos de la alerta
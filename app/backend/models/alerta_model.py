@@ -22,4 +22,6 @@ class Alerta(Base):
     AudUsuario = Column(SmallInteger, nullable=True)
     Obs = Column(String(5000), nullable=True)
     DiasPers = Column(Integer, nullable=True)
+    # La columna calculada Vencimiento (backend/database/sql/vencimientos.sql) no se mapea:
+    # solo la lee VencimientoRepositorie, que verifica antes que exista
     estado = relationship('EstadoAlerta', backref='alertas')
@@ -11,4 +11,20 @@ class Auditoria(Base):
     Entidad = Column(String(100), nullable=False)
     Descripcion = Column(String(5000), nullable=False)  # use 500 if you keep the table at 500
     AudFecha = Column(DateTime, nullable=False)
-    AudUsuario = Column(Integer, nullable=False)
\ No newline at end of file
+    AudUsuario = Column(Integer, nullable=False)
+
+class AuditoriaArchivo(Base):
+    """
+    Meses fríos de AuditoriaTest, movidos por el job de archivado
+    (services/auditoria_archivo_service.py). Periodo = AAAAMM de AudFecha;
+    la tabla está agrupada por (Periodo, IdAuditoria) y comprimida (ver database/sql).
+    """
+    __tablename__ = 'AuditoriaTestArchivo'
+
+    Periodo = Column(Integer, primary_key=True, autoincrement=False)
+    IdAuditoria = Column(Integer, primary_key=True, autoincrement=False)
+    Accion = Column(String(50), nullable=False)
+    Entidad = Column(String(100), nullable=False)
+    Descripcion = Column(String(5000), nullable=False)
+    AudFecha = Column(DateTime, nullable=False)
+    AudUsuario = Column(Integer, nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from backend.database.connection import Base
+
+class IntegridadCheckpoint(Base):
+    """
+    Último IdTransaccion revisado por cada barrido de integridad
+    (services/integridad_service.py), para que las corridas nocturnas
+    solo revisen las transacciones nuevas.
+    """
+    __tablename__ = 'IntegridadCheckpoint'
+
+    Nombre = Column(String(50), primary_key=True)
+    UltimoIdTransaccion = Column(Integer, nullable=False, default=0)
+    AudFecha = Column(DateTime, nullable=True)
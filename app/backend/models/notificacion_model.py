@@ -12,4 +12,6 @@ class Notificacion(Base):
     CodExp = Column(String(50), nullable=True)
     Titular = Column(Integer, nullable=True)
     Funcionario = Column(String(50), nullable=False)
-    IdTransaccion = Column(Integer, nullable=True)
\ No newline at end of file
+    IdTransaccion = Column(Integer, nullable=True)
+    # La columna calculada Vencimiento (Emision + Plazo días, backend/database/sql/vencimientos.sql)
+    # no se mapea: solo la lee VencimientoRepositorie, que verifica antes que exista
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
+from backend.database.connection import Base
+
+
+class PropiedadMineraListado(Base):
+    """
+    Proyección de solo lectura para el listado de propiedades: las columnas de
+    PropiedadMinera más el nombre del titular, la cantidad de expedientes y la fecha
+    del último movimiento. La mantiene backend/repositories/propiedad_minera_listado_repositorie.py
+    en el mismo flush que modifica las tablas de origen (ver database/sql/propiedad_minera_listado.sql).
+    """
+    __tablename__ = "PropiedadMineraListado"
+    __table_args__ = (
+        Index("IX_PropiedadMineraListado_Orden", "Referente", "IdPropiedadMinera"),
+        Index("IX_PropiedadMineraListado_Nombre", "Nombre"),
+        Index("IX_PropiedadMineraListado_IdTitular", "IdTitular"),
+    )
+
+    IdPropiedadMinera = Column(Integer, primary_key=True, autoincrement=False)
+    IdTransaccion = Column(Integer, nullable=True)
+    IdTitular = Column(Integer, nullable=True)
+    Nombre = Column(String(100), nullable=True)
+    Solicitud = Column(DateTime, nullable=True)
+    Registro = Column(DateTime, nullable=True)
+    Notificacion = Column(DateTime, nullable=True)
+    Provincia = Column(String(100), nullable=True)
+    Mensura = Column(DateTime, nullable=True)
+    AreaHectareas = Column(Float, nullable=True)
+    DescubrimientoDirecto = Column(String(50), nullable=True)
+    Referente = Column(Integer, nullable=True)
+    TitularNombre = Column(String(100), nullable=True)
+    CantidadExpedientes = Column(Integer, nullable=False, default=0)
+    UltimoMovimiento = Column(DateTime, nullable=True)
@@ -10,6 +10,8 @@ class TitularMinero(Base):
     TipoPersona = Column(String(20), nullable=False)
     Nombre = Column(String(100), nullable=False)
     DniCuit = Column(String(20), nullable=False)
+    # La columna calculada DniCuitNormalizado (backend/database/sql/titular_dni_cuit.sql) no se
+    # mapea: solo la lee TitularMineroRepository.get_by_dni_cuit, que verifica antes que exista
     Domicilio = Column(String(150), nullable=False)
     Telefono = Column(String(20), nullable=False)
     Email = Column(String(100), nullable=False)
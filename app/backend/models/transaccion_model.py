@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, event, inspect, text
 from backend.database.connection import Base
+from backend.database.schema_check import existe
 
 class Transaccion(Base):
     __tablename__ = 'Transaccion'
@@ -11,3 +12,83 @@ class Transaccion(Base):
     Tabla = Column(String(50), nullable=False)
     AudFecha = Column(DateTime, nullable=True)
     AudUsuario = Column(String(10), nullable=True)
+
+class TransaccionClosure(Base):
+    """
+    Tabla de clausura de la jerarquía de Transaccion: una fila por cada par
+    (ancestro, descendiente), incluida la fila de cada nodo consigo mismo con
+    Profundidad 0. Se mantiene con los eventos de abajo, dentro de la misma
+    transacción que crea o mueve la Transaccion (ver database/sql/transaccion_closure.sql).
+    """
+    __tablename__ = 'TransaccionClosure'
+    __table_args__ = (
+        Index('IX_TransaccionClosure_Descendiente', 'IdDescendiente', 'Profundidad'),
+    )
+
+    IdAncestro = Column(Integer, primary_key=True, autoincrement=False)
+    IdDescendiente = Column(Integer, primary_key=True, autoincrement=False)
+    Profundidad = Column(Integer, nullable=False)
+
+
+_SQL_INSERTAR_NODO = text(
+    "INSERT INTO TransaccionClosure (IdAncestro, IdDescendiente, Profundidad) "
+    "VALUES (:id, :id, 0)"
+)
+# Copia los ancestros del padre (incluido el padre, Profundidad 0) a todo el subárbol del nodo
+_SQL_COLGAR_SUBARBOL = text(
+    "INSERT INTO TransaccionClosure (IdAncestro, IdDescendiente, Profundidad) "
+    "SELECT a.IdAncestro, d.IdDescendiente, a.Profundidad + d.Profundidad + 1 "
+    "FROM TransaccionClosure a, TransaccionClosure d "
+    "WHERE a.IdDescendiente = :padre AND d.IdAncestro = :id"
+)
+# Corta los vínculos entre el subárbol del nodo y sus ancestros actuales
+_SQL_DESCOLGAR_SUBARBOL = text(
+    "DELETE FROM TransaccionClosure "
+    "WHERE IdDescendiente IN (SELECT IdDescendiente FROM TransaccionClosure WHERE IdAncestro = :id) "
+    "AND IdAncestro NOT IN (SELECT IdDescendiente FROM TransaccionClosure WHERE IdAncestro = :id)"
+)
+_SQL_BORRAR_NODO = text(
+    "DELETE FROM TransaccionClosure WHERE IdAncestro = :id OR IdDescendiente = :id"
+)
+
+
+def _closure(connection) -> bool:
+    # Hasta correr transaccion_closure.sql no hay tabla que mantener: las consultas recorren IdTransaccionPadre
+    return existe(TransaccionClosure.__tablename__, bind=connection)
+
+
+def _padre_valido(id_transaccion, id_padre):
+    # 0/NULL marcan la raíz (p.ej. TitularMinero); un nodo no puede colgar de sí mismo
+    return id_padre and id_padre != id_transaccion
+
+
+@event.listens_for(Transaccion, "after_insert")
+def _closure_after_insert(mapper, connection, target):
+    if not _closure(connection):
+        return
+    connection.execute(_SQL_INSERTAR_NODO, {"id": target.IdTransaccion})
+    if _padre_valido(target.IdTransaccion, target.IdTransaccionPadre):
+        connection.execute(
+            _SQL_COLGAR_SUBARBOL, {"id": target.IdTransaccion, "padre": target.IdTransaccionPadre}
+        )
+
+
+@event.listens_for(Transaccion, "after_update")
+def _closure_after_update(mapper, connection, target):
+    historial = inspect(target).attrs.IdTransaccionPadre.history
+    if not historial.has_changes() or not _closure(connection):
+        return
+    connection.execute(_SQL_DESCOLGAR_SUBARBOL, {"id": target.IdTransaccion})
+    if _padre_valido(target.IdTransaccion, target.IdTransaccionPadre):
+        connection.execute(
+            _SQL_COLGAR_SUBARBOL, {"id": target.IdTransaccion, "padre": target.IdTransaccionPadre}
+        )
+
+
+@event.listens_for(Transaccion, "after_delete")
+def _closure_after_delete(mapper, connection, target):
+    if not _closure(connection):
+        return
+    # Los hijos quedan huérfanos: se desvinculan de los ancestros del nodo borrado
+    connection.execute(_SQL_DESCOLGAR_SUBARBOL, {"id": target.IdTransaccion})
+    connection.execute(_SQL_BORRAR_NODO, {"id": target.IdTransaccion})
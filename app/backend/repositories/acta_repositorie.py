@@ -1,10 +1,49 @@
 from backend.models.transaccion_model import Transaccion
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
 from backend.models.acta_model import Acta
+from backend.models.expediente_model import Expediente
 from backend.schemas.acta_schema import ActaCreate
+from backend.database.filter_dsl import EQ, IN, Campo, compilar_filtro, rango, texto
+
+
+def _filtro_expediente(operador, valor):
+    """Actas colgadas de la transacción del expediente (igual que get_by_transaccion_padre)."""
+    ids = [valor] if operador == EQ else valor
+    padres = select(Expediente.IdTransaccion).where(Expediente.IdExpediente.in_(ids))
+    return Acta.IdTransaccion.in_(
+        select(Transaccion.IdTransaccion).where(Transaccion.IdTransaccionPadre.in_(padres))
+    )
+
+
+FILTROS = {
+    "IdActa": Campo(Acta.IdActa),
+    "IdTransaccion": Campo(Acta.IdTransaccion),
+    "IdExpediente": Campo(expresion=_filtro_expediente, operadores=(EQ, IN), tipo=int),
+    "IdTipoActa": texto(Acta.IdTipoActa, defecto=EQ),
+    "IdAutoridad": Campo(Acta.IdAutoridad),
+    "Fecha": rango(Acta.Fecha),
+    "Lugar": texto(Acta.Lugar),
+}
+
+# Columnas de ActaListItem: Obs no se lee en los listados
+COLUMNAS_LISTADO = (
+    Acta.IdActa, Acta.IdExpediente, Acta.IdTransaccion, Acta.IdTipoActa,
+    Acta.Fecha, Acta.Lugar, Acta.IdAutoridad, Acta.Descripcion,
+)
+
 
 class ActaRepository:
 
+    def get_filtered_paginated(self, filtro=None, offset=0, limit=None):
+        """(actas, total) con el filtro de react-admin (ver FILTROS); sin limit trae todas."""
+        query = self.db.query(Acta).filter(*compilar_filtro(filtro, FILTROS))
+        total = query.count()
+        query = query.options(load_only(*COLUMNAS_LISTADO)).order_by(Acta.IdActa).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all(), total
+
     def get_by_transaccion_padre(self, id_transaccion_padre: int):
         from backend.models.transaccion_model import Transaccion
         return (
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from backend.database.schema_check import existe
+from backend.models.alerta_evento_model import AlertaEvento
+
+EVENTO_CREADA = "alerta_creada"
+EVENTO_MODIFICADA = "alerta_modificada"
+EVENTO_ESTADO = "alerta_estado"
+EVENTO_ELIMINADA = "alerta_eliminada"
+
+# Campos de la alerta que viajan en el evento (Mensaje y Obs quedan afuera por tamaño)
+CAMPOS_EVENTO = (
+    "IdTransaccion", "IdTipoAlerta", "IdEstado", "Asunto", "Medio",
+    "FechaInicio", "FechaFin", "Destinatarios", "AudUsuario",
+)
+_DATOS_MAX = 4000
+# Marca en session.info de que la transacción escribió eventos (se avisa al confirmar)
+SESSION_KEY = "alerta_eventos_escritos"
+
+
+def json_default(valor):
+    return valor.isoformat() if hasattr(valor, "isoformat") else str(valor)
+
+
+def _datos(valores: Dict[str, Any]) -> str:
+    datos = json.dumps(valores, default=json_default, ensure_ascii=False, separators=(",", ":"))
+    if len(datos) > _DATOS_MAX:
+        # Destinatarios es el único campo que puede no entrar
+        valores = {**valores, "Destinatarios": None, "DestinatariosTruncado": True}
+        datos = json.dumps(valores, default=json_default, ensure_ascii=False, separators=(",", ":"))
+    return datos
+
+
+def evento_alerta(id_alerta: int, tipo: str, valores: Dict[str, Any], id_estado_anterior=None) -> Dict[str, Any]:
+    """Fila para AlertaEvento; también la usan las actualizaciones masivas que no pasan por el flush."""
+    return {
+        "Fecha": datetime.now(),
+        "IdAlerta": id_alerta,
+        "Tipo": tipo,
+        "IdEstadoAnterior": id_estado_anterior,
+        "Datos": _datos({campo: valores.get(campo) for campo in CAMPOS_EVENTO}),
+    }
+
+
+def eventos_disponibles(bind=None) -> bool:
+    """False mientras no se corra database/sql/alerta_evento.sql: no hay eventos ni stream."""
+    return existe(AlertaEvento.__tablename__, bind=bind)
+
+
+def registrar_eventos(session: Session, filas: List[Dict[str, Any]]) -> None:
+    """Inserta los eventos en la transacción de `session`; se publican al confirmar."""
+    if not filas or not eventos_disponibles(session.connection()):
+        return
+    session.connection().execute(AlertaEvento.__table__.insert(), filas)
+    session.info[SESSION_KEY] = True
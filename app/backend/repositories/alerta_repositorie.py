@@ -1,7 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from backend.database.chunks import chunked
 from backend.models.alerta_model import Alerta
+from backend.models.estado_alerta_model import EstadoAlerta
 from backend.schemas.alerta_schema import AlertaCreate, AlertaUpdate
-from typing import List, Optional
+from backend.repositories.alerta_evento_repositorie import EVENTO_ESTADO, evento_alerta, registrar_eventos
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+from sqlalchemy import or_
+
+# Columnas que viajan en el evento SSE además de idAlerta/IdEstado
+_CAMPOS_EVENTO = (
+    "IdTransaccion", "IdTipoAlerta", "Asunto", "Medio", "FechaInicio", "FechaFin", "Destinatarios",
+)
+
+# Columnas por las que se puede ordenar desde el parámetro `sort`
+ORDENABLES = {
+    "idAlerta": Alerta.idAlerta,
+    "AudFecha": Alerta.AudFecha,
+    "FechaInicio": Alerta.FechaInicio,
+    "FechaFin": Alerta.FechaFin,
+    "IdEstado": Alerta.IdEstado,
+    "IdTipoAlerta": Alerta.IdTipoAlerta,
+    "Asunto": Alerta.Asunto,
+}
+
+# Columnas de AlertaListItem: Obs no se lee en los listados
+COLUMNAS_LISTADO = (
+    Alerta.idAlerta, Alerta.IdTransaccion, Alerta.IdTipoAlerta, Alerta.IdEstado, Alerta.Asunto,
+    Alerta.Mensaje, Alerta.Medio, Alerta.IdPeriodicidad, Alerta.FechaInicio, Alerta.FechaFin,
+    Alerta.Destinatarios, Alerta.AudFecha, Alerta.AudUsuario, Alerta.DiasPers,
+)
 
 class AlertaRepositorie:
     def __init__(self, db: Session):
@@ -14,6 +42,121 @@ class AlertaRepositorie:
         return self.db.query(Alerta).order_by(Alerta.idAlerta).offset(skip).limit(limit).all()
 
 
+    def _filtered_query(
+        self,
+        id_estado: Optional[int] = None,
+        id_tipo_alerta: Optional[int] = None,
+        id_transacciones: Sequence[int] = (),
+        fecha_desde: Optional[datetime] = None,
+        fecha_hasta: Optional[datetime] = None,
+    ):
+        query = self.db.query(Alerta)
+        if id_estado is not None:
+            query = query.filter(Alerta.IdEstado == id_estado)
+        if id_tipo_alerta is not None:
+            query = query.filter(Alerta.IdTipoAlerta == id_tipo_alerta)
+        if id_transacciones:
+            query = query.filter(Alerta.IdTransaccion.in_(list(id_transacciones)))
+        # El rango de fechas se aplica sobre el inicio de la alerta
+        if fecha_desde is not None:
+            query = query.filter(Alerta.FechaInicio >= fecha_desde)
+        if fecha_hasta is not None:
+            query = query.filter(Alerta.FechaInicio <= fecha_hasta)
+        return query
+
+    def get_filtered_paginated(
+        self,
+        id_estado: Optional[int] = None,
+        id_tipo_alerta: Optional[int] = None,
+        id_transacciones: Sequence[int] = (),
+        fecha_desde: Optional[datetime] = None,
+        fecha_hasta: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        sort: str = "idAlerta",
+        descending: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Página de alertas filtrada y ordenada en la base, con el nombre del estado
+        resuelto en la misma consulta. Devuelve (items, total que cumple los filtros).
+        """
+        query = self._filtered_query(id_estado, id_tipo_alerta, id_transacciones, fecha_desde, fecha_hasta)
+        total = query.count()
+        columna = ORDENABLES[sort]
+        orden = [columna.desc() if descending else columna.asc()]
+        if columna is not Alerta.idAlerta:
+            # Desempate estable para que las páginas no se solapen
+            orden.append(Alerta.idAlerta.desc() if descending else Alerta.idAlerta.asc())
+        rows = (
+            query.options(load_only(*COLUMNAS_LISTADO))
+            .outerjoin(EstadoAlerta, Alerta.IdEstado == EstadoAlerta.IdEstado)
+            .add_columns(EstadoAlerta.nombre)
+            .order_by(*orden)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        items = []
+        for alerta, estado_nombre in rows:
+            item = {columna.key: getattr(alerta, columna.key) for columna in COLUMNAS_LISTADO}
+            item["estado_nombre"] = estado_nombre
+            items.append(item)
+        return items, total
+
+    def bulk_update_estado(
+        self,
+        id_estado: int,
+        ids: Optional[Sequence[int]] = None,
+        filtros: Optional[Dict[str, Any]] = None,
+        aud_usuario: Optional[int] = None,
+    ) -> List[Tuple[int, Optional[int]]]:
+        """
+        Pasa a `id_estado` las alertas de `ids` (en tandas de IN) o las que cumplen `filtros`
+        sin cargarlas en la sesión. Las que ya están en ese estado no se tocan. Devuelve
+        [(idAlerta, IdEstado anterior)] de las modificadas.
+        """
+        ahora = datetime.now()
+        if ids is not None:
+            consultas = [
+                self.db.query(Alerta).filter(Alerta.idAlerta.in_(list(chunk)))
+                for chunk in chunked(list(dict.fromkeys(ids)))
+            ]
+        else:
+            consultas = [self._filtered_query(**(filtros or {}))]
+
+        modificadas: List[Tuple[int, Optional[int]]] = []
+        eventos = []
+        try:
+            for query in consultas:
+                query = query.filter(or_(Alerta.IdEstado != id_estado, Alerta.IdEstado.is_(None)))
+                # UPDLOCK en SQL Server (FOR UPDATE en los motores que lo soportan): nadie cambia
+                # estas filas entre la lectura y el UPDATE, que se limita a las claves leídas
+                filas = (
+                    query.with_entities(
+                        *(getattr(Alerta, campo) for campo in ("idAlerta", "IdEstado", *_CAMPOS_EVENTO))
+                    )
+                    .with_hint(Alerta, "WITH (UPDLOCK, ROWLOCK)", "mssql")
+                    .with_for_update()
+                    .all()
+                )
+                for chunk in chunked([fila.idAlerta for fila in filas]):
+                    self.db.query(Alerta).filter(Alerta.idAlerta.in_(chunk)).update(
+                        {Alerta.IdEstado: id_estado, Alerta.AudFecha: ahora, Alerta.AudUsuario: aud_usuario},
+                        synchronize_session=False,
+                    )
+                for fila in filas:
+                    valores = dict(fila._mapping)
+                    anterior = valores["IdEstado"]
+                    valores.update(IdEstado=id_estado, AudUsuario=aud_usuario)
+                    modificadas.append((fila.idAlerta, anterior))
+                    eventos.append(evento_alerta(fila.idAlerta, EVENTO_ESTADO, valores, anterior))
+            registrar_eventos(self.db, eventos)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return modificadas
+
     def get_by_id_estado(self, id_estado: int) -> List[Alerta]:
         return self.db.query(Alerta).filter(Alerta.IdEstado == id_estado).order_by(Alerta.idAlerta).all()
 
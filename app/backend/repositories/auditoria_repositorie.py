@@ -1,68 +1,218 @@
+from sqlalchemy import String, and_, cast, func, or_
 from sqlalchemy.orm import Session
-from backend.models.auditoria_model import Auditoria
+from backend.database.schema_check import existe
+from backend.models.auditoria_model import Auditoria, AuditoriaArchivo
 from backend.models.usuario_model import Usuario
-from backend.schemas.auditoria_schema import AuditoriaCreate, AuditoriaUpdate
-from typing import List, Optional, Dict, Any
+from backend.schemas.auditoria_schema import AuditoriaCreate, AuditoriaUpdate, AuditoriaExportFilters
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+
+
+def _to_naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """AudFecha se guarda en UTC sin tzinfo: los filtros se normalizan igual para comparar en SQL."""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def periodo_de(dt: datetime) -> int:
+    """Periodo AAAAMM usado como clave de partición del archivo."""
+    return dt.year * 100 + dt.month
+
+
+def _row_to_dict(aud, nombre) -> Dict[str, Any]:
+    return {
+        'IdAuditoria': aud.IdAuditoria,
+        'Accion': aud.Accion,
+        'Entidad': aud.Entidad,
+        'Descripcion': aud.Descripcion,
+        'AudFecha': aud.AudFecha,
+        'AudUsuario': aud.AudUsuario,
+        'UsuarioNombre': nombre if nombre else None
+    }
+
 
 class AuditoriaRepositorie:
+    """
+    Acceso a la auditoría repartida en dos tablas: AuditoriaTest (meses calientes)
+    y AuditoriaTestArchivo (meses fríos). Las consultas solo tocan las tablas que
+    necesita el rango de fechas pedido; como el archivo es estrictamente más viejo
+    que la tabla caliente, el orden por AudFecha DESC se obtiene concatenando
+    primero la tabla caliente y después el archivo.
+    """
+
+    _SIN_LEER = object()
+
     def __init__(self, db: Session):
         self.db = db
+        self._limite = self._SIN_LEER
 
-    def get(self, id_auditoria: int) -> Optional[Dict[str, Any]]:
+    def limite_archivo(self) -> Optional[datetime]:
+        """
+        Primer instante que vive en la tabla caliente (primer día del mes siguiente al
+        último periodo archivado), o None si no hay nada archivado.
+
+        Se lee de la base una vez por repositorio, es decir por request: MAX(Periodo) es
+        un seek sobre la clave agrupada del archivo. No se cachea entre requests porque
+        el archivado corre en otro proceso y los workers no se enterarían del corte nuevo.
+        """
+        if self._limite is self._SIN_LEER:
+            if not existe(AuditoriaArchivo.__tablename__):
+                # Sin auditoria_archivo.sql todo vive en la tabla caliente
+                self._limite = None
+                return None
+            max_periodo = self.db.query(func.max(AuditoriaArchivo.Periodo)).scalar()
+            valor = None
+            if max_periodo:
+                anio, mes = divmod(int(max_periodo), 100)
+                valor = datetime(anio + 1, 1, 1) if mes == 12 else datetime(anio, mes + 1, 1)
+            self._limite = valor
+        return self._limite
+
+    def _fuentes(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None):
+        """Tablas a consultar para el rango [desde, hasta], en orden de AudFecha descendente."""
+        limite = self.limite_archivo()
+        if limite is None:
+            return [Auditoria]
+        if desde is not None and desde >= limite:
+            return [Auditoria]
+        if hasta is not None and hasta < limite:
+            return [AuditoriaArchivo]
+        return [Auditoria, AuditoriaArchivo]
+
+    def _base_query(self, model, desde: Optional[datetime] = None, hasta: Optional[datetime] = None):
         query = (
             self.db.query(
-                Auditoria,
-                Usuario.NombreCompleto.label("UsuarioNombre")
+                model,
+                Usuario.NombreCompleto.label('UsuarioNombre')
             )
-            .outerjoin(Usuario, Auditoria.AudUsuario == Usuario.IdUsuario)
-            .filter(Auditoria.IdAuditoria == id_auditoria)
+            .outerjoin(Usuario, model.AudUsuario == Usuario.IdUsuario)
         )
-        result = query.first()
-        if not result:
-            return None
-        aud, nombre = result
-        return {
-            "IdAuditoria": aud.IdAuditoria,
-            "Accion": aud.Accion,
-            "Entidad": aud.Entidad,
-            "Descripcion": aud.Descripcion,
-            "AudFecha": aud.AudFecha,
-            "AudUsuario": aud.AudUsuario,
-            "UsuarioNombre": nombre if nombre else None
-        }
+        if model is AuditoriaArchivo:
+            # Predicado sobre la clave de agrupación: solo se leen los periodos del rango
+            if desde is not None:
+                query = query.filter(AuditoriaArchivo.Periodo >= periodo_de(desde))
+            if hasta is not None:
+                query = query.filter(AuditoriaArchivo.Periodo <= periodo_de(hasta))
+        return query
+
+    def get(self, id_auditoria: int) -> Optional[Dict[str, Any]]:
+        for model in (Auditoria, AuditoriaArchivo):
+            if model is AuditoriaArchivo and self.limite_archivo() is None:
+                break
+            result = (
+                self._base_query(model)
+                .filter(model.IdAuditoria == id_auditoria)
+                .first()
+            )
+            if result:
+                aud, nombre = result
+                return _row_to_dict(aud, nombre)
+        return None
 
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Retorna las auditorias con los nombres joined desde la tabla Usuario.
         Retorna los resultados en formato dict.
         """
-        query = (
-            self.db.query(
-                Auditoria,
-                Usuario.NombreCompleto.label('UsuarioNombre')
+        return self.get_filtered(AuditoriaExportFilters(), limit=limit, offset=skip)
+
+    def get_filtered(
+        self,
+        filtros: AuditoriaExportFilters,
+        limit: Optional[int] = 100,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Página de auditorías filtradas en orden (AudFecha, IdAuditoria) descendente.
+
+        Con `cursor` se pagina por keyset: solo se leen las filas estrictamente
+        posteriores a esa clave, sin recorrer las páginas anteriores. `offset` se
+        mantiene para el parámetro `range` de react-admin.
+        """
+        desde = _to_naive_utc(filtros.fechaDesde)
+        hasta = _to_naive_utc(filtros.fechaHasta)
+        if cursor is not None:
+            cursor_fecha, cursor_id = _to_naive_utc(cursor[0]), cursor[1]
+            hasta = cursor_fecha if hasta is None else min(hasta, cursor_fecha)
+
+        results: List[Dict[str, Any]] = []
+        offset = offset or 0
+        for model in self._fuentes(desde, hasta):
+            if limit and len(results) >= limit:
+                break
+            query = self._apply_export_filters(self._base_query(model, desde, hasta), filtros, model)
+            if cursor is not None:
+                query = query.filter(
+                    or_(
+                        model.AudFecha < cursor_fecha,
+                        and_(model.AudFecha == cursor_fecha, model.IdAuditoria < cursor_id),
+                    )
+                )
+            page_query = query.order_by(model.AudFecha.desc(), model.IdAuditoria.desc())
+            if offset:
+                page_query = page_query.offset(offset)
+            if limit:
+                page_query = page_query.limit(limit - len(results))
+            page = page_query.all()
+            results.extend(_row_to_dict(aud, nombre) for aud, nombre in page)
+            if offset:
+                # Si la tabla no alcanzó el offset, el resto se traslada a la siguiente
+                offset = 0 if page else max(0, offset - query.count())
+        return results
+
+    def count_filtered(self, filtros: AuditoriaExportFilters) -> int:
+        desde = _to_naive_utc(filtros.fechaDesde)
+        hasta = _to_naive_utc(filtros.fechaHasta)
+        total = 0
+        for model in self._fuentes(desde, hasta):
+            query = self._apply_export_filters(self._base_query(model, desde, hasta), filtros, model)
+            total += query.count()
+        return total
+
+    def _apply_export_filters(self, query, filtros: AuditoriaExportFilters, model=Auditoria):
+        """
+        Traduce AuditoriaExportFilters a condiciones SQL.
+        Entidad/Accion se comparan con IN: la collation de la tabla es case-insensitive.
+        El filtro de IdTransaccion solo se pre-filtra con LIKE; la coincidencia exacta
+        sobre el JSON de Descripcion se resuelve en el servicio.
+        """
+        usuario = (filtros.usuario or "").strip()
+        if usuario:
+            query = query.filter(
+                or_(
+                    Usuario.NombreCompleto.ilike(f"%{usuario}%"),
+                    cast(model.AudUsuario, String).like(f"%{usuario}%"),
+                )
             )
-            .outerjoin(Usuario, Auditoria.AudUsuario == Usuario.IdUsuario)
-            .order_by(Auditoria.AudFecha.desc())
-        )
-        if skip:
-            query = query.offset(skip)
-        if limit:
-            query = query.limit(limit)
-        
-        results = query.all()
-        # Convierte a formato dict con UsuarioNombre incluido y devuelve una lista de diccionarios
-        return [
-            {
-                'IdAuditoria': aud.IdAuditoria,
-                'Accion': aud.Accion,
-                'Entidad': aud.Entidad,
-                'Descripcion': aud.Descripcion,
-                'AudFecha': aud.AudFecha,
-                'AudUsuario': aud.AudUsuario,
-                'UsuarioNombre': nombre if nombre else None
-            }
-            for aud, nombre in results
-        ]
+        if filtros.entidad:
+            query = query.filter(model.Entidad.in_(filtros.entidad))
+        if filtros.accion:
+            query = query.filter(model.Accion.in_(filtros.accion))
+        id_transaccion = (filtros.idTransaccion or "").strip()
+        if id_transaccion:
+            query = query.filter(model.Descripcion.ilike(f"%{id_transaccion}%"))
+        if filtros.fechaDesde:
+            query = query.filter(model.AudFecha >= _to_naive_utc(filtros.fechaDesde))
+        if filtros.fechaHasta:
+            query = query.filter(model.AudFecha <= _to_naive_utc(filtros.fechaHasta))
+        return query
+
+    def iter_filtered(
+        self, filtros: AuditoriaExportFilters, batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre las auditorías filtradas directamente desde el cursor, de a `batch_size` filas,
+        sin materializar el resultado completo en memoria.
+        """
+        desde = _to_naive_utc(filtros.fechaDesde)
+        hasta = _to_naive_utc(filtros.fechaHasta)
+        for model in self._fuentes(desde, hasta):
+            query = self._apply_export_filters(self._base_query(model, desde, hasta), filtros, model)
+            query = query.order_by(model.AudFecha.desc(), model.IdAuditoria.desc())
+            for aud, nombre in query.yield_per(batch_size):
+                yield _row_to_dict(aud, nombre)
 
     def create(self, auditoria: AuditoriaCreate) -> Auditoria:
         db_obj = Auditoria(**auditoria.model_dump())
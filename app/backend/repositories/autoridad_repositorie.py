@@ -4,8 +4,9 @@ from backend.models.autoridad_model import Autoridad
 from backend.schemas.autoridad_schema import AutoridadCreate, AutoridadUpdate
 
 class AutoridadRepositorie:
-    def search_by_nombre(self, nombre: str):
-        return self.db.query(Autoridad).filter(Autoridad.Nombre.ilike(f"%{nombre}%")).all()
+    def search_by_nombre(self, nombre: str, limit: int = None):
+        query = self.db.query(Autoridad).filter(Autoridad.Nombre.ilike(f"%{nombre}%"))
+        return query.limit(limit).all() if limit else query.all()
     def __init__(self, db: Session):
         self.db = db
 
@@ -15,6 +16,13 @@ class AutoridadRepositorie:
     def get_by_id(self, id_autoridad: int):
         return self.db.query(Autoridad).filter(Autoridad.IdAutoridad == id_autoridad).first()
 
+    def get_by_ids(self, ids):
+        """Autoridades de `ids` en el mismo orden (las inexistentes se omiten)."""
+        if not ids:
+            return []
+        por_id = {a.IdAutoridad: a for a in self.db.query(Autoridad).filter(Autoridad.IdAutoridad.in_(ids)).all()}
+        return [por_id[i] for i in ids if i in por_id]
+
     def create(self, autoridad_data: AutoridadCreate):
         autoridad = Autoridad(**autoridad_data.dict())
         self.db.add(autoridad)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+_COLUMNAS = re.compile(r"\[([^\]]+)\]")
+
+# improvement_measure es la métrica que usa la propia documentación de SQL Server para
+# ordenar las sugerencias: costo promedio * impacto esperado * cantidad de usos
+_MISSING_INDEX_SQL = text(
+    """
+    SELECT
+        OBJECT_NAME(d.object_id, d.database_id) AS tabla,
+        d.equality_columns,
+        d.inequality_columns,
+        d.included_columns,
+        s.user_seeks,
+        s.user_scans,
+        s.avg_total_user_cost,
+        s.avg_user_impact,
+        s.last_user_seek,
+        s.avg_total_user_cost * (s.avg_user_impact / 100.0) * (s.user_seeks + s.user_scans) AS mejora
+    FROM sys.dm_db_missing_index_details AS d
+    JOIN sys.dm_db_missing_index_groups AS g ON g.index_handle = d.index_handle
+    JOIN sys.dm_db_missing_index_group_stats AS s ON s.group_handle = g.index_group_handle
+    WHERE d.database_id = DB_ID()
+    """
+)
+
+_FILAS_SQL = text(
+    """
+    SELECT OBJECT_NAME(p.object_id) AS tabla, SUM(p.row_count) AS filas
+    FROM sys.dm_db_partition_stats AS p
+    WHERE p.index_id IN (0, 1) AND OBJECTPROPERTY(p.object_id, 'IsUserTable') = 1
+    GROUP BY p.object_id
+    """
+)
+
+
+def _columnas(valor: Optional[str]) -> Tuple[str, ...]:
+    """'[IdPropiedadMinera], [Fecha]' -> ('IdPropiedadMinera', 'Fecha')."""
+    return tuple(_COLUMNAS.findall(valor or ""))
+
+
+class DiagnosticsRepositorie:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def es_sqlserver(self) -> bool:
+        return self.db.get_bind().dialect.name == "mssql"
+
+    def estructura(self, tablas) -> Dict[str, Dict]:
+        """
+        Columnas y columnas clave (en orden) de cada índice y de la PK de las tablas
+        pedidas. Las que no existen en la base no aparecen en el resultado.
+        """
+        inspector = inspect(self.db.get_bind())
+        nombres = set(inspector.get_table_names())
+        resultado: Dict[str, Dict] = {}
+        for tabla in tablas:
+            if tabla not in nombres:
+                continue
+            indices = [tuple(c for c in i["column_names"] if c) for i in inspector.get_indexes(tabla)]
+            pk = inspector.get_pk_constraint(tabla).get("constrained_columns") or []
+            if pk:
+                indices.append(tuple(pk))
+            resultado[tabla] = {
+                "columnas": {c["name"] for c in inspector.get_columns(tabla)},
+                "indices": indices,
+            }
+        return resultado
+
+    def missing_indexes(self) -> List[Dict]:
+        """Sugerencias del optimizador de SQL Server desde el último reinicio del servicio."""
+        if not self.es_sqlserver:
+            return []
+        filas = self.db.execute(_MISSING_INDEX_SQL).mappings().all()
+        return [
+            {
+                "tabla": fila["tabla"],
+                "igualdad": _columnas(fila["equality_columns"]),
+                "desigualdad": _columnas(fila["inequality_columns"]),
+                "incluidas": _columnas(fila["included_columns"]),
+                "usos": int((fila["user_seeks"] or 0) + (fila["user_scans"] or 0)),
+                "impacto": float(fila["avg_user_impact"] or 0),
+                "mejora": float(fila["mejora"] or 0),
+                "ultimo_uso": fila["last_user_seek"],
+            }
+            for fila in filas
+            if fila["tabla"]
+        ]
+
+    def filas_por_tabla(self) -> Dict[str, int]:
+        if not self.es_sqlserver:
+            return {}
+        return {fila["tabla"]: int(fila["filas"] or 0) for fila in self.db.execute(_FILAS_SQL).mappings()}
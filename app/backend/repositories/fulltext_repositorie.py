@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+import html
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from backend.database import change_events
+from backend.models.acta_model import Acta
+from backend.models.alerta_model import Alerta
+from backend.models.observaciones_model import Observaciones
+from backend.models.resolucion_model import Resolucion
+
+logger = logging.getLogger(__name__)
+
+# auto: CONTAINSTABLE/FREETEXTTABLE si la base es SQL Server, si no el sidecar FTS5
+FULLTEXT_BACKEND = os.getenv("FULLTEXT_BACKEND", "auto").lower()
+FULLTEXT_SIDECAR_PATH = os.getenv("FULLTEXT_SIDECAR_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "fulltext", "fulltext.sqlite3"
+)
+FULLTEXT_SNIPPET_CHARS = int(os.getenv("FULLTEXT_SNIPPET_CHARS", "200"))
+
+MODO_CONTAINS = "contains"
+MODO_FREETEXT = "freetext"
+MODOS = (MODO_CONTAINS, MODO_FREETEXT)
+
+# Marcas del resaltado antes de escapar el HTML del fragmento
+_INICIO, _FIN = "\x02", "\x03"
+_PALABRA = re.compile(r"\w+", re.UNICODE)
+_BATCH = 2000
+
+
+@dataclass(frozen=True)
+class FuenteTexto:
+    tipo: str
+    modelo: Any
+    columnas: Tuple[str, ...]
+
+    @property
+    def tabla(self) -> str:
+        return self.modelo.__tablename__
+
+    @property
+    def pk(self) -> str:
+        return inspect(self.modelo).primary_key[0].key
+
+
+FUENTES_TEXTO: Dict[str, FuenteTexto] = {
+    f.tipo: f
+    for f in (
+        FuenteTexto("resolucion", Resolucion, ("Contenido",)),
+        FuenteTexto("acta", Acta, ("Descripcion", "Obs")),
+        FuenteTexto("alerta", Alerta, ("Mensaje",)),
+        FuenteTexto("observacion", Observaciones, ("Observaciones",)),
+    )
+}
+_TIPO_INDICE = {tipo: i for i, tipo in enumerate(FUENTES_TEXTO)}
+_FUENTE_POR_ENTIDAD = {f.modelo.__name__: f for f in FUENTES_TEXTO.values()}
+
+
+def terminos(consulta: str) -> List[str]:
+    return list(dict.fromkeys(_PALABRA.findall(consulta or "")))
+
+
+def _plano(texto: str) -> str:
+    """Minúsculas y sin acentos carácter a carácter, conservando las posiciones."""
+    return "".join((unicodedata.normalize("NFKD", c)[:1] or c).lower() for c in texto)
+
+
+def resaltar(texto: str, palabras: Sequence[str], ancho: int = FULLTEXT_SNIPPET_CHARS) -> Optional[str]:
+    """
+    Fragmento de `texto` alrededor de la primera coincidencia, con las palabras que
+    empiezan con algún término entre <mark>. Ignora acentos y mayúsculas. Devuelve
+    None si ningún término aparece.
+    """
+    if not texto or not palabras:
+        return None
+    plano = _plano(texto)
+    patron = re.compile(r"\b(?:" + "|".join(re.escape(_plano(p)) for p in palabras) + r")\w*")
+    coincidencias = list(patron.finditer(plano))
+    if not coincidencias:
+        return None
+    inicio = max(0, coincidencias[0].start() - ancho // 3)
+    if inicio:
+        espacio = texto.find(" ", inicio)
+        inicio = espacio + 1 if 0 <= espacio < coincidencias[0].start() else inicio
+    fin = min(len(texto), inicio + ancho)
+    partes = []
+    cursor = inicio
+    for m in coincidencias:
+        if m.start() >= fin:
+            break
+        partes.append(texto[cursor : m.start()])
+        partes.append(_INICIO + texto[m.start() : min(m.end(), fin)] + _FIN)
+        cursor = min(m.end(), fin)
+    partes.append(texto[cursor:fin])
+    return _a_html(("…" if inicio else "") + "".join(partes) + ("…" if fin < len(texto) else ""))
+
+
+def _a_html(fragmento: str) -> str:
+    return html.escape(fragmento).replace(_INICIO, "<mark>").replace(_FIN, "</mark>")
+
+
+class FtsSidecar:
+    """
+    Índice FTS5 en un archivo SQLite al lado de la aplicación, para cuando la base no
+    es SQL Server. Una fila por (tipo, id, columna); el rowid se deriva de esos tres
+    valores, así actualizar o borrar un registro no recorre la tabla. Los workers de un
+    mismo host comparten el archivo y cada uno aplica sus propios commits.
+
+    La primera construcción corre en un hilo (al iniciar o en la primera búsqueda), sin
+    demorar ningún request; los commits que llegan mientras tanto se guardan y se
+    aplican al terminar.
+    """
+
+    def __init__(self, path: str = FULLTEXT_SIDECAR_PATH, session_factory=None):
+        self.path = path
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self.listo = False
+        self._construyendo = False
+        self._pendientes: List[change_events.ChangeEvent] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def construyendo(self) -> bool:
+        return self._construyendo
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from backend.database.connection import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _rowid(tipo: str, id_registro: int, campo: int) -> int:
+        return (int(id_registro) * len(FUENTES_TEXTO) + _TIPO_INDICE[tipo]) * 8 + campo
+
+    def disponible(self) -> bool:
+        """True si el índice ya se puede consultar; si no, arranca su construcción en segundo plano."""
+        if self.listo:
+            return True
+        if not self._construyendo and self._construido_en_disco():
+            return True
+        self.start()
+        return False
+
+    def build(self) -> None:
+        """Crea y llena el índice si todavía no existe (un solo worker lo construye)."""
+        with self._lock:
+            self._construyendo = True
+            self._pendientes.clear()
+        db = self._session()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS documentos USING fts5("
+                    "tipo UNINDEXED, id UNINDEXED, id_transaccion UNINDEXED, campo UNINDEXED, texto, "
+                    "tokenize = 'unicode61 remove_diacritics 2')"
+                )
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT)")
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    construido = conn.execute("SELECT valor FROM meta WHERE clave = 'construido'").fetchone()
+                    if construido is None:
+                        self._llenar(conn, db)
+                        conn.execute("INSERT INTO meta (clave, valor) VALUES ('construido', datetime('now'))")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+        finally:
+            db.close()
+            with self._lock:
+                self._construyendo = False
+                pendientes, self._pendientes = self._pendientes, []
+        self.listo = True
+        if pendientes:
+            self.aplicar(pendientes)
+
+    def _llenar(self, conn: sqlite3.Connection, db: Session) -> None:
+        conn.execute("DELETE FROM documentos")
+        total = 0
+        for fuente in FUENTES_TEXTO.values():
+            pk = getattr(fuente.modelo, fuente.pk)
+            columnas = [pk, fuente.modelo.IdTransaccion] + [getattr(fuente.modelo, c) for c in fuente.columnas]
+            ultimo = None
+            while True:
+                query = db.query(*columnas).order_by(pk)
+                if ultimo is not None:
+                    query = query.filter(pk > ultimo)
+                filas = query.limit(_BATCH).all()
+                for fila in filas:
+                    total += self._insertar(conn, fuente, fila[0], fila[1], dict(zip(fuente.columnas, fila[2:])))
+                if len(filas) < _BATCH:
+                    break
+                ultimo = filas[-1][0]
+        logger.info(f"Sidecar de texto completo construido con {total} documentos en {self.path}")
+
+    def _insertar(self, conn, fuente: FuenteTexto, id_registro, id_transaccion, valores: Dict[str, Any]) -> int:
+        filas = [
+            (self._rowid(fuente.tipo, id_registro, i), fuente.tipo, id_registro, id_transaccion, campo, valores[campo])
+            for i, campo in enumerate(fuente.columnas)
+            if valores.get(campo)
+        ]
+        conn.executemany(
+            "INSERT INTO documentos (rowid, tipo, id, id_transaccion, campo, texto) VALUES (?, ?, ?, ?, ?, ?)", filas
+        )
+        return len(filas)
+
+    def _quitar(self, conn, fuente: FuenteTexto, id_registro) -> None:
+        conn.executemany(
+            "DELETE FROM documentos WHERE rowid = ?",
+            [(self._rowid(fuente.tipo, id_registro, i),) for i in range(len(fuente.columnas))],
+        )
+
+    def _construido_en_disco(self) -> bool:
+        """Si otro worker ya construyó el archivo, este también tiene que mantenerlo."""
+        if not os.path.exists(self.path):
+            return False
+        conn = self._connect()
+        try:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'meta'").fetchone() is not None:
+                self.listo = conn.execute("SELECT 1 FROM meta WHERE clave = 'construido'").fetchone() is not None
+        finally:
+            conn.close()
+        return self.listo
+
+    def aplicar(self, cambios: Iterable[change_events.ChangeEvent]) -> None:
+        with self._lock:
+            if self._construyendo:
+                self._pendientes.extend(cambios)
+                return
+        if not self.listo and not self._construido_en_disco():
+            return
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for cambio in cambios:
+                fuente = _FUENTE_POR_ENTIDAD[cambio.entidad]
+                id_registro = cambio.valores.get(fuente.pk) or (cambio.identity[0] if cambio.identity else None)
+                if id_registro is None:
+                    continue
+                self._quitar(conn, fuente, id_registro)
+                if cambio.accion != change_events.DELETE:
+                    self._insertar(conn, fuente, id_registro, cambio.valores.get("IdTransaccion"), cambio.valores)
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def search(self, consulta: str, tipos: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            marcadores = ", ".join("?" for _ in tipos)
+            filas = conn.execute(
+                "SELECT tipo, id, id_transaccion, campo, bm25(documentos) AS rango, "
+                f"snippet(documentos, 4, '{_INICIO}', '{_FIN}', '…', 32) "
+                f"FROM documentos WHERE documentos MATCH ? AND tipo IN ({marcadores}) "
+                "ORDER BY rango LIMIT ?",
+                (consulta, *tipos, limit * len(FUENTES_TEXTO)),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                "tipo": tipo,
+                "id": id_registro,
+                "IdTransaccion": id_transaccion,
+                "campo": campo,
+                # bm25 es menor cuanto más relevante
+                "score": round(-rango, 4),
+                "snippet": _a_html(fragmento),
+            }
+            for tipo, id_registro, id_transaccion, campo, rango, fragmento in filas
+        ]
+
+
+    # --- ciclo de vida -------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self.listo or self._construyendo or (self._thread and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name="fulltext-sidecar", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._thread = None
+
+    def _run(self) -> None:
+        try:
+            self.build()
+        except Exception:
+            logger.exception("Error construyendo el sidecar de texto completo")
+
+
+fts_sidecar = FtsSidecar()
+
+
+def usa_sidecar(bind, backend: str = FULLTEXT_BACKEND) -> bool:
+    """Motor efectivo para `bind`: el sidecar salvo que la base sea SQL Server (o se fuerce mssql)."""
+    if backend == "auto":
+        return bind.dialect.name != "mssql"
+    return backend == "fts5"
+
+
+class FullTextRepositorie:
+    """
+    Búsqueda de texto completo sobre las columnas largas (Resolucion.Contenido,
+    Acta.Descripcion/Obs, Alerta.Mensaje, Observaciones.Observaciones).
+
+    En SQL Server usa CONTAINSTABLE (modo contains: todas las palabras, como prefijo)
+    o FREETEXTTABLE (modo freetext: por significado, con flexiones) sobre el catálogo
+    de database/sql/fulltext.sql. Con cualquier otro motor usa el sidecar FTS5.
+    Cada resultado trae un score (mayor es mejor) y un fragmento con las coincidencias
+    entre <mark>; los scores de tablas distintas son comparables solo aproximadamente.
+    """
+
+    def __init__(self, db: Session, backend: str = FULLTEXT_BACKEND):
+        self.db = db
+        if backend not in ("auto", "mssql", "fts5"):
+            raise ValueError(f"FULLTEXT_BACKEND '{backend}' no soportado (auto, mssql, fts5)")
+        self.backend = "fts5" if usa_sidecar(db.get_bind(), backend) else "mssql"
+
+    def disponible(self) -> bool:
+        """False mientras el sidecar se construye por primera vez."""
+        return self.backend == "mssql" or fts_sidecar.disponible()
+
+    def search(
+        self,
+        consulta: str,
+        tipos: Sequence[str] = tuple(FUENTES_TEXTO),
+        modo: str = MODO_CONTAINS,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        palabras = terminos(consulta)
+        if not palabras:
+            return []
+        if self.backend == "mssql":
+            hits = []
+            for tipo in tipos:
+                hits.extend(self._search_mssql(FUENTES_TEXTO[tipo], consulta, palabras, modo, limit))
+        else:
+            if modo == MODO_CONTAINS:
+                expresion = " AND ".join(f'"{p}"*' for p in palabras)
+            else:
+                expresion = " OR ".join(f'"{p}"' for p in palabras)
+            hits = fts_sidecar.search(expresion, tipos, limit)
+        return _mejor_por_registro(hits)[:limit]
+
+    def _search_mssql(self, fuente: FuenteTexto, consulta, palabras, modo, limit) -> List[Dict[str, Any]]:
+        columnas = ", ".join(f"t.[{c}]" for c in fuente.columnas)
+        lista = ", ".join(f"[{c}]" for c in fuente.columnas)
+        if modo == MODO_CONTAINS:
+            funcion = "CONTAINSTABLE"
+            condicion = " AND ".join(f'"{p}*"' for p in palabras)
+        else:
+            funcion, condicion = "FREETEXTTABLE", consulta
+        filas = self.db.execute(
+            text(
+                f"SELECT TOP (:limit) t.[{fuente.pk}] AS id, t.IdTransaccion, ft.[RANK] AS rango, {columnas} "
+                f"FROM {funcion}(dbo.[{fuente.tabla}], ({lista}), :condicion, :limit) AS ft "
+                f"JOIN dbo.[{fuente.tabla}] AS t ON t.[{fuente.pk}] = ft.[KEY] "
+                "ORDER BY ft.[RANK] DESC"
+            ),
+            {"condicion": condicion, "limit": limit},
+        ).all()
+        hits = []
+        for fila in filas:
+            campo, fragmento = fuente.columnas[0], None
+            for columna in fuente.columnas:
+                fragmento = resaltar(getattr(fila, columna) or "", palabras)
+                if fragmento:
+                    campo = columna
+                    break
+            if fragmento is None:
+                # FREETEXT también encuentra flexiones que no empiezan con la palabra buscada
+                valor = getattr(fila, campo) or ""
+                fragmento = _a_html(valor[:FULLTEXT_SNIPPET_CHARS] + ("…" if len(valor) > FULLTEXT_SNIPPET_CHARS else ""))
+            hits.append(
+                {
+                    "tipo": fuente.tipo,
+                    "id": fila.id,
+                    "IdTransaccion": fila.IdTransaccion,
+                    "campo": campo,
+                    "score": float(fila.rango),
+                    "snippet": fragmento,
+                }
+            )
+        return hits
+
+
+def _mejor_por_registro(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Un resultado por (tipo, id), el de mayor score, ordenados de mayor a menor."""
+    mejores: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    for hit in hits:
+        clave = (hit["tipo"], hit["id"])
+        if clave not in mejores or hit["score"] > mejores[clave]["score"]:
+            mejores[clave] = hit
+    return sorted(mejores.values(), key=lambda h: -h["score"])
+
+
+@change_events.on_commit
+def _sincronizar_sidecar(cambios: List[change_events.ChangeEvent]) -> None:
+    cambios = [c for c in cambios if c.entidad in _FUENTE_POR_ENTIDAD]
+    if cambios:
+        fts_sidecar.aplicar(cambios)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import os
+from typing import Iterable, List, Set
+
+from sqlalchemy import and_, delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from backend.database.chunks import chunked
+from backend.database.filter_dsl import EQ, Campo, compilar_filtro, rango, texto
+from backend.database.schema_check import existe
+from backend.models.expediente_model import Expediente
+from backend.models.propiedad_minera_listado_model import PropiedadMineraListado
+from backend.models.propiedad_minera_model import PropiedadMinera
+from backend.models.req_minero_mov_model import ReqMineroMov
+from backend.models.titular_minero_model import TitularMinero
+from backend.repositories.propiedad_minera_repositorie import filtro_expediente
+
+# false: el listado vuelve a leer PropiedadMinera y no se mantiene la proyección. Lo mismo
+# pasa, aunque esté en true, mientras no se corra database/sql/propiedad_minera_listado.sql
+PROPIEDAD_LISTADO_ENABLED = os.getenv("PROPIEDAD_LISTADO_ENABLED", "true").lower() in ("1", "true", "si", "yes")
+
+_SESSION_KEY = "propiedad_listado_pendientes"
+
+_COLUMNAS_PROPIEDAD = (
+    "IdPropiedadMinera", "IdTransaccion", "IdTitular", "Nombre", "Solicitud", "Registro",
+    "Notificacion", "Provincia", "Mensura", "AreaHectareas", "DescubrimientoDirecto", "Referente",
+)
+
+
+
+def listado_disponible(bind=None) -> bool:
+    """True si la proyección está habilitada y su tabla existe."""
+    return PROPIEDAD_LISTADO_ENABLED and existe(PropiedadMineraListado.__tablename__, bind=bind)
+
+
+FILTROS = {
+    "IdPropiedadMinera": Campo(PropiedadMineraListado.IdPropiedadMinera),
+    "IdTransaccion": Campo(PropiedadMineraListado.IdTransaccion),
+    "IdTitular": Campo(PropiedadMineraListado.IdTitular),
+    "Nombre": texto(PropiedadMineraListado.Nombre),
+    "Provincia": texto(PropiedadMineraListado.Provincia, defecto=EQ),
+    "Referente": Campo(PropiedadMineraListado.Referente),
+    "Solicitud": rango(PropiedadMineraListado.Solicitud),
+    "Registro": rango(PropiedadMineraListado.Registro),
+    "Mensura": rango(PropiedadMineraListado.Mensura),
+    "AreaHectareas": rango(PropiedadMineraListado.AreaHectareas),
+    "Expediente": filtro_expediente(PropiedadMineraListado.IdPropiedadMinera),
+    "TitularNombre": texto(PropiedadMineraListado.TitularNombre),
+    "CantidadExpedientes": rango(PropiedadMineraListado.CantidadExpedientes),
+    "UltimoMovimiento": rango(PropiedadMineraListado.UltimoMovimiento),
+}
+
+
+def _select_proyeccion(condicion=None):
+    """Filas de la proyección calculadas desde las tablas de origen."""
+    cantidad = (
+        select(func.count(Expediente.IdExpediente))
+        .where(Expediente.IdPropiedadMinera == PropiedadMinera.IdPropiedadMinera)
+        .scalar_subquery()
+    )
+    ultimo = (
+        select(func.max(ReqMineroMov.FechaInicio))
+        .where(ReqMineroMov.IdPropiedadMinera == PropiedadMinera.IdPropiedadMinera)
+        .scalar_subquery()
+    )
+    query = select(
+        *(getattr(PropiedadMinera, c) for c in _COLUMNAS_PROPIEDAD),
+        TitularMinero.Nombre.label("TitularNombre"),
+        cantidad.label("CantidadExpedientes"),
+        ultimo.label("UltimoMovimiento"),
+    ).outerjoin(TitularMinero, TitularMinero.IdTitular == PropiedadMinera.IdTitular)
+    return query.where(condicion) if condicion is not None else query
+
+
+_DESTINO = [*_COLUMNAS_PROPIEDAD, "TitularNombre", "CantidadExpedientes", "UltimoMovimiento"]
+
+
+def refrescar(connection, ids_propiedad: Iterable[int]) -> None:
+    """
+    Recalcula las filas de las propiedades indicadas desde PropiedadMinera: actualiza las
+    que están, inserta las que faltan y borra las de propiedades que ya no existen.
+    """
+    ids = sorted({i for i in ids_propiedad if i is not None})
+    tabla = PropiedadMineraListado.__table__
+    for lote in chunked(ids):
+        connection.execute(
+            delete(tabla).where(
+                tabla.c.IdPropiedadMinera.in_(lote),
+                ~select(PropiedadMinera.IdPropiedadMinera)
+                .where(PropiedadMinera.IdPropiedadMinera == tabla.c.IdPropiedadMinera)
+                .exists(),
+            )
+        )
+        origen = _select_proyeccion(PropiedadMinera.IdPropiedadMinera.in_(lote)).subquery()
+        connection.execute(
+            update(tabla)
+            .where(tabla.c.IdPropiedadMinera == origen.c.IdPropiedadMinera)
+            .values({c: origen.c[c] for c in _DESTINO if c != "IdPropiedadMinera"})
+        )
+        # UPDLOCK + HOLDLOCK: si otra transacción refresca la misma propiedad nueva, espera
+        # a que ésta termine en lugar de insertar la misma clave
+        existente = (
+            select(tabla.c.IdPropiedadMinera)
+            .where(tabla.c.IdPropiedadMinera == PropiedadMinera.IdPropiedadMinera)
+            .with_hint(tabla, "WITH (UPDLOCK, HOLDLOCK)", "mssql")
+        )
+        connection.execute(
+            insert(tabla).from_select(
+                _DESTINO,
+                _select_proyeccion(and_(PropiedadMinera.IdPropiedadMinera.in_(lote), ~existente.exists())),
+            )
+        )
+
+
+def reconstruir(connection) -> int:
+    """Vacía y vuelve a llenar la proyección completa."""
+    tabla = PropiedadMineraListado.__table__
+    connection.execute(delete(tabla))
+    connection.execute(insert(tabla).from_select(_DESTINO, _select_proyeccion()))
+    return connection.execute(select(func.count()).select_from(tabla)).scalar() or 0
+
+
+class PropiedadMineraListadoRepositorie:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_filtered_paginated(self, filtro=None, offset=0, limit=10):
+        """
+        Misma semántica que PropiedadMineraRepositorie.get_filtered_paginated, sobre la
+        proyección: el orden (Referente desc, IdPropiedadMinera) es el de su índice.
+        """
+        condiciones = compilar_filtro(filtro, FILTROS)
+        total = self.db.query(func.count(PropiedadMineraListado.IdPropiedadMinera)).filter(*condiciones).scalar()
+        items = (
+            self.db.query(PropiedadMineraListado)
+            .filter(*condiciones)
+            .order_by(PropiedadMineraListado.Referente.desc(), PropiedadMineraListado.IdPropiedadMinera)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return items, total
+
+    def reconstruir(self) -> int:
+        if not existe(PropiedadMineraListado.__tablename__):
+            raise ValueError("Falta crear PropiedadMineraListado (database/sql/propiedad_minera_listado.sql)")
+        total = reconstruir(self.db.connection())
+        self.db.commit()
+        return total
+
+
+def _valores(obj, columna: str) -> List:
+    """Valor actual y, si cambió en este flush, el anterior."""
+    historial = inspect(obj).attrs[columna].history
+    return [getattr(obj, columna), *historial.deleted]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    if not PROPIEDAD_LISTADO_ENABLED:
+        return
+    propiedades: Set[int] = set()
+    titulares: Set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, (PropiedadMinera, Expediente, ReqMineroMov)):
+            propiedades.update(_valores(obj, "IdPropiedadMinera"))
+        elif isinstance(obj, TitularMinero) and (
+            obj in session.deleted or inspect(obj).attrs.Nombre.history.has_changes()
+        ):
+            titulares.add(obj.IdTitular)
+    propiedades.discard(None)
+    if (propiedades or titulares) and listado_disponible(session.connection()):
+        pendientes = session.info.setdefault(_SESSION_KEY, (set(), set()))
+        pendientes[0].update(propiedades)
+        pendientes[1].update(titulares)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _aplicar(session: Session, flush_context) -> None:
+    pendientes = session.info.pop(_SESSION_KEY, None)
+    if not pendientes:
+        return
+    propiedades, titulares = pendientes
+    connection = session.connection()
+    if titulares:
+        for lote in chunked(sorted(titulares)):
+            propiedades.update(
+                connection.execute(
+                    select(PropiedadMinera.IdPropiedadMinera).where(PropiedadMinera.IdTitular.in_(lote))
+                ).scalars()
+            )
+    # Mismo connection y transacción que el flush: si el commit falla, la proyección vuelve atrás
+    refrescar(connection, propiedades)
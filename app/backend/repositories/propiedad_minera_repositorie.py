@@ -1,32 +1,51 @@
 from backend.models.expediente_model import Expediente
+from sqlalchemy import exists, or_
 from sqlalchemy.orm import Session
+from backend.database.filter_dsl import CONTAINS, EQ, PREFIX, Campo, comparar, compilar_filtro, rango, texto
 from backend.models.propiedad_minera_model import PropiedadMinera
 from backend.schemas.propiedad_minera_schema import PropiedadMineraCreate
 
+def filtro_expediente(id_propiedad) -> Campo:
+    """
+    Propiedades con algún expediente cuyo código coincide (o cuyo Id es el valor).
+    `id_propiedad` es la columna con el Id de la propiedad en la tabla que se filtra.
+    """
+    def expresion(operador, valor):
+        condicion = comparar(Expediente.CodigoExpediente, operador, valor)
+        if str(valor).isdigit():
+            condicion = or_(condicion, Expediente.IdExpediente == int(valor))
+        return exists().where(Expediente.IdPropiedadMinera == id_propiedad, condicion)
+
+    return Campo(expresion=expresion, operadores=(EQ, PREFIX, CONTAINS), defecto=PREFIX)
+
+
+FILTROS = {
+    "IdPropiedadMinera": Campo(PropiedadMinera.IdPropiedadMinera),
+    "IdTransaccion": Campo(PropiedadMinera.IdTransaccion),
+    "IdTitular": Campo(PropiedadMinera.IdTitular),
+    "Nombre": texto(PropiedadMinera.Nombre),
+    "Provincia": texto(PropiedadMinera.Provincia, defecto=EQ),
+    "Referente": Campo(PropiedadMinera.Referente),
+    "Solicitud": rango(PropiedadMinera.Solicitud),
+    "Registro": rango(PropiedadMinera.Registro),
+    "Mensura": rango(PropiedadMinera.Mensura),
+    "AreaHectareas": rango(PropiedadMinera.AreaHectareas),
+    "Expediente": filtro_expediente(PropiedadMinera.IdPropiedadMinera),
+}
+
+
 class PropiedadMineraRepositorie:
     model_class = PropiedadMinera
-    def get_filtered_paginated(self, filters=None, offset=0, limit=10):
-        query = self.db.query(PropiedadMinera)
-        if filters:
-            if filters.get("nombre"):
-                query = query.filter(PropiedadMinera.Nombre.ilike(f"%{filters['nombre']}%"))
-            if filters.get("provincia"):
-                query = query.filter(PropiedadMinera.Provincia == filters["provincia"])
-            if filters.get("id_titular"):
-                query = query.filter(PropiedadMinera.IdTitular == filters["id_titular"])
-            if filters.get("expediente"):
-                expediente_val = filters["expediente"]
-                # Join con Expediente y filtrar por CodigoExpediente o IdExpediente
-                query = query.join(Expediente, PropiedadMinera.IdPropiedadMinera == Expediente.IdPropiedadMinera)
-                from sqlalchemy import or_, cast, String as SAString
-                query = query.filter(
-                    or_(
-                        Expediente.CodigoExpediente.ilike(f"%{expediente_val}%"),
-                        cast(Expediente.IdExpediente, SAString) == str(expediente_val)
-                    )
-                )
-        total = query.distinct().count()
-        items = query.order_by(PropiedadMinera.Referente.desc()).offset(offset).limit(limit).all()
+    def get_filtered_paginated(self, filtro=None, offset=0, limit=10):
+        """`filtro` es el JSON de react-admin; ver FILTROS y backend.database.filter_dsl."""
+        query = self.db.query(PropiedadMinera).filter(*compilar_filtro(filtro, FILTROS))
+        total = query.count()
+        items = (
+            query.order_by(PropiedadMinera.Referente.desc(), PropiedadMinera.IdPropiedadMinera)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
         return items, total
     def __init__(self, db: Session):
         self.db = db
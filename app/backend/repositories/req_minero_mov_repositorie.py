@@ -1,9 +1,25 @@
 from sqlalchemy.orm import Session
 from backend.models.req_minero_mov_model import ReqMineroMov
 from backend.schemas.req_minero_mov_schema import ReqMineroMovCreate, ReqMineroMovUpdate
+from backend.database.filter_dsl import EQ, Campo, compilar_filtro, rango, texto
 from typing import List, Optional
 from datetime import datetime
 
+FILTROS = {
+    "IdReqMineroMov": Campo(ReqMineroMov.IdReqMineroMov),
+    "IdPropiedadMinera": Campo(ReqMineroMov.IdPropiedadMinera),
+    "IdReqMinero": Campo(ReqMineroMov.IdReqMinero),
+    "IdTransaccion": Campo(ReqMineroMov.IdTransaccion),
+    "Descripcion": texto(ReqMineroMov.Descripcion),
+    "Importe": rango(ReqMineroMov.Importe),
+    "FechaInicio": rango(ReqMineroMov.FechaInicio),
+    "FechaFin": rango(ReqMineroMov.FechaFin),
+    "AudFecha": rango(ReqMineroMov.AudFecha),
+    # Los que ya manda el frontend: cada uno es un extremo del rango de FechaInicio
+    "FechaDesde": Campo(ReqMineroMov.FechaInicio, operadores=(EQ,), expresion=lambda _, v: ReqMineroMov.FechaInicio >= v),
+    "FechaHasta": Campo(ReqMineroMov.FechaInicio, operadores=(EQ,), expresion=lambda _, v: ReqMineroMov.FechaInicio <= v),
+}
+
 class ReqMineroMovRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -88,42 +104,18 @@ class ReqMineroMovRepository:
             ReqMineroMov.IdPropiedadMinera == id_propiedad_minera
         ).count()
 
-    def search(self, filters: dict, skip: int = 0, limit: int = 100) -> List[ReqMineroMov]:
-        query = self.db.query(ReqMineroMov)
-        
-        if filters.get('IdPropiedadMinera'):
-            query = query.filter(ReqMineroMov.IdPropiedadMinera == filters['IdPropiedadMinera'])
-        
-        if filters.get('IdReqMinero'):
-            query = query.filter(ReqMineroMov.IdReqMinero == filters['IdReqMinero'])
-        
-        if filters.get('Descripcion'):
-            query = query.filter(ReqMineroMov.Descripcion.contains(filters['Descripcion']))
-        
-        if filters.get('FechaDesde'):
-            query = query.filter(ReqMineroMov.Fecha >= filters['FechaDesde'])
-        
-        if filters.get('FechaHasta'):
-            query = query.filter(ReqMineroMov.Fecha <= filters['FechaHasta'])
-        
-        return query.order_by(ReqMineroMov.IdReqMineroMov.desc()).offset(skip).limit(limit).all()
+    def _filtered_query(self, filtro):
+        return self.db.query(ReqMineroMov).filter(*compilar_filtro(filtro, FILTROS))
 
-    def search_count(self, filters: dict) -> int:
-        query = self.db.query(ReqMineroMov)
-        
-        if filters.get('IdPropiedadMinera'):
-            query = query.filter(ReqMineroMov.IdPropiedadMinera == filters['IdPropiedadMinera'])
-        
-        if filters.get('IdReqMinero'):
-            query = query.filter(ReqMineroMov.IdReqMinero == filters['IdReqMinero'])
-        
-        if filters.get('Descripcion'):
-            query = query.filter(ReqMineroMov.Descripcion.contains(filters['Descripcion']))
-        
-        if filters.get('FechaDesde'):
-            query = query.filter(ReqMineroMov.Fecha >= filters['FechaDesde'])
-        
-        if filters.get('FechaHasta'):
-            query = query.filter(ReqMineroMov.Fecha <= filters['FechaHasta'])
-        
-        return query.count()
+    def search(self, filtro, skip: int = 0, limit: int = 100) -> List[ReqMineroMov]:
+        """`filtro` es el JSON de react-admin; ver FILTROS y backend.database.filter_dsl."""
+        return (
+            self._filtered_query(filtro)
+            .order_by(ReqMineroMov.IdReqMineroMov.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def search_count(self, filtro) -> int:
+        return self._filtered_query(filtro).count()
@@ -1,7 +1,48 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
+from backend.database.filter_dsl import EQ, IN, Campo, compilar_filtro, rango, texto
+from backend.models.expediente_model import Expediente
 from backend.models.resolucion_model import Resolucion
+from backend.models.transaccion_model import Transaccion
+
+
+def _filtro_expediente(operador, valor):
+    """Resoluciones colgadas de la transacción del expediente."""
+    ids = [valor] if operador == EQ else valor
+    padres = select(Expediente.IdTransaccion).where(Expediente.IdExpediente.in_(ids))
+    return Resolucion.IdTransaccion.in_(
+        select(Transaccion.IdTransaccion).where(Transaccion.IdTransaccionPadre.in_(padres))
+    )
+
+
+FILTROS = {
+    "IdResolucion": Campo(Resolucion.IdResolucion),
+    "IdTransaccion": Campo(Resolucion.IdTransaccion),
+    "IdExpediente": Campo(expresion=_filtro_expediente, operadores=(EQ, IN), tipo=int),
+    "Numero": texto(Resolucion.Numero),
+    "Titulo": texto(Resolucion.Titulo),
+    "Estado": texto(Resolucion.Estado, defecto=EQ),
+    "Fecha_emision": rango(Resolucion.Fecha_emision),
+}
+
+# Columnas de ResolucionListItem: Contenido, Descripcion y Observaciones no se leen en los listados
+COLUMNAS_LISTADO = (
+    Resolucion.IdResolucion, Resolucion.IdExpediente, Resolucion.IdTransaccion, Resolucion.Numero,
+    Resolucion.Titulo, Resolucion.Fecha_emision, Resolucion.Fecha_publicacion, Resolucion.Estado,
+    Resolucion.Organismo_emisor,
+)
+
 
 class ResolucionRepository:
+    def get_filtered_paginated(self, db: Session, filtro=None, offset=0, limit=None):
+        """(resoluciones, total) con el filtro de react-admin (ver FILTROS); sin limit trae todas."""
+        query = db.query(Resolucion).filter(*compilar_filtro(filtro, FILTROS))
+        total = query.count()
+        query = query.options(load_only(*COLUMNAS_LISTADO)).order_by(Resolucion.IdResolucion).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all(), total
+
     def get_all(self, db: Session):
         return db.query(Resolucion).order_by(Resolucion.IdResolucion).all()
 
@@ -1,7 +1,19 @@
+from sqlalchemy import String, func, literal_column, or_
 from sqlalchemy.orm import Session
+from backend.database.schema_check import existe
 from backend.models.titular_minero_model import TitularMinero
 from backend.schemas.titular_minero_schema import TitularMineroCreate
 
+def _dni_cuit_normalizado():
+    """TitularMinero.DniCuitNormalizado si ya se corrió titular_dni_cuit.sql; si no, la misma expresión sin índice."""
+    if existe("TitularMinero", "DniCuitNormalizado"):
+        return literal_column("TitularMinero.DniCuitNormalizado", String)
+    columna = TitularMinero.DniCuit
+    for separador in ("-", ".", "/", " "):
+        columna = func.replace(columna, separador, "")
+    return columna
+
+
 class TitularMineroRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -12,6 +24,24 @@ class TitularMineroRepository:
     def get_by_id(self, id_titular: int):
         return self.db.query(TitularMinero).filter(TitularMinero.IdTitular == id_titular).first()
 
+    def get_by_ids(self, ids):
+        """Titulares de `ids` en el mismo orden (los inexistentes se omiten)."""
+        if not ids:
+            return []
+        por_id = {t.IdTitular: t for t in self.db.query(TitularMinero).filter(TitularMinero.IdTitular.in_(ids)).all()}
+        return [por_id[i] for i in ids if i in por_id]
+
+    def get_by_dni_cuit(self, dni_cuit: str, normalizado: str):
+        """Coincidencia exacta con DniCuit o con su versión sin separadores (ambas indexadas)."""
+        return (
+            self.db.query(TitularMinero)
+            .filter(or_(TitularMinero.DniCuit == dni_cuit, _dni_cuit_normalizado() == normalizado))
+            .all()
+        )
+
+    def search_by_nombre(self, nombre: str, limit: int):
+        return self.db.query(TitularMinero).filter(TitularMinero.Nombre.ilike(f"%{nombre}%")).limit(limit).all()
+
     def create(self, titular_data: TitularMineroCreate):
         titular = TitularMinero(**titular_data.dict())
         self.db.add(titular)
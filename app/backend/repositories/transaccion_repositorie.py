@@ -1,8 +1,32 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from backend.models.transaccion_model import Transaccion
+from backend.database.chunks import chunked
+from backend.database.schema_check import existe
+from backend.models.acta_model import Acta
+from backend.models.expediente_model import Expediente
+from backend.models.notificacion_model import Notificacion
+from backend.models.propiedad_minera_model import PropiedadMinera
+from backend.models.resolucion_model import Resolucion
+from backend.models.titular_minero_model import TitularMinero
+from backend.models.transaccion_model import Transaccion, TransaccionClosure
 from backend.schemas.transaccion_schema import TransaccionCreate, TransaccionUpdate
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Set, Tuple
+
+# Transaccion.Tabla -> modelo del registro asociado
+TABLAS = {
+    "TitularMinero": TitularMinero,
+    "PropiedadMinera": PropiedadMinera,
+    "Expediente": Expediente,
+    "Acta": Acta,
+    "Resolucion": Resolucion,
+    "Notificacion": Notificacion,
+}
+
+# Cada EXEC del lote usa 3 parámetros (marca, tabla, id)
+PROCEDURE_CHUNK_SIZE = 200
+# Primera columna del SELECT que separa los resultados de cada EXEC dentro de un lote
+_MARCA_LOTE = "IdTransaccionLote"
+
 
 class TransaccionRepositorie:
     def __init__(self, db: Session):
@@ -41,21 +65,158 @@ class TransaccionRepositorie:
         self.db.commit()
         return True
 
+    def _closure_disponible(self) -> bool:
+        return existe(TransaccionClosure.__tablename__)
+
+    def _subarboles_por_padre(self, ids: List[int], max_depth: Optional[int] = None) -> Dict[int, Dict[int, int]]:
+        """
+        Sin TransaccionClosure: subárbol de cada id ({descendiente: profundidad}, incluido
+        el propio id con 0) recorriendo IdTransaccionPadre de a un nivel por consulta.
+        """
+        subarboles: Dict[int, Dict[int, int]] = {i: {i: 0} for i in ids}
+        frontera: Dict[int, Set[int]] = {i: {i} for i in ids}  # nodo -> raíces que lo alcanzan
+        profundidad = 0
+        while frontera and (max_depth is None or profundidad < max_depth):
+            profundidad += 1
+            siguiente: Dict[int, Set[int]] = {}
+            for chunk in chunked(list(frontera)):
+                for hijo, padre in (
+                    self.db.query(Transaccion.IdTransaccion, Transaccion.IdTransaccionPadre)
+                    .filter(Transaccion.IdTransaccionPadre.in_(chunk))
+                    .filter(Transaccion.IdTransaccion != Transaccion.IdTransaccionPadre)
+                    .all()
+                ):
+                    for raiz in frontera[padre]:
+                        if hijo not in subarboles[raiz]:
+                            subarboles[raiz][hijo] = profundidad
+                            siguiente.setdefault(hijo, set()).add(raiz)
+            frontera = siguiente
+        return subarboles
+
+    def get_descendants(
+        self,
+        id_transaccion: int,
+        max_depth: Optional[int] = None,
+        tabla: Optional[str] = None,
+    ) -> List[Tuple[Transaccion, int]]:
+        """
+        Descendientes de una transacción (sin incluirla) con su profundidad relativa,
+        resueltos con una sola consulta sobre TransaccionClosure.
+        """
+        if not self._closure_disponible():
+            profundidades = self._subarboles_por_padre([id_transaccion], max_depth)[id_transaccion]
+            profundidades.pop(id_transaccion)
+            filas = []
+            for chunk in chunked(list(profundidades)):
+                query = self.db.query(Transaccion).filter(Transaccion.IdTransaccion.in_(chunk))
+                if tabla:
+                    query = query.filter(Transaccion.Tabla == tabla)
+                filas.extend((t, profundidades[t.IdTransaccion]) for t in query.all())
+            return sorted(filas, key=lambda fila: (fila[1], fila[0].IdTransaccion))
+        query = (
+            self.db.query(Transaccion, TransaccionClosure.Profundidad)
+            .join(TransaccionClosure, TransaccionClosure.IdDescendiente == Transaccion.IdTransaccion)
+            .filter(TransaccionClosure.IdAncestro == id_transaccion)
+            .filter(TransaccionClosure.Profundidad > 0)
+        )
+        if max_depth is not None:
+            query = query.filter(TransaccionClosure.Profundidad <= max_depth)
+        if tabla:
+            query = query.filter(Transaccion.Tabla == tabla)
+        return query.order_by(TransaccionClosure.Profundidad, Transaccion.IdTransaccion).all()
+
+    def get_ancestors(self, id_transaccion: int) -> List[Tuple[Transaccion, int]]:
+        """Ancestros de una transacción, del padre directo hacia la raíz."""
+        if not self._closure_disponible():
+            ancestros: List[Tuple[Transaccion, int]] = []
+            vistos = {id_transaccion}
+            actual = self.get(id_transaccion)
+            while actual is not None and actual.IdTransaccionPadre and actual.IdTransaccionPadre not in vistos:
+                vistos.add(actual.IdTransaccionPadre)
+                actual = self.get(actual.IdTransaccionPadre)
+                if actual is not None:
+                    ancestros.append((actual, len(ancestros) + 1))
+            return ancestros
+        return (
+            self.db.query(Transaccion, TransaccionClosure.Profundidad)
+            .join(TransaccionClosure, TransaccionClosure.IdAncestro == Transaccion.IdTransaccion)
+            .filter(TransaccionClosure.IdDescendiente == id_transaccion)
+            .filter(TransaccionClosure.Profundidad > 0)
+            .order_by(TransaccionClosure.Profundidad)
+            .all()
+        )
+
+    def get_descendant_ids(self, id_transaccion: int) -> List[int]:
+        """Ids del subárbol de una transacción, incluida ella misma."""
+        return self.get_descendant_ids_lote([id_transaccion])[id_transaccion]
+
+    def get_descendant_ids_lote(self, ids_transaccion: Iterable[int]) -> Dict[int, List[int]]:
+        """
+        Ids del subárbol de cada transacción pedida (incluida ella misma), con una
+        consulta a TransaccionClosure por tanda de IN.
+        """
+        ids = list(dict.fromkeys(ids_transaccion))
+        if not self._closure_disponible():
+            return {i: list(nodos) for i, nodos in self._subarboles_por_padre(ids).items()}
+        subarboles: Dict[int, List[int]] = {id_transaccion: [] for id_transaccion in ids}
+        for chunk in chunked(ids):
+            rows = (
+                self.db.query(TransaccionClosure.IdAncestro, TransaccionClosure.IdDescendiente)
+                .filter(TransaccionClosure.IdAncestro.in_(chunk))
+                .all()
+            )
+            for ancestro, descendiente in rows:
+                subarboles[ancestro].append(descendiente)
+        return {id_transaccion: nodos or [id_transaccion] for id_transaccion, nodos in subarboles.items()}
+
     def get_informacion_transaccion(self, tabla: str, id_transaccion: int) -> List[Dict[str, Any]]:
         """
-        Ejecuta el procedure InformacionTransaccion para obtener información de transacciones
+        Ejecuta el procedure InformacionTransaccion para obtener información de transacciones.
+        Los errores se propagan: una lista vacía significa que el procedure no devolvió filas.
         """
+        sql = text("EXEC InformacionTransaccion :tabla, :id_transaccion")
+        result = self.db.execute(sql, {"tabla": tabla, "id_transaccion": id_transaccion})
+
+        # Convertir resultados a lista de diccionarios
+        columns = list(result.keys())
+        return [dict(zip(columns, row)) for row in result.fetchall()]
+
+    def get_informacion_transacciones(self, tabla: str, ids_transaccion: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        InformacionTransaccion para varios ids. En SQL Server los EXEC se mandan en un
+        único batch por cada PROCEDURE_CHUNK_SIZE ids, sobre la conexión de la sesión:
+        antes de cada EXEC va un `SELECT ? AS IdTransaccionLote` que marca a qué id
+        pertenece el result set siguiente. De cada EXEC se toma su primer result set,
+        igual que en get_informacion_transaccion. Si el procedure falla para algún id
+        el error se propaga.
+        """
+        ids = list(dict.fromkeys(ids_transaccion))
+        if self.db.get_bind().dialect.name != "mssql":
+            return {id_transaccion: self.get_informacion_transaccion(tabla, id_transaccion) for id_transaccion in ids}
+
+        resultado: Dict[int, List[Dict[str, Any]]] = {}
+        cursor = self.db.connection().connection.cursor()
         try:
-            # Ejecutar el stored procedure
-            sql = text("EXEC InformacionTransaccion :tabla, :id_transaccion")
-            result = self.db.execute(sql, {"tabla": tabla, "id_transaccion": id_transaccion})
-            
-            # Convertir resultados a lista de diccionarios
-            columns = result.keys()
-            rows = result.fetchall()
-            
-            return [dict(zip(columns, row)) for row in rows]
-        except Exception as e:
-            # En caso de error, retornar lista vacía y loggear el error si es necesario
-            print(f"Error ejecutando procedure InformacionTransaccion: {e}")
-            return []
+            for lote in chunked(ids, PROCEDURE_CHUNK_SIZE):
+                sql = "SET NOCOUNT ON;" + "".join(
+                    f"SELECT CAST(? AS INT) AS {_MARCA_LOTE}; EXEC InformacionTransaccion ?, ?;" for _ in lote
+                )
+                parametros: List[Any] = []
+                for id_transaccion in lote:
+                    parametros.extend((id_transaccion, tabla, id_transaccion))
+                cursor.execute(sql, parametros)
+                actual: Optional[int] = None
+                while True:
+                    if cursor.description is not None:
+                        columnas = [columna[0] for columna in cursor.description]
+                        if columnas == [_MARCA_LOTE]:
+                            actual = cursor.fetchone()[0]
+                            resultado[actual] = []
+                        elif actual is not None:
+                            resultado[actual] = [dict(zip(columnas, row)) for row in cursor.fetchall()]
+                            actual = None
+                    if not cursor.nextset():
+                        break
+        finally:
+            cursor.close()
+        return {id_transaccion: resultado.get(id_transaccion, []) for id_transaccion in ids}
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, and_, func, literal_column, or_
+from sqlalchemy.orm import Session
+
+from backend.database.schema_check import existe
+from backend.models.alerta_model import Alerta
+from backend.models.estado_alerta_model import EstadoAlerta
+from backend.models.notificacion_model import Notificacion
+
+TIPO_ALERTA = "alerta"
+TIPO_NOTIFICACION = "notificacion"
+TIPOS = (TIPO_ALERTA, TIPO_NOTIFICACION)
+
+# Clave de orden del flujo combinado: (Vencimiento, Tipo, Id)
+Clave = Tuple[datetime, str, int]
+
+
+def _despues_de(columna_fecha, columna_id, tipo: str, cursor: Clave):
+    """Condición keyset 'estrictamente después del cursor' para una de las fuentes."""
+    fecha, tipo_cursor, id_cursor = cursor
+    if tipo > tipo_cursor:
+        return columna_fecha >= fecha
+    if tipo < tipo_cursor:
+        return columna_fecha > fecha
+    return or_(columna_fecha > fecha, and_(columna_fecha == fecha, columna_id > id_cursor))
+
+
+def _vencimiento_alerta():
+    """Alerta.Vencimiento si ya se corrió vencimientos.sql; si no, la misma expresión sin índice."""
+    if existe("Alerta", "Vencimiento"):
+        return literal_column("Alerta.Vencimiento", DateTime)
+    return func.coalesce(Alerta.FechaFin, Alerta.FechaInicio)
+
+
+def _vencimiento_notificacion():
+    """Notificacion.Vencimiento si ya se corrió vencimientos.sql; si no, la misma expresión sin índice."""
+    if existe("Notificacion", "Vencimiento"):
+        return literal_column("Notificacion.Vencimiento", DateTime)
+    return func.dateadd(literal_column("day"), Notificacion.Plazo, Notificacion.Emision, type_=DateTime)
+
+
+class VencimientoRepositorie:
+    """
+    Vencimientos de alertas (Alerta.Vencimiento) y de plazos de notificaciones
+    (Notificacion.Vencimiento) como un único flujo ordenado. Las columnas no están
+    mapeadas en los modelos: existen solo después de correr vencimientos.sql. Cada fuente se lee por su
+    índice (Vencimiento, Id) con su propio LIMIT y se intercalan en memoria, así una
+    página nunca lee más de `limit + 1` filas por tabla.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _alertas(self, desde, hasta, limit, cursor, id_estado) -> List[Dict[str, Any]]:
+        vencimiento = _vencimiento_alerta()
+        query = (
+            self.db.query(
+                Alerta.idAlerta,
+                vencimiento.label("Vencimiento"),
+                Alerta.Asunto,
+                Alerta.IdTransaccion,
+                Alerta.IdTipoAlerta,
+                Alerta.IdEstado,
+                EstadoAlerta.nombre,
+                Alerta.FechaInicio,
+                Alerta.FechaFin,
+            )
+            .outerjoin(EstadoAlerta, Alerta.IdEstado == EstadoAlerta.IdEstado)
+            .filter(vencimiento >= desde, vencimiento < hasta)
+        )
+        if id_estado is not None:
+            query = query.filter(Alerta.IdEstado == id_estado)
+        if cursor is not None:
+            query = query.filter(_despues_de(vencimiento, Alerta.idAlerta, TIPO_ALERTA, cursor))
+        return [
+            {
+                "Tipo": TIPO_ALERTA,
+                "Id": row.idAlerta,
+                "Vencimiento": row.Vencimiento,
+                "Descripcion": row.Asunto,
+                "IdTransaccion": row.IdTransaccion,
+                "CodExp": None,
+                "IdTipoAlerta": row.IdTipoAlerta,
+                "IdEstado": row.IdEstado,
+                "Estado": row.nombre,
+                "FechaInicio": row.FechaInicio,
+                "FechaFin": row.FechaFin,
+                "Emision": None,
+                "Plazo": None,
+            }
+            for row in query.order_by(vencimiento, Alerta.idAlerta).limit(limit).all()
+        ]
+
+    def _notificaciones(self, desde, hasta, limit, cursor, cod_exp) -> List[Dict[str, Any]]:
+        vencimiento = _vencimiento_notificacion()
+        query = self.db.query(
+            Notificacion.IdNotificacion,
+            vencimiento.label("Vencimiento"),
+            Notificacion.CodExp,
+            Notificacion.IdTransaccion,
+            Notificacion.Emision,
+            Notificacion.Plazo,
+        ).filter(vencimiento >= desde, vencimiento < hasta)
+        if cod_exp:
+            query = query.filter(Notificacion.CodExp == cod_exp)
+        if cursor is not None:
+            query = query.filter(
+                _despues_de(vencimiento, Notificacion.IdNotificacion, TIPO_NOTIFICACION, cursor)
+            )
+        return [
+            {
+                "Tipo": TIPO_NOTIFICACION,
+                "Id": row.IdNotificacion,
+                "Vencimiento": row.Vencimiento,
+                "Descripcion": f"Vence plazo de notificación {row.CodExp or ''}".strip(),
+                "IdTransaccion": row.IdTransaccion,
+                "CodExp": row.CodExp,
+                "IdTipoAlerta": None,
+                "IdEstado": None,
+                "Estado": None,
+                "FechaInicio": None,
+                "FechaFin": None,
+                "Emision": row.Emision,
+                "Plazo": row.Plazo,
+            }
+            for row in query.order_by(vencimiento, Notificacion.IdNotificacion).limit(limit).all()
+        ]
+
+    def get_page(
+        self,
+        desde: datetime,
+        hasta: datetime,
+        limit: int = 100,
+        cursor: Optional[Clave] = None,
+        tipos: Sequence[str] = TIPOS,
+        id_estado: Optional[int] = None,
+        cod_exp: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Clave]]:
+        """
+        Devuelve (items, clave de la página siguiente) con los vencimientos en [desde, hasta)
+        ordenados por (Vencimiento, Tipo, Id). `id_estado` solo aplica a alertas y
+        `cod_exp` solo a notificaciones: si se pasa uno, la otra fuente queda fuera.
+        """
+        fuentes = []
+        if TIPO_ALERTA in tipos and not cod_exp:
+            fuentes.append(self._alertas(desde, hasta, limit + 1, cursor, id_estado))
+        if TIPO_NOTIFICACION in tipos and id_estado is None:
+            fuentes.append(self._notificaciones(desde, hasta, limit + 1, cursor, cod_exp))
+
+        combinados = heapq.merge(*fuentes, key=lambda item: (item["Vencimiento"], item["Tipo"], item["Id"]))
+        items: List[Dict[str, Any]] = []
+        for item in combinados:
+            if len(items) == limit:
+                ultimo = items[-1]
+                return items, (ultimo["Vencimiento"], ultimo["Tipo"], ultimo["Id"])
+            items.append(item)
+        return items, None
@@ -22,3 +22,18 @@ class ActaRead(ActaBase):
 
     class Config:
         from_attributes = True
+
+
+class ActaListItem(BaseModel):
+    """Fila del listado: sin Obs (hasta 5000 caracteres), que solo se ve en el detalle."""
+    IdActa: int
+    IdExpediente: int
+    IdTransaccion: Optional[int] = None
+    IdTipoActa: Optional[str] = None
+    Fecha: Optional[date] = None
+    Lugar: Optional[str] = None
+    IdAutoridad: Optional[int] = None
+    Descripcion: Optional[str] = None
+
+    class Config:
+        from_attributes = True
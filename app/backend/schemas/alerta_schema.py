@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class AlertaBase(BaseModel):
@@ -36,3 +36,40 @@ class AlertaOut(AlertaBase):
 
 # Alias para compatibilidad
 AlertaRead = AlertaOut
+
+
+class AlertaListItem(BaseModel):
+    """Fila de los listados: todo menos Obs, que solo se ve al abrir la alerta."""
+    idAlerta: int
+    IdTransaccion: Optional[int] = None
+    IdTipoAlerta: Optional[int] = None
+    IdEstado: Optional[int] = None
+    Asunto: Optional[str] = None
+    Mensaje: Optional[str] = None
+    Medio: Optional[str] = None
+    IdPeriodicidad: int
+    FechaInicio: Optional[datetime] = None
+    FechaFin: Optional[datetime] = None
+    Destinatarios: Optional[str] = None
+    AudFecha: Optional[datetime] = None
+    AudUsuario: Optional[int] = None
+    DiasPers: Optional[int] = None
+    estado_nombre: str | None = None
+
+
+class AlertaBulkFiltro(BaseModel):
+    id_estado: Optional[int] = None
+    IdTipoAlerta: Optional[int] = None
+    id_transaccion: List[int] = []
+    fechaDesde: Optional[datetime] = None  # sobre FechaInicio
+    fechaHasta: Optional[datetime] = None
+
+class AlertaBulkEstado(BaseModel):
+    """Cambio de estado masivo: se indica `ids` o `filtro`, no ambos."""
+    IdEstado: int
+    ids: Optional[List[int]] = None
+    filtro: Optional[AlertaBulkFiltro] = None
+
+class AlertaBulkResultado(BaseModel):
+    actualizadas: int
+    ids: List[int]
@@ -28,4 +28,7 @@ class AutoridadInDBBase(AutoridadBase):
         orm_mode = True
 
 class Autoridad(AutoridadInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+class AutoridadMatch(Autoridad):
+    score: Optional[float] = None  # None si la búsqueda no pasó por el índice
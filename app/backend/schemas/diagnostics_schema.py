@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class QueryShape(BaseModel):
+    sql: str  # sentencia normalizada: literales y parámetros como ?, listas IN como (?, ...)
+    ejecuciones: int
+    total_ms: float
+    promedio_ms: float
+    max_ms: float
+    filas: int
+    primera: datetime
+    ultima: datetime
+
+class QueryShapesReport(BaseModel):
+    desde: datetime
+    formas: List[QueryShape]
+
+class IndexSuggestion(BaseModel):
+    tabla: str
+    columnas: List[str]  # en el orden de la clave: igualdad primero, después rango u orden
+    incluidas: List[str] = []
+    origen: str  # observado, dmv o ambos
+    ejecuciones: int
+    tiempo_observado_ms: float
+    beneficio_estimado_ms: Optional[float] = None
+    dmv_usos: Optional[int] = None
+    dmv_impacto: Optional[float] = None  # % de mejora de costo estimado por SQL Server
+    dmv_mejora: Optional[float] = None
+    filas_tabla: Optional[int] = None
+    consultas: List[str] = []
+    ddl: str
+
+class IndexAdvisorReport(BaseModel):
+    desde: datetime
+    motor: str
+    formas_analizadas: int
+    sugerencias: List[IndexSuggestion]
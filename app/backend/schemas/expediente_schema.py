@@ -24,4 +24,9 @@ class ExpedienteRead(ExpedienteBase):
     IdExpediente: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+class ExpedienteSuggest(BaseModel):
+    IdExpediente: int
+    CodigoExpediente: str
+    Caratula: Optional[str] = None
+    IdTransaccion: Optional[int] = None
@@ -24,4 +24,10 @@ class PropiedadMineraRead(PropiedadMineraBase):
     TitularNombre: Optional[str] = None  # Nombre del titular
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+class PropiedadMineraListadoRead(PropiedadMineraRead):
+    CantidadExpedientes: Optional[int] = None  # None si el listado no sale de la proyección
+    UltimoMovimiento: Optional[datetime] = None  # FechaInicio del último ReqMineroMov
+
+    class Config:
+        from_attributes = True
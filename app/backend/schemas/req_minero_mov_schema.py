@@ -25,11 +25,3 @@ class ReqMineroMovOut(ReqMineroMovBase):
 
     class Config:
         from_attributes = True
-
-class ReqMineroMovFilter(BaseModel):
-    IdPropiedadMinera: Optional[int] = None
-    IdReqMinero: Optional[int] = None
-    Descripcion: Optional[str] = None
-    FechaDesde: Optional[datetime] = None
-    FechaHasta: Optional[datetime] = None
-    range: Optional[list] = None
@@ -25,4 +25,19 @@ class ResolucionRead(ResolucionBase):
     IdResolucion: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ResolucionListItem(BaseModel):
+    """Fila del listado: sin Contenido, Descripcion ni Observaciones, que solo se ven en el detalle."""
+    IdResolucion: int
+    IdExpediente: Optional[int] = None
+    IdTransaccion: Optional[int] = None
+    Numero: Optional[str] = None
+    Titulo: Optional[str] = None
+    Fecha_emision: Optional[date] = None
+    Fecha_publicacion: Optional[date] = None
+    Estado: Optional[str] = None
+    Organismo_emisor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class SearchHit(BaseModel):
+    tipo: str  # expediente, propiedad, titular, autoridad, acta, resolucion
+    id: int
+    titulo: str
+    subtitulo: Optional[str] = None
+    score: float
+    IdTransaccion: Optional[int] = None
+
+class SearchResult(BaseModel):
+    q: str
+    hits: List[SearchHit]
+
+class FullTextHit(BaseModel):
+    tipo: str  # resolucion, acta, alerta, observacion
+    id: int
+    IdTransaccion: Optional[int] = None
+    campo: str
+    score: float
+    snippet: str  # HTML escapado, con las coincidencias entre <mark>
+
+class FullTextResult(BaseModel):
+    q: str
+    modo: str
+    motor: str  # mssql o fts5
+    hits: List[FullTextHit]
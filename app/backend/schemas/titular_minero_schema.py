@@ -27,4 +27,8 @@ class TitularMineroRead(TitularMineroBase):
     IdTransaccion: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TitularMineroMatch(TitularMineroRead):
+    score: Optional[float] = None  # None si la búsqueda no pasó por el índice
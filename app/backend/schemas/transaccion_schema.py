@@ -21,3 +21,7 @@ class TransaccionOut(TransaccionBase):
 
     class Config:
         orm_mode = True
+
+class TransaccionRelativaOut(TransaccionOut):
+    # Distancia al nodo consultado (1 = padre o hijo directo)
+    Profundidad: int
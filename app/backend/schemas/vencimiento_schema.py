@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class VencimientoOut(BaseModel):
+    Tipo: str  # "alerta" o "notificacion"
+    Id: int
+    Vencimiento: datetime
+    Descripcion: Optional[str] = None
+    IdTransaccion: Optional[int] = None
+    CodExp: Optional[str] = None
+    # Solo alertas
+    IdTipoAlerta: Optional[int] = None
+    IdEstado: Optional[int] = None
+    Estado: Optional[str] = None
+    FechaInicio: Optional[datetime] = None
+    FechaFin: Optional[datetime] = None
+    # Solo notificaciones
+    Emision: Optional[datetime] = None
+    Plazo: Optional[int] = None
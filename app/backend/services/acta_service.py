@@ -8,6 +8,9 @@ from datetime import datetime
 
 class ActaService:
 
+    def get_filtered_paginated(self, filtro=None, offset=0, limit=None):
+        return self.repository.get_filtered_paginated(filtro, offset, limit)
+
     def get_by_transaccion_padre(self, id_transaccion_padre: int):
         return self.repository.get_by_transaccion_padre(id_transaccion_padre)
 
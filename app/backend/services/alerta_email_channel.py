@@ -0,0 +1,291 @@
+"""
+Canal de email para el scheduler de alertas.
+
+Para probar sin un servidor real se puede levantar un SMTP de depuración local
+que imprime los mensajes en consola, por ejemplo:
+
+    python -m aiosmtpd -n -l localhost:8025
+
+y configurar SMTP_HOST=localhost, SMTP_PORT=8025, SMTP_STARTTLS=false.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import random
+import re
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from jinja2 import TemplateError
+from jinja2.sandbox import SandboxedEnvironment
+
+from backend.models.tipo_alerta_model import TipoAlerta
+from backend.services.alerta_scheduler import Disparo, register_channel
+
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(nombre: str, default: str) -> bool:
+    return os.getenv(nombre, default).lower() in ("1", "true", "si", "yes")
+
+
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USER = os.getenv("SMTP_USER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = _env_bool("SMTP_STARTTLS", "false")
+SMTP_SSL = _env_bool("SMTP_SSL", "false")
+# Vacío en el .env cuenta como no configurado: un From vacío lo rechazan casi todos los servidores
+SMTP_FROM = os.getenv("SMTP_FROM") or "alertas@localhost"
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+# Conexiones abiertas y envíos simultáneos como máximo
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_MAX_RETRIES = int(os.getenv("SMTP_MAX_RETRIES", "3"))
+SMTP_BACKOFF_SECONDS = float(os.getenv("SMTP_BACKOFF_SECONDS", "1"))
+# Muchos servidores limitan los RCPT TO por mensaje
+SMTP_MAX_RCPT = int(os.getenv("SMTP_MAX_RCPT", "50"))
+# Una conexión ociosa más que esto se verifica con NOOP antes de reutilizarla
+_SMTP_IDLE_CHECK_SECONDS = 60
+
+_EMAIL_RE = re.compile(r"^[^@\s<>,;]+@[^@\s<>,;]+\.[^@\s<>,;]+$")
+_SEPARADORES_RE = re.compile(r"[,;\s]+")
+
+
+def parse_destinatarios(destinatarios: Optional[str]) -> List[str]:
+    """
+    Separa Alerta.Destinatarios (por coma, punto y coma o espacios), descarta lo que
+    no parece una dirección y elimina duplicados sin distinguir mayúsculas.
+    """
+    resultado: Dict[str, str] = {}
+    for parte in _SEPARADORES_RE.split(destinatarios or ""):
+        direccion = parte.strip().strip("<>")
+        if direccion and _EMAIL_RE.match(direccion):
+            resultado.setdefault(direccion.lower(), direccion)
+    return list(resultado.values())
+
+
+# Asunto y Mensaje los escriben los usuarios: sandbox para que una plantilla no pueda
+# llegar a atributos internos de Python. Sin autoescape porque el correo es texto plano.
+_jinja = SandboxedEnvironment(autoescape=False, keep_trailing_newline=True)
+
+
+@lru_cache(maxsize=256)
+def _compilar(fuente: str):
+    return _jinja.from_string(fuente)
+
+
+def render_template(fuente: Optional[str], contexto: Dict[str, Any]) -> str:
+    """
+    Renderiza un texto de TipoAlerta/Alerta como plantilla jinja2 en sandbox; si es
+    inválida o intenta una operación no permitida se usa tal cual.
+    """
+    if not fuente:
+        return ""
+    try:
+        return _compilar(fuente).render(**contexto)
+    except TemplateError as e:
+        logger.warning(f"Plantilla de alerta inválida, se envía sin procesar: {e}")
+        return fuente
+
+
+class _RetryableError(Exception):
+    pass
+
+
+class SmtpPool:
+    """Pool acotado de conexiones SMTP reutilizables entre envíos."""
+
+    def __init__(self, size: int):
+        self._idle: "queue.LifoQueue[tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        if SMTP_SSL:
+            conn = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        else:
+            conn = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+            if SMTP_STARTTLS:
+                conn.starttls()
+        if SMTP_USER:
+            conn.login(SMTP_USER, SMTP_PASSWORD or "")
+        return conn
+
+    def acquire(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    conn, desde = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if time.monotonic() - desde < _SMTP_IDLE_CHECK_SECONDS:
+                    return conn
+                try:
+                    if conn.noop()[0] == 250:
+                        return conn
+                except smtplib.SMTPException:
+                    pass
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: smtplib.SMTP, reusable: bool = True) -> None:
+        if reusable:
+            self._idle.put((conn, time.monotonic()))
+        else:
+            self._discard(conn)
+        self._slots.release()
+
+    @staticmethod
+    def _discard(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+
+class EmailChannel:
+    """
+    Envía cada disparo como un mensaje (partido en tandas de SMTP_MAX_RCPT destinatarios),
+    con asunto y cuerpo tomados de la alerta o, si están vacíos, de su TipoAlerta.
+    Los envíos de un lote corren en paralelo con a lo sumo SMTP_POOL_SIZE conexiones,
+    y los errores transitorios (desconexión, 4xx) se reintentan con backoff exponencial.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self._pool = SmtpPool(SMTP_POOL_SIZE)
+        self._executor = ThreadPoolExecutor(max_workers=SMTP_POOL_SIZE, thread_name_prefix="alerta-email")
+
+    def _session(self):
+        if self._session_factory is None:
+            from backend.database.connection import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _tipos(self, disparos: Sequence[Disparo]) -> Dict[int, TipoAlerta]:
+        ids = {d.id_tipo_alerta for d in disparos if d.id_tipo_alerta}
+        if not ids:
+            return {}
+        db = self._session()
+        try:
+            tipos = db.query(TipoAlerta).filter(TipoAlerta.IdTipoAlerta.in_(list(ids))).all()
+            db.expunge_all()
+            return {t.IdTipoAlerta: t for t in tipos}
+        finally:
+            db.close()
+
+    def build_message(self, disparo: Disparo, tipo: Optional[TipoAlerta], destinatarios: List[str]) -> EmailMessage:
+        contexto = {
+            "id_alerta": disparo.id_alerta,
+            "fecha": disparo.fecha_programada,
+            "id_transaccion": disparo.id_transaccion,
+            "asunto": disparo.asunto,
+            "mensaje": disparo.mensaje,
+            "tipo": tipo.Descripcion if tipo else None,
+        }
+        asunto = render_template(disparo.asunto or (tipo.Asunto if tipo else None), contexto)
+        cuerpo = render_template(disparo.mensaje or (tipo.Mensaje if tipo else None), contexto)
+        msg = EmailMessage()
+        msg["From"] = SMTP_FROM
+        msg["To"] = ", ".join(destinatarios)
+        msg["Subject"] = asunto.replace("\n", " ").strip() or f"Alerta #{disparo.id_alerta}"
+        msg["Date"] = formatdate(localtime=True)
+        msg["Message-ID"] = make_msgid(idstring=f"alerta{disparo.id_alerta}")
+        msg.set_content(cuerpo or msg["Subject"])
+        return msg
+
+    def _send_once(self, msg: EmailMessage, destinatarios: List[str]) -> None:
+        """
+        Un intento de envío. Los 4xx y los errores de transporte (conexión, login,
+        desconexión, timeout) se reintentan; los 5xx y demás errores SMTP son definitivos.
+        SMTPException hereda de OSError, por eso las respuestas del servidor se
+        clasifican antes que los errores de socket.
+        """
+        conn = None
+        reusable = False
+        try:
+            conn = self._pool.acquire()
+            rechazados = conn.send_message(msg, from_addr=SMTP_FROM, to_addrs=destinatarios)
+            reusable = True
+            if rechazados:
+                logger.warning(f"Destinatarios rechazados: {', '.join(rechazados)}")
+        except smtplib.SMTPResponseException as e:
+            if 400 <= e.smtp_code < 500:
+                raise _RetryableError(f"{e.smtp_code} {e.smtp_error!r}") from e
+            raise
+        except smtplib.SMTPServerDisconnected as e:
+            raise _RetryableError(str(e)) from e
+        except smtplib.SMTPException:
+            raise
+        except OSError as e:
+            raise _RetryableError(str(e)) from e
+        finally:
+            # acquire() ya libera su lugar en el pool si no pudo conectar
+            if conn is not None:
+                self._pool.release(conn, reusable)
+
+    def _send_with_retry(self, msg: EmailMessage, destinatarios: List[str]) -> None:
+        for intento in range(SMTP_MAX_RETRIES + 1):
+            try:
+                self._send_once(msg, destinatarios)
+                return
+            except _RetryableError as e:
+                if intento == SMTP_MAX_RETRIES:
+                    raise
+                espera = SMTP_BACKOFF_SECONDS * (2 ** intento) * (1 + random.random() / 2)
+                logger.info(f"Reintento SMTP en {espera:.1f}s ({e})")
+                time.sleep(espera)
+
+    def _send_disparo(self, disparo: Disparo, tipo: Optional[TipoAlerta]) -> Optional[str]:
+        destinatarios = parse_destinatarios(disparo.destinatarios)
+        if not destinatarios:
+            return "La alerta no tiene destinatarios válidos"
+        try:
+            for inicio in range(0, len(destinatarios), SMTP_MAX_RCPT):
+                tanda = destinatarios[inicio : inicio + SMTP_MAX_RCPT]
+                self._send_with_retry(self.build_message(disparo, tipo, tanda), tanda)
+        except Exception as e:
+            logger.error(f"No se pudo enviar la alerta {disparo.id_alerta} por email: {e}")
+            return str(e) or type(e).__name__
+        return None
+
+    def send_batch(self, disparos: List[Disparo]) -> List[Optional[str]]:
+        tipos = self._tipos(disparos)
+        futuros = [
+            self._executor.submit(self._send_disparo, d, tipos.get(d.id_tipo_alerta)) for d in disparos
+        ]
+        return [f.result() for f in futuros]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._pool.close()
+
+
+def register_email_channel() -> EmailChannel:
+    channel = EmailChannel()
+    for medio in ("email", "e-mail", "mail", "correo", "correo electronico"):
+        register_channel(medio, channel)
+    return channel
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.models.alerta_evento_model import AlertaEvento
+from backend.models.alerta_model import Alerta
+from backend.repositories.alerta_evento_repositorie import (
+    EVENTO_CREADA,
+    EVENTO_ELIMINADA,
+    EVENTO_ESTADO,
+    EVENTO_MODIFICADA,
+    SESSION_KEY,
+    evento_alerta,
+    eventos_disponibles,
+    json_default,
+    registrar_eventos,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sin clientes conectados no se consulta la base; con clientes, una lectura indexada por intervalo
+ALERTAS_SSE_POLL_SECONDS = float(os.getenv("ALERTAS_SSE_POLL_SECONDS", "1"))
+ALERTAS_SSE_HEARTBEAT_SECONDS = float(os.getenv("ALERTAS_SSE_HEARTBEAT_SECONDS", "15"))
+ALERTAS_SSE_BATCH = int(os.getenv("ALERTAS_SSE_BATCH", "500"))
+ALERTAS_SSE_QUEUE_MAX = int(os.getenv("ALERTAS_SSE_QUEUE_MAX", "1000"))
+ALERTAS_SSE_RETENTION_HOURS = int(os.getenv("ALERTAS_SSE_RETENTION_HOURS", "24"))
+# Un hueco en IdEvento puede ser una transacción todavía sin confirmar: se espera hasta esto
+ALERTAS_SSE_GAP_SECONDS = float(os.getenv("ALERTAS_SSE_GAP_SECONDS", "5"))
+_PURGA_CADA_SEGUNDOS = 3600
+
+
+@event.listens_for(Session, "after_flush")
+def _capturar(session: Session, flush_context) -> None:
+    filas = []
+    # Se lee el __dict__ del estado: acceder a atributos expirados dispararía consultas dentro del flush
+    for obj in session.new:
+        if isinstance(obj, Alerta):
+            valores = inspect(obj).dict
+            filas.append(evento_alerta(valores["idAlerta"], EVENTO_CREADA, valores))
+    for obj in session.dirty:
+        if isinstance(obj, Alerta) and session.is_modified(obj, include_collections=False):
+            estado = inspect(obj)
+            historial = estado.attrs.IdEstado.history
+            id_alerta = estado.identity[0]
+            if historial.added and historial.deleted:
+                filas.append(evento_alerta(id_alerta, EVENTO_ESTADO, estado.dict, historial.deleted[0]))
+            else:
+                filas.append(evento_alerta(id_alerta, EVENTO_MODIFICADA, estado.dict))
+    for obj in session.deleted:
+        if isinstance(obj, Alerta):
+            estado = inspect(obj)
+            filas.append(evento_alerta(estado.identity[0], EVENTO_ELIMINADA, estado.dict))
+    registrar_eventos(session, filas)
+
+
+@event.listens_for(Session, "after_commit")
+def _avisar(session: Session) -> None:
+    if session.info.pop(SESSION_KEY, None):
+        # Los clientes de este worker no esperan al próximo intervalo
+        alerta_event_bus.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar(session: Session) -> None:
+    session.info.pop(SESSION_KEY, None)
+
+
+@dataclass
+class FiltroEventos:
+    """Qué eventos le interesan a una conexión; vacío = todos."""
+
+    id_estado: Optional[int] = None
+    id_transacciones: Set[int] = field(default_factory=set)
+    # Solo alertas creadas por el usuario o en las que figura como destinatario
+    id_usuario: Optional[int] = None
+    email: Optional[str] = None
+
+    def acepta(self, evento: Dict[str, Any]) -> bool:
+        if self.id_estado is not None and self.id_estado not in (
+            evento.get("IdEstado"), evento.get("IdEstadoAnterior")
+        ):
+            return False
+        if self.id_transacciones and evento.get("IdTransaccion") not in self.id_transacciones:
+            return False
+        if self.id_usuario is not None or self.email:
+            propia = self.id_usuario is not None and evento.get("AudUsuario") == self.id_usuario
+            destinatario = bool(self.email) and self.email in (evento.get("Destinatarios") or "").lower()
+            if not (propia or destinatario):
+                return False
+        return True
+
+
+@dataclass(eq=False)
+class Suscripcion:
+    filtro: FiltroEventos
+    ultimo: int
+    queue: asyncio.Queue
+    desbordada: bool = False
+
+    def ofrecer(self, evento: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(evento)
+        except asyncio.QueueFull:
+            # El cliente no lee al ritmo de los eventos: se corta y reconecta con Last-Event-ID
+            self.desbordada = True
+
+
+class AlertaEventBus:
+    """
+    Reparte los eventos de AlertaEvento a las conexiones SSE de este worker. Un único
+    poller por proceso lee los eventos nuevos desde el menor IdEvento pendiente entre
+    las suscripciones, así una reconexión con Last-Event-ID se resuelve con la misma
+    lectura, venga el evento de este worker o de otro.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self._subs: Set[Suscripcion] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._ultima_purga = 0.0
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from backend.database.connection import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    # --- lecturas (corren en el threadpool) ---------------------------------
+
+    def ultimo_id(self) -> int:
+        db = self._session()
+        try:
+            return db.query(func.max(AlertaEvento.IdEvento)).scalar() or 0
+        finally:
+            db.close()
+
+    def leer(self, desde_id: int, limit: int = ALERTAS_SSE_BATCH) -> List[Dict[str, Any]]:
+        db = self._session()
+        try:
+            filas = (
+                db.query(AlertaEvento)
+                .filter(AlertaEvento.IdEvento > desde_id)
+                .order_by(AlertaEvento.IdEvento)
+                .limit(limit)
+                .all()
+            )
+            eventos = []
+            for fila in filas:
+                try:
+                    datos = json.loads(fila.Datos) if fila.Datos else {}
+                except ValueError:
+                    datos = {}
+                eventos.append({
+                    **datos,
+                    "IdEvento": fila.IdEvento,
+                    "Tipo": fila.Tipo,
+                    "IdAlerta": fila.IdAlerta,
+                    "Fecha": fila.Fecha.isoformat() if fila.Fecha else None,
+                    "IdEstadoAnterior": fila.IdEstadoAnterior,
+                })
+            return eventos
+        finally:
+            db.close()
+
+    def purgar(self) -> int:
+        limite = datetime.now() - timedelta(hours=ALERTAS_SSE_RETENTION_HOURS)
+        db = self._session()
+        try:
+            borrados = db.query(AlertaEvento).filter(AlertaEvento.Fecha < limite).delete(
+                synchronize_session=False
+            )
+            db.commit()
+            return borrados
+        finally:
+            db.close()
+
+    # --- suscripciones (corren en el event loop) -----------------------------
+
+    async def subscribe(self, filtro: FiltroEventos, desde_id: Optional[int] = None) -> Suscripcion:
+        if desde_id is None:
+            desde_id = await run_in_threadpool(self.ultimo_id)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Event loop nuevo (reinicio del servidor o tests): lo anterior ya no corre
+            self._loop, self._task, self._subs = loop, None, set()
+            self._wake = asyncio.Event()
+        sub = Suscripcion(filtro, desde_id, asyncio.Queue(maxsize=ALERTAS_SSE_QUEUE_MAX))
+        self._subs.add(sub)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._poll())
+        self._wake.set()
+        return sub
+
+    def unsubscribe(self, sub: Suscripcion) -> None:
+        self._subs.discard(sub)
+
+    def wake(self) -> None:
+        """Se puede llamar desde cualquier hilo."""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None or not self._subs:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # el loop ya se cerró
+
+    @property
+    def suscripciones(self) -> int:
+        return len(self._subs)
+
+    async def _poll(self) -> None:
+        while self._subs:
+            self._wake.clear()
+            try:
+                eventos = await run_in_threadpool(self.leer, min(s.ultimo for s in self._subs))
+            except Exception:
+                logger.exception("Error leyendo eventos de alertas")
+                eventos = []
+            eventos = self._hasta_hueco(min(s.ultimo for s in self._subs), eventos)
+            for evento in eventos:
+                for sub in list(self._subs):
+                    if evento["IdEvento"] > sub.ultimo and not sub.desbordada:
+                        sub.ultimo = evento["IdEvento"]
+                        if sub.filtro.acepta(evento):
+                            sub.ofrecer(evento)
+            if len(eventos) == ALERTAS_SSE_BATCH:
+                continue
+            if time.monotonic() - self._ultima_purga > _PURGA_CADA_SEGUNDOS:
+                self._ultima_purga = time.monotonic()
+                try:
+                    await run_in_threadpool(self.purgar)
+                except Exception:
+                    logger.exception("Error purgando eventos de alertas")
+            try:
+                await asyncio.wait_for(self._wake.wait(), ALERTAS_SSE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    def _hasta_hueco(desde_id: int, eventos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Los IdEvento se asignan al insertar pero las transacciones confirman en cualquier
+        orden: si falta un id reciente no se avanza más allá hasta que aparezca o pase
+        ALERTAS_SSE_GAP_SECONDS (los rollbacks también dejan huecos).
+        """
+        limite = datetime.now() - timedelta(seconds=ALERTAS_SSE_GAP_SECONDS)
+        anterior = desde_id
+        for i, evento in enumerate(eventos):
+            if evento["IdEvento"] != anterior + 1 and datetime.fromisoformat(evento["Fecha"]) > limite:
+                return eventos[:i]
+            anterior = evento["IdEvento"]
+        return eventos
+
+    async def stream(self, sub: Suscripcion, desconectado) -> AsyncIterator[str]:
+        """Eventos en formato text/event-stream hasta que el cliente se va o se desborda."""
+        try:
+            yield f"retry: {int(ALERTAS_SSE_POLL_SECONDS * 1000) + 2000}\n\n"
+            while not await desconectado():
+                if sub.desbordada and sub.queue.empty():
+                    break
+                try:
+                    evento = await asyncio.wait_for(sub.queue.get(), ALERTAS_SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comentario SSE: mantiene viva la conexión a través de proxies
+                    yield ": ping\n\n"
+                    continue
+                datos = json.dumps(evento, default=json_default, ensure_ascii=False)
+                yield f"id: {evento['IdEvento']}\nevent: {evento['Tipo']}\ndata: {datos}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+
+alerta_event_bus = AlertaEventBus()
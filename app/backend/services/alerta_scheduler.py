@@ -0,0 +1,632 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import threading
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.database import change_events
+from backend.database.chunks import chunked
+from backend.models.alerta_envio_model import AlertaEnvio
+from backend.models.alerta_evento_model import AlertaEvento
+from backend.models.alerta_model import Alerta
+from backend.models.estado_alerta_model import EstadoAlerta
+from backend.services.alerta_events import ALERTAS_SSE_GAP_SECONDS
+from backend.services.leader_election import LeaderElector
+
+logger = logging.getLogger(__name__)
+
+ALERTAS_SCHEDULER_ENABLED = os.getenv("ALERTAS_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "si", "yes")
+# Relectura completa periódica: toma cambios hechos por otros procesos o directo en la base
+ALERTAS_REBUILD_SECONDS = int(os.getenv("ALERTAS_REBUILD_SECONDS", "900"))
+# Cada cuánto el líder lee AlertaEvento para tomar los cambios hechos en otros workers
+ALERTAS_SCHEDULER_POLL_SECONDS = float(os.getenv("ALERTAS_SCHEDULER_POLL_SECONDS", "5"))
+ALERTAS_ESTADO_PENDIENTE = os.getenv("ALERTAS_ESTADO_PENDIENTE", "Pendiente")
+ALERTAS_ESTADO_ENVIADA = os.getenv("ALERTAS_ESTADO_ENVIADA", "Enviada")
+# Un envío fallido se reintenta hasta completar ALERTAS_REINTENTOS intentos, esperando
+# ALERTAS_REINTENTO_SECONDS * intento entre uno y otro; la alerta sigue Pendiente
+ALERTAS_REINTENTOS = max(1, int(os.getenv("ALERTAS_REINTENTOS", "3")))
+ALERTAS_REINTENTO_SECONDS = int(os.getenv("ALERTAS_REINTENTO_SECONDS", "300"))
+# IdPeriodicidad -> regla, separados por coma: "2=dias:1,3=dias:7,4=meses:1,6=unica"
+ALERTAS_PERIODICIDADES = os.getenv("ALERTAS_PERIODICIDADES", "")
+# IdPeriodicidad "personalizada": repite cada Alerta.DiasPers días (el mismo id que usa el frontend)
+ALERTAS_PERIODICIDAD_PERSONALIZADA = int(os.getenv("ALERTAS_PERIODICIDAD_PERSONALIZADA", "5"))
+# IdEstado que usa el frontend para "Pendiente" si el nombre no está en EstadoAlerta
+_ID_PENDIENTE_POR_DEFECTO = 1
+_EVENTOS_LOTE = 1000
+
+ENVIO_ENVIANDO = "enviando"
+ENVIO_ENVIADO = "enviado"
+ENVIO_ERROR = "error"
+
+def _parsear_periodicidades(valor: str) -> Dict[int, Optional[Tuple[str, int]]]:
+    periodos: Dict[int, Optional[Tuple[str, int]]] = {}
+    for regla in filter(None, (parte.strip() for parte in valor.split(","))):
+        id_texto, _, intervalo = regla.partition("=")
+        unidad, _, cantidad = intervalo.strip().lower().partition(":")
+        try:
+            id_periodicidad = int(id_texto)
+            if unidad == "unica":
+                periodos[id_periodicidad] = None
+            elif unidad in ("dias", "meses") and int(cantidad) > 0:
+                periodos[id_periodicidad] = (unidad, int(cantidad))
+            else:
+                raise ValueError(regla)
+        except ValueError:
+            raise ValueError(f"ALERTAS_PERIODICIDADES: regla inválida '{regla}' (esperado id=dias:N, id=meses:N o id=unica)")
+    return periodos
+
+
+_PERIODOS = _parsear_periodicidades(ALERTAS_PERIODICIDADES)
+_sin_regla: Set[int] = set()
+
+
+def _normalizar(texto: Optional[str]) -> str:
+    texto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in texto if not unicodedata.combining(c)).lower().strip()
+
+
+def intervalo_de(id_periodicidad: Optional[int], dias_pers: Optional[int]) -> Optional[Tuple[str, int]]:
+    """
+    Traduce la periodicidad de una alerta a (unidad, cantidad). None = se dispara una sola vez.
+    La personalizada repite cada DiasPers días; las demás salen de ALERTAS_PERIODICIDADES.
+    Un IdPeriodicidad sin regla repite cada DiasPers días si lo tiene, si no se dispara una vez.
+    """
+    if id_periodicidad == ALERTAS_PERIODICIDAD_PERSONALIZADA or id_periodicidad not in _PERIODOS:
+        if id_periodicidad != ALERTAS_PERIODICIDAD_PERSONALIZADA and id_periodicidad not in _sin_regla:
+            _sin_regla.add(id_periodicidad)
+            logger.warning(f"IdPeriodicidad {id_periodicidad} sin regla en ALERTAS_PERIODICIDADES: se usa DiasPers")
+        return ("dias", dias_pers) if dias_pers and dias_pers > 0 else None
+    return _PERIODOS[id_periodicidad]
+
+
+def sumar_meses(fecha: datetime, meses: int) -> datetime:
+    mes_total = fecha.month - 1 + meses
+    anio, mes = fecha.year + mes_total // 12, mes_total % 12 + 1
+    # 31/01 + 1 mes -> 28/02 (o 29): se recorta al último día del mes
+    siguiente = datetime(anio + (mes == 12), mes % 12 + 1, 1)
+    ultimo_dia = (siguiente - timedelta(days=1)).day
+    return fecha.replace(year=anio, month=mes, day=min(fecha.day, ultimo_dia))
+
+
+def _ocurrencia(inicio: datetime, intervalo: Tuple[str, int], k: int) -> datetime:
+    unidad, cantidad = intervalo
+    if unidad == "dias":
+        return inicio + timedelta(days=cantidad * k)
+    return sumar_meses(inicio, cantidad * k)
+
+
+def _indice_hasta(inicio: datetime, intervalo: Tuple[str, int], fecha: datetime) -> int:
+    """Mayor k tal que la ocurrencia k es <= fecha (o 0 si fecha es anterior al inicio)."""
+    if fecha < inicio:
+        return 0
+    unidad, cantidad = intervalo
+    if unidad == "dias":
+        k = (fecha - inicio) // timedelta(days=cantidad)
+    else:
+        k = ((fecha.year - inicio.year) * 12 + fecha.month - inicio.month) // cantidad
+    while k > 0 and _ocurrencia(inicio, intervalo, k) > fecha:
+        k -= 1
+    while _ocurrencia(inicio, intervalo, k + 1) <= fecha:
+        k += 1
+    return k
+
+
+def proxima_ocurrencia(
+    inicio: Optional[datetime],
+    fin: Optional[datetime],
+    intervalo: Optional[Tuple[str, int]],
+    ultima: Optional[datetime],
+    ahora: datetime,
+) -> Optional[datetime]:
+    """
+    Próxima ocurrencia a disparar después de `ultima` (la última enviada).
+    Si hay varias vencidas (p.ej. el servidor estuvo apagado) solo se devuelve la
+    más reciente: una alerta atrasada se envía una vez, no una por cada periodo perdido.
+    """
+    if inicio is None:
+        return None
+    if intervalo is None:
+        proxima = inicio if ultima is None or ultima < inicio else None
+    else:
+        k = 0 if ultima is None or ultima < inicio else _indice_hasta(inicio, intervalo, ultima) + 1
+        limite = min(ahora, fin) if fin is not None else ahora
+        if _ocurrencia(inicio, intervalo, k) <= limite:
+            k = max(k, _indice_hasta(inicio, intervalo, limite))
+        proxima = _ocurrencia(inicio, intervalo, k)
+    if proxima is None or (fin is not None and proxima > fin):
+        return None
+    return proxima
+
+
+@dataclass(frozen=True)
+class Disparo:
+    """Una ocurrencia de alerta lista para enviarse por un canal."""
+
+    id_alerta: int
+    fecha_programada: datetime
+    medio: Optional[str]
+    id_tipo_alerta: Optional[int]
+    id_transaccion: Optional[int]
+    asunto: Optional[str]
+    mensaje: Optional[str]
+    destinatarios: Optional[str]
+
+
+class AlertaChannel(Protocol):
+    def send_batch(self, disparos: List[Disparo]) -> List[Optional[str]]:
+        """Envía un lote y devuelve, en el mismo orden, None o el mensaje de error de cada disparo."""
+        ...
+
+
+class SistemaChannel:
+    """Canal por defecto: el disparo queda registrado en AlertaEnvio y en el log."""
+
+    def send_batch(self, disparos: List[Disparo]) -> List[Optional[str]]:
+        for disparo in disparos:
+            logger.info(
+                f"Alerta {disparo.id_alerta} disparada ({disparo.fecha_programada:%Y-%m-%d %H:%M}): {disparo.asunto}"
+            )
+        return [None] * len(disparos)
+
+
+_channels: Dict[str, AlertaChannel] = {}
+_canal_por_defecto: AlertaChannel = SistemaChannel()
+
+
+def register_channel(medio: str, channel: AlertaChannel) -> None:
+    """Asocia un valor de Alerta.Medio (sin distinguir mayúsculas ni acentos) con un canal."""
+    _channels[_normalizar(medio)] = channel
+
+
+def channel_for(medio: Optional[str]) -> AlertaChannel:
+    return _channels.get(_normalizar(medio), _canal_por_defecto)
+
+
+class AlertaScheduler:
+    """
+    Mantiene las alertas activas en un min-heap ordenado por la próxima fecha de disparo.
+    Un hilo duerme hasta el primer vencimiento, despacha lo vencido agrupado por canal y
+    vuelve a calcular la siguiente ocurrencia. Los cambios confirmados sobre Alerta marcan
+    solo esas alertas para recalcular: los de este worker al confirmar y los de los demás
+    leyendo AlertaEvento cada ALERTAS_SCHEDULER_POLL_SECONDS. Cada ALERTAS_REBUILD_SECONDS
+    se relee todo.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        # (cuándo despachar, id): cuándo es la fecha de la ocurrencia o la del próximo reintento
+        self._heap: List[Tuple[datetime, int]] = []
+        # id -> (cuándo, fecha de la ocurrencia) vigente; las entradas viejas del heap se descartan al salir
+        self._programadas: Dict[int, Tuple[datetime, datetime]] = {}
+        # id -> momento a partir del cual se puede reintentar la ocurrencia que falló
+        self._reintentos: Dict[int, datetime] = {}
+        self._pendientes_refresh: Set[int] = set()
+        self._rebuild_pedido = True
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._estados: Dict[str, int] = {}
+        # Último IdEvento de AlertaEvento aplicado; None si la tabla no se pudo leer
+        self._ultimo_evento: Optional[int] = None
+        self._eventos_fallaron = False
+        self.ultimo_rebuild: Optional[datetime] = None
+        self.ultimo_despacho: Optional[datetime] = None
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from backend.database.connection import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    # --- API pública -------------------------------------------------------
+
+    def refresh(self, ids_alerta: Iterable[int]) -> None:
+        """Marca alertas para recalcular (creadas, modificadas o borradas)."""
+        if not self.running:
+            # Un worker que no es líder no acumula cambios: el líder los lee de AlertaEvento
+            # y al arrancar como líder se relee todo
+            return
+        with self._cond:
+            self._pendientes_refresh.update(ids_alerta)
+            self._cond.notify()
+
+    def request_rebuild(self) -> None:
+        with self._cond:
+            self._rebuild_pedido = True
+            self._cond.notify()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.request_rebuild()
+        self._thread = threading.Thread(target=self._run, name="alerta-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._cond:
+            proxima = min(cuando for cuando, _ in self._programadas.values()) if self._programadas else None
+            return {
+                "activo": self.running,
+                "programadas": len(self._programadas),
+                "proximo_disparo": proxima,
+                "ultimo_rebuild": self.ultimo_rebuild,
+                "ultimo_despacho": self.ultimo_despacho,
+            }
+
+    def tick(self, ahora: Optional[datetime] = None) -> int:
+        """Aplica los refresh pendientes y despacha lo vencido. Devuelve la cantidad de disparos."""
+        ahora = ahora or datetime.now()
+        with self._cond:
+            rebuild = self._rebuild_pedido
+            ids = set(self._pendientes_refresh)
+            self._rebuild_pedido = False
+            self._pendientes_refresh.clear()
+        db = self._session()
+        try:
+            if rebuild:
+                # El corte se toma antes de leer las alertas: lo que cambie en el medio se vuelve a aplicar
+                self._ultimo_evento = self._max_evento(db)
+                self._rebuild(db, ahora)
+            else:
+                ids |= self._leer_eventos(db)
+                if ids:
+                    self._recalcular(db, ids, ahora)
+            return self._despachar(db, ahora)
+        finally:
+            db.close()
+
+    # --- carga y programación ----------------------------------------------
+
+    def _cargar_estados(self, db: Session) -> None:
+        self._estados = {
+            _normalizar(nombre): id_estado
+            for id_estado, nombre in db.query(EstadoAlerta.IdEstado, EstadoAlerta.nombre).all()
+        }
+
+    def _id_estado(self, nombre: str) -> Optional[int]:
+        id_estado = self._estados.get(_normalizar(nombre))
+        if id_estado is None and nombre == ALERTAS_ESTADO_PENDIENTE:
+            return _ID_PENDIENTE_POR_DEFECTO
+        return id_estado
+
+    def _query_activas(self, db: Session):
+        id_pendiente = self._id_estado(ALERTAS_ESTADO_PENDIENTE)
+        # Una ocurrencia fallida con intentos disponibles no cuenta como la última: se vuelve a programar
+        ultimos = (
+            db.query(AlertaEnvio.IdAlerta, func.max(AlertaEnvio.FechaProgramada).label("ultima"))
+            .filter(or_(AlertaEnvio.Estado != ENVIO_ERROR, AlertaEnvio.Intentos >= ALERTAS_REINTENTOS))
+            .group_by(AlertaEnvio.IdAlerta)
+            .subquery()
+        )
+        return (
+            db.query(Alerta, ultimos.c.ultima)
+            .outerjoin(ultimos, ultimos.c.IdAlerta == Alerta.idAlerta)
+            .filter(Alerta.FechaInicio.isnot(None))
+            .filter((Alerta.IdEstado == id_pendiente) | Alerta.IdEstado.is_(None))
+        )
+
+    def _activas_por_id(self, db: Session, ids: Iterable[int]) -> list:
+        filas = []
+        for chunk in chunked(ids):
+            filas.extend(self._query_activas(db).filter(Alerta.idAlerta.in_(chunk)).all())
+        return filas
+
+    def _programar(self, filas, ahora: datetime) -> None:
+        with self._cond:
+            for alerta, ultima in filas:
+                intervalo = intervalo_de(alerta.IdPeriodicidad, alerta.DiasPers)
+                proxima = proxima_ocurrencia(alerta.FechaInicio, alerta.FechaFin, intervalo, ultima, ahora)
+                if proxima is None:
+                    self._programadas.pop(alerta.idAlerta, None)
+                    continue
+                cuando = max(proxima, self._reintentos.get(alerta.idAlerta, proxima))
+                self._programadas[alerta.idAlerta] = (cuando, proxima)
+                heapq.heappush(self._heap, (cuando, alerta.idAlerta))
+            self._cond.notify()
+
+    def _sin_eventos(self, db: Session) -> None:
+        db.rollback()
+        if not self._eventos_fallaron:
+            self._eventos_fallaron = True
+            logger.warning(
+                "Scheduler de alertas: no se pudo leer AlertaEvento (¿falta database/sql/alerta_evento.sql?); "
+                "los cambios de otros workers se toman recién en la relectura completa",
+                exc_info=True,
+            )
+
+    def _max_evento(self, db: Session) -> Optional[int]:
+        try:
+            return db.query(func.max(AlertaEvento.IdEvento)).scalar() or 0
+        except Exception:
+            self._sin_eventos(db)
+            return None
+
+    def _leer_eventos(self, db: Session) -> Set[int]:
+        """
+        Alertas con eventos posteriores al último aplicado. Como en el stream SSE, un hueco
+        reciente en IdEvento puede ser una transacción sin confirmar: los eventos de
+        después se aplican igual, pero el corte no pasa del hueco hasta que aparezca o
+        pasen ALERTAS_SSE_GAP_SECONDS, así se vuelven a leer (recalcular es idempotente).
+        """
+        if self._ultimo_evento is None:
+            return set()
+        ids: Set[int] = set()
+        try:
+            while True:
+                filas = (
+                    db.query(AlertaEvento.IdEvento, AlertaEvento.IdAlerta, AlertaEvento.Fecha)
+                    .filter(AlertaEvento.IdEvento > self._ultimo_evento)
+                    .order_by(AlertaEvento.IdEvento)
+                    .limit(_EVENTOS_LOTE)
+                    .all()
+                )
+                ids.update(fila.IdAlerta for fila in filas)
+                limite = datetime.now() - timedelta(seconds=ALERTAS_SSE_GAP_SECONDS)
+                corte = self._ultimo_evento
+                for fila in filas:
+                    if fila.IdEvento != corte + 1 and fila.Fecha > limite:
+                        break
+                    corte = fila.IdEvento
+                avanzo_todo = bool(filas) and corte == filas[-1].IdEvento
+                self._ultimo_evento = corte
+                if len(filas) < _EVENTOS_LOTE or not avanzo_todo:
+                    return ids
+        except Exception:
+            self._sin_eventos(db)
+            return ids
+
+    def _rebuild(self, db: Session, ahora: datetime) -> None:
+        self._cargar_estados(db)
+        filas = self._query_activas(db).all()
+        with self._cond:
+            self._heap = []
+            self._programadas = {}
+        self._programar(filas, ahora)
+        self.ultimo_rebuild = ahora
+        logger.info(f"Scheduler de alertas: {len(self._programadas)} alertas programadas")
+
+    def _recalcular(self, db: Session, ids: Set[int], ahora: datetime) -> None:
+        filas = self._activas_por_id(db, ids)
+        with self._cond:
+            for id_alerta in ids:
+                self._programadas.pop(id_alerta, None)
+        self._programar(filas, ahora)
+
+    def _vencidas(self, ahora: datetime) -> List[Tuple[int, datetime]]:
+        vencidas = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= ahora:
+                cuando, id_alerta = heapq.heappop(self._heap)
+                programada = self._programadas.get(id_alerta)
+                if programada is None or programada[0] != cuando:
+                    continue  # entrada reemplazada por un refresh
+                del self._programadas[id_alerta]
+                vencidas.append((id_alerta, programada[1]))
+        return vencidas
+
+    # --- despacho ------------------------------------------------------------
+
+    def _reclamar(self, db: Session, alerta: Alerta, fecha: datetime) -> Optional[AlertaEnvio]:
+        ocurrencia = db.query(AlertaEnvio).filter(
+            AlertaEnvio.IdAlerta == alerta.idAlerta, AlertaEnvio.FechaProgramada == fecha
+        )
+        if ocurrencia.first() is not None:
+            # Reintento: el UPDATE condicional hace que un solo proceso tome el envío fallido
+            tomadas = ocurrencia.filter(
+                AlertaEnvio.Estado == ENVIO_ERROR, AlertaEnvio.Intentos < ALERTAS_REINTENTOS
+            ).update(
+                {AlertaEnvio.Estado: ENVIO_ENVIANDO, AlertaEnvio.Intentos: AlertaEnvio.Intentos + 1},
+                synchronize_session=False,
+            )
+            if not tomadas:
+                return None
+            envio = ocurrencia.one()
+            db.refresh(envio)
+            return envio
+        envio = AlertaEnvio(
+            IdAlerta=alerta.idAlerta, FechaProgramada=fecha, Medio=alerta.Medio, Estado=ENVIO_ENVIANDO, Intentos=1
+        )
+        try:
+            with db.begin_nested():
+                db.add(envio)
+        except IntegrityError:
+            # Otro proceso ya tomó esta ocurrencia
+            return None
+        return envio
+
+    def _vigentes(
+        self, db: Session, vencidas: List[Tuple[int, datetime]], ahora: datetime
+    ) -> Dict[int, Tuple[Alerta, Optional[Tuple[str, int]]]]:
+        """
+        Vuelve a leer las alertas vencidas con el mismo filtro que la carga y se queda con
+        las que siguen activas y cuya próxima ocurrencia es la fecha que salió del heap.
+        El heap puede estar atrasado respecto de la base: las que ya no están activas
+        (cerradas, borradas, con FechaFin pasada) se descartan y las reprogramadas
+        vuelven al heap con su fecha nueva.
+        """
+        fechas = dict(vencidas)
+        filas = self._activas_por_id(db, fechas)
+        vigentes: Dict[int, Tuple[Alerta, Optional[Tuple[str, int]]]] = {}
+        reprogramar = []
+        for alerta, ultima in filas:
+            intervalo = intervalo_de(alerta.IdPeriodicidad, alerta.DiasPers)
+            proxima = proxima_ocurrencia(alerta.FechaInicio, alerta.FechaFin, intervalo, ultima, ahora)
+            if proxima == fechas[alerta.idAlerta]:
+                vigentes[alerta.idAlerta] = (alerta, intervalo)
+            else:
+                reprogramar.append((alerta, ultima))
+        if reprogramar:
+            self._programar(reprogramar, ahora)
+        descartadas = len(fechas) - len(vigentes)
+        if descartadas:
+            logger.info(f"Scheduler de alertas: {descartadas} alertas vencidas cambiaron desde que se programaron")
+        return vigentes
+
+    def _despachar(self, db: Session, ahora: datetime) -> int:
+        vencidas = self._vencidas(ahora)
+        if not vencidas:
+            return 0
+        alertas = self._vigentes(db, vencidas, ahora)
+
+        envios: Dict[int, AlertaEnvio] = {}
+        por_canal: Dict[int, Tuple[AlertaChannel, List[Disparo]]] = {}
+        for id_alerta, fecha in vencidas:
+            if id_alerta not in alertas:
+                continue
+            alerta = alertas[id_alerta][0]
+            envio = self._reclamar(db, alerta, fecha)
+            if envio is None:
+                continue
+            envios[id_alerta] = envio
+            canal = channel_for(alerta.Medio)
+            por_canal.setdefault(id(canal), (canal, []))[1].append(
+                Disparo(
+                    id_alerta=id_alerta,
+                    fecha_programada=fecha,
+                    medio=alerta.Medio,
+                    id_tipo_alerta=alerta.IdTipoAlerta,
+                    id_transaccion=alerta.IdTransaccion,
+                    asunto=alerta.Asunto,
+                    mensaje=alerta.Mensaje,
+                    destinatarios=alerta.Destinatarios,
+                )
+            )
+        # Las ocurrencias quedan reclamadas antes de enviar: como mucho un envío por ocurrencia
+        db.commit()
+
+        id_enviada = self._id_estado(ALERTAS_ESTADO_ENVIADA)
+        disparadas = 0
+        for canal, disparos in por_canal.values():
+            try:
+                errores = canal.send_batch(disparos)
+            except Exception as e:
+                logger.exception(f"Fallo el canal {type(canal).__name__}")
+                errores = [str(e)] * len(disparos)
+            for disparo, error in zip(disparos, errores):
+                envio = envios[disparo.id_alerta]
+                envio.FechaEnvio = datetime.now()
+                envio.Estado = ENVIO_ERROR if error else ENVIO_ENVIADO
+                envio.Error = error[:500] if error else None
+                alerta, intervalo = alertas[disparo.id_alerta]
+                if error:
+                    # La alerta no cambia de estado: el fallo queda en AlertaEnvio y se reintenta
+                    if envio.Intentos < ALERTAS_REINTENTOS:
+                        self._reintentos[disparo.id_alerta] = ahora + timedelta(
+                            seconds=ALERTAS_REINTENTO_SECONDS * envio.Intentos
+                        )
+                    else:
+                        self._reintentos.pop(disparo.id_alerta, None)
+                        logger.warning(
+                            f"Alerta {disparo.id_alerta}: el envío de {disparo.fecha_programada:%Y-%m-%d %H:%M} "
+                            f"falló {envio.Intentos} veces, no se reintenta: {error}"
+                        )
+                    continue
+                self._reintentos.pop(disparo.id_alerta, None)
+                disparadas += 1
+                proxima = proxima_ocurrencia(
+                    alerta.FechaInicio, alerta.FechaFin, intervalo, disparo.fecha_programada, ahora
+                )
+                if proxima is None and id_enviada is not None:
+                    alerta.IdEstado = id_enviada
+        db.commit()
+        self.ultimo_despacho = ahora
+        # Las alertas recurrentes vuelven al heap con su siguiente ocurrencia
+        self.refresh(envios)
+        return disparadas
+
+    # --- hilo ----------------------------------------------------------------
+
+    def _run(self) -> None:
+        proximo_rebuild = datetime.now() + timedelta(seconds=ALERTAS_REBUILD_SECONDS)
+        while not self._stop.is_set():
+            if datetime.now() >= proximo_rebuild:
+                self.request_rebuild()
+                proximo_rebuild = datetime.now() + timedelta(seconds=ALERTAS_REBUILD_SECONDS)
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Error en el scheduler de alertas")
+                self.request_rebuild()
+                self._stop.wait(30)
+                continue
+            with self._cond:
+                espera = self._espera()
+                if espera > 0 and not self._stop.is_set():
+                    self._cond.wait(espera)
+
+    def _espera(self) -> float:
+        """Segundos hasta el próximo vencimiento (se llama con el lock tomado)."""
+        if self._rebuild_pedido or self._pendientes_refresh:
+            return 0
+        espera = ALERTAS_REBUILD_SECONDS
+        if self._ultimo_evento is not None:
+            espera = min(espera, ALERTAS_SCHEDULER_POLL_SECONDS)
+        if self._heap:
+            espera = min(espera, (self._heap[0][0] - datetime.now()).total_seconds())
+        return max(0.0, espera)
+
+
+alerta_scheduler = AlertaScheduler()
+
+
+@change_events.on_commit
+def _alertas_modificadas(cambios: List[change_events.ChangeEvent]) -> None:
+    ids = {c.valores.get("idAlerta") for c in cambios if c.entidad == "Alerta"}
+    ids.discard(None)
+    if ids:
+        alerta_scheduler.refresh(ids)
+    if any(c.entidad == "EstadoAlerta" for c in cambios):
+        alerta_scheduler.request_rebuild()
+
+
+def _register_default_channels() -> None:
+    if "email" not in _channels:
+        # Import diferido: el canal de email importa este módulo
+        from backend.services.alerta_email_channel import register_email_channel
+
+        register_email_channel()
+
+
+# Con varios workers de uvicorn solo el que tiene el lock corre el scheduler
+alerta_leader = LeaderElector(
+    "alertas-scheduler", on_elected=alerta_scheduler.start, on_revoked=alerta_scheduler.stop
+)
+
+
+def start_alert_scheduler() -> None:
+    if ALERTAS_SCHEDULER_ENABLED:
+        _register_default_channels()
+        alerta_leader.start()
+
+
+def stop_alert_scheduler() -> None:
+    alerta_leader.stop()
+    alerta_scheduler.stop()
+    for channel in {id(c): c for c in _channels.values()}.values():
+        close = getattr(channel, "close", None)
+        if close is not None:
+            close()
+    _channels.clear()
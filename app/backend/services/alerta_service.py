@@ -1,9 +1,13 @@
 from sqlalchemy.orm import Session
 from backend.repositories.alerta_repositorie import AlertaRepositorie
-from backend.schemas.alerta_schema import AlertaCreate, AlertaUpdate
+from backend.schemas.alerta_schema import AlertaCreate, AlertaUpdate, AlertaBulkEstado
+from backend.models.estado_alerta_model import EstadoAlerta
+from backend.services.alerta_scheduler import alerta_scheduler
+from backend.services.audit_logger import AuditLogger
 
 class AlertaService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = AlertaRepositorie(db)
 
     def get_alerta(self, id_alerta: int):
@@ -15,6 +19,9 @@ class AlertaService:
     def get_alertas_by_id_estado(self, id_estado: int):
         return self.repo.get_by_id_estado(id_estado)
 
+    def get_alertas_filtradas(self, **filtros):
+        return self.repo.get_filtered_paginated(**filtros)
+
     def create_alerta(self, alerta: AlertaCreate):
         return self.repo.create(alerta)
 
@@ -23,3 +30,44 @@ class AlertaService:
 
     def delete_alerta(self, id_alerta: int):
         return self.repo.delete(id_alerta)
+
+    def bulk_update_estado(self, cambio: AlertaBulkEstado, current_user=None):
+        """
+        Cambia el estado de muchas alertas con UPDATE por conjunto y deja un solo registro
+        de auditoría. Lanza ValueError si el pedido es ambiguo o el estado no existe.
+        """
+        if (cambio.ids is None) == (cambio.filtro is None):
+            raise ValueError("Indicar 'ids' o 'filtro' (uno de los dos)")
+        filtros = None
+        if cambio.filtro is not None:
+            filtros = {
+                "id_estado": cambio.filtro.id_estado,
+                "id_tipo_alerta": cambio.filtro.IdTipoAlerta,
+                "id_transacciones": cambio.filtro.id_transaccion,
+                "fecha_desde": cambio.filtro.fechaDesde,
+                "fecha_hasta": cambio.filtro.fechaHasta,
+            }
+            if not any(v not in (None, []) for v in filtros.values()):
+                # Evita pasar de estado todas las alertas por un filtro vacío
+                raise ValueError("El filtro no puede estar vacío")
+        if self.db.get(EstadoAlerta, cambio.IdEstado) is None:
+            raise ValueError(f"No existe el estado de alerta {cambio.IdEstado}")
+
+        modificadas = self.repo.bulk_update_estado(
+            cambio.IdEstado,
+            ids=cambio.ids,
+            filtros=filtros,
+            aud_usuario=current_user.get("id") if isinstance(current_user, dict) else None,
+        )
+        ids = [id_alerta for id_alerta, _ in modificadas]
+        if ids:
+            anteriores = sorted({anterior for _, anterior in modificadas if anterior is not None})
+            AuditLogger(self.db, current_user).log_bulk_update(
+                entidad="Alerta",
+                ids=ids,
+                cambios={"IdEstado": [anteriores, cambio.IdEstado]},
+                filtro=cambio.filtro.model_dump(mode="json") if cambio.filtro else None,
+            )
+            # El UPDATE masivo no pasa por el flush del ORM: se avisa al scheduler a mano
+            alerta_scheduler.refresh(ids)
+        return ids
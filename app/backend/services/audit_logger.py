@@ -2,18 +2,47 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import event, inspect
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from backend.repositories.usuario_repositorie import UsuarioRepositorie
 from backend.schemas.auditoria_schema import AuditoriaCreate
 from backend.services.auditoria_service import AuditoriaService
+from backend.services.cache_utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
+DESCRIPCION_MAX_LEN = 5000
+# Largo máximo de cada valor dentro del diff antes de recortarlo
+DIFF_VALOR_MAX_LEN = 200
+CAMPOS_SENSIBLES = {"password", "contrasena", "token", "hash"}
+VALOR_OCULTO = "***"
+
+# Clave en session.info donde se acumulan los cambios detectados en cada flush
+_SESSION_DIFFS_KEY = "audit_diffs"
+_ENTIDADES_EXCLUIDAS = {"Auditoria", "AuditoriaArchivo"}
+
+# NombreUsuario -> IdUsuario, compartido por todos los requests del proceso
+_usuario_id_cache: TTLCache[int] = TTLCache(
+    maxsize=int(os.getenv("USUARIO_CACHE_MAX", "1024")),
+    ttl_seconds=int(os.getenv("USUARIO_CACHE_TTL_SECONDS", "300")),
+)
+# Memo por request en session.info: evita incluso tomar el lock del cache global
+_SESSION_USUARIOS_KEY = "audit_usuario_ids"
+
+
+def invalidar_cache_usuario(id_usuario: Optional[int] = None) -> None:
+    """Olvida las entradas de un usuario (o todas) tras modificarlo o eliminarlo."""
+    if id_usuario is None:
+        _usuario_id_cache.clear()
+    else:
+        _usuario_id_cache.invalidate_where(lambda _, value: value == id_usuario)
+
 
 def _now_utc() -> datetime:
     """Devuelve la hora actual en UTC, como datetime aware."""
@@ -33,6 +62,133 @@ def _normalize_to_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+def _es_sensible(campo: str) -> bool:
+    campo = campo.lower()
+    return any(sensible in campo for sensible in CAMPOS_SENSIBLES)
+
+
+def _valor_auditable(campo: str, valor: Any) -> Any:
+    if valor is None:
+        return None
+    if _es_sensible(campo):
+        return VALOR_OCULTO
+    if isinstance(valor, (bytes, bytearray, memoryview)):
+        return f"<binario {len(valor)} bytes>"
+    if isinstance(valor, (str, int, float, bool)):
+        return valor
+    return str(valor)
+
+
+def _diff_key(entidad: str, entity_id: Any) -> str:
+    return f"{entidad}:{entity_id}"
+
+
+@event.listens_for(Session, "before_flush")
+def _capturar_diffs(session: Session, flush_context, instances) -> None:
+    """
+    Antes de cada flush guarda, por instancia modificada, el valor anterior y el nuevo
+    de cada columna cambiada. `AuditLogger.log_update` los consume después del commit,
+    cuando el historial de atributos de SQLAlchemy ya se reseteó.
+    """
+    diffs = None
+    for obj in session.dirty:
+        estado = inspect(obj)
+        entidad = type(obj).__name__
+        if entidad in _ENTIDADES_EXCLUIDAS or estado.identity is None:
+            continue
+        cambios = {}
+        for attr in estado.mapper.column_attrs:
+            historial = estado.attrs[attr.key].history
+            if not historial.added:
+                continue
+            antes = historial.deleted[0] if historial.deleted else None
+            despues = historial.added[0]
+            if antes == despues:
+                continue
+            cambios[attr.key] = (
+                _valor_auditable(attr.key, antes),
+                _valor_auditable(attr.key, despues),
+            )
+        if not cambios:
+            continue
+        if diffs is None:
+            diffs = session.info.setdefault(_SESSION_DIFFS_KEY, {})
+        entity_id = "-".join(str(v) for v in estado.identity)
+        previos = diffs.setdefault(_diff_key(entidad, entity_id), {})
+        for campo, (antes, despues) in cambios.items():
+            # Si hubo varios flushes se conserva el primer "antes" y el último "después"
+            antes = previos[campo][0] if campo in previos else antes
+            previos[campo] = [antes, despues]
+
+
+def _dumps_compacto(value: Any) -> str:
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def _recortar(valor: Any, max_len: int) -> Any:
+    if isinstance(valor, str) and len(valor) > max_len:
+        return valor[: max_len - 1] + "…"
+    return valor
+
+
+def _rangos(ids: List[int]) -> str:
+    """[1, 2, 3, 7, 9, 10] -> "1-3,7,9-10": los ids masivos suelen ser consecutivos."""
+    partes: List[str] = []
+    ordenados = sorted(set(ids))
+    i = 0
+    while i < len(ordenados):
+        j = i
+        while j + 1 < len(ordenados) and ordenados[j + 1] == ordenados[j] + 1:
+            j += 1
+        partes.append(str(ordenados[i]) if i == j else f"{ordenados[i]}-{ordenados[j]}")
+        i = j + 1
+    return ",".join(partes)
+
+
+def compactar_diff(
+    entity_id: Any,
+    cambios: Dict[str, Any],
+    max_len: int = DESCRIPCION_MAX_LEN,
+) -> str:
+    """
+    Serializa el diff de un UPDATE sin pasarse de `max_len` y siempre como JSON válido.
+
+    Se degrada por etapas: primero recorta los valores largos, después descarta los
+    valores anteriores y, como último recurso, guarda solo los nombres de los campos.
+    """
+    descripcion = {"id": entity_id, "changes": cambios}
+    texto = _dumps_compacto(descripcion)
+    if len(texto) <= max_len:
+        return texto
+
+    def _recortar_valor(valor: Any) -> Any:
+        if isinstance(valor, list):
+            return [_recortar(v, DIFF_VALOR_MAX_LEN) for v in valor]
+        return _recortar(valor, DIFF_VALOR_MAX_LEN)
+
+    descripcion["changes"] = {campo: _recortar_valor(valor) for campo, valor in cambios.items()}
+    descripcion["truncado"] = True
+    texto = _dumps_compacto(descripcion)
+    if len(texto) <= max_len:
+        return texto
+
+    descripcion["changes"] = {
+        campo: valor[1] if isinstance(valor, list) and len(valor) == 2 else valor
+        for campo, valor in descripcion["changes"].items()
+    }
+    descripcion["sin_valores_anteriores"] = True
+    texto = _dumps_compacto(descripcion)
+    if len(texto) <= max_len:
+        return texto
+
+    campos = list(cambios)
+    while True:
+        texto = _dumps_compacto({"id": entity_id, "campos": campos, "truncado": True})
+        if len(texto) <= max_len or not campos:
+            return texto
+        campos = campos[: len(campos) // 2]
+
+
 class AuditLogger:
     """Utilidad responsable para persistir los logs de auditoría en la tabla AuditoriaTest."""
 
@@ -75,7 +231,7 @@ class AuditLogger:
         auditoria = AuditoriaCreate(
             Accion=accion[:50],
             Entidad=entidad[:100],
-            Descripcion=descripcion_str[:5000],
+            Descripcion=descripcion_str[:DESCRIPCION_MAX_LEN],
             AudFecha=aud_fecha_utc,
             AudUsuario=usuario_id,
         )
@@ -115,21 +271,49 @@ class AuditLogger:
             },
         )
 
-    def log_update(
-        self,
-        entidad: str,
-        entity_id: Any,
-        changes: Optional[Dict[str, Any]] = None,
-    ) -> None:
+    def log_update(self, entidad: str, entity_id: Any) -> None:
+        """
+        Registra un UPDATE guardando solo las columnas que cambiaron, como
+        `{"Campo": [antes, despues]}`. El diff sale del estado de la instancia en la
+        sesión (ver `_capturar_diffs`), por lo que `entidad` debe coincidir con el
+        nombre de la clase del modelo. Si el flush no cambió ninguna columna (un PUT
+        con los mismos valores) se registra con `changes` vacío. Los UPDATE masivos,
+        que no pasan por la sesión, van por `log_bulk_update`.
+        """
+        diffs = self.db.info.get(_SESSION_DIFFS_KEY, {})
+        cambios = diffs.pop(_diff_key(entidad, entity_id), None) or {}
         self.log(
             accion="UPDATE",
             entidad=entidad,
-            descripcion={
-                "id": entity_id,
-                "changes": changes or {},
-            },
+            descripcion=compactar_diff(entity_id, cambios),
         )
 
+    def log_bulk_update(
+        self,
+        entidad: str,
+        ids: List[int],
+        cambios: Dict[str, Any],
+        filtro: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Un único registro para un UPDATE masivo: cantidad, ids afectados (como rangos)
+        y los valores nuevos. Si la lista de ids no entra en la descripción se guarda
+        recortada con `ids_truncado`.
+        """
+        descripcion = {
+            "cantidad": len(ids),
+            "cambios": cambios,
+            "filtro": filtro,
+            "ids": _rangos(ids),
+        }
+        texto = _dumps_compacto(descripcion)
+        if len(texto) > DESCRIPCION_MAX_LEN:
+            sobrante = len(texto) - DESCRIPCION_MAX_LEN + 50
+            rangos = descripcion["ids"]
+            descripcion["ids"] = rangos[: max(0, len(rangos) - sobrante)].rsplit(",", 1)[0]
+            descripcion["ids_truncado"] = True
+        self.log(accion="BULK_UPDATE", entidad=entidad, descripcion=descripcion)
+
     def log_deletion(self, entidad: str, entity_id: Any) -> None:
         self.log(
             accion="DELETE",
@@ -141,7 +325,7 @@ class AuditLogger:
         if isinstance(descripcion, str):
             return descripcion
         try:
-            return json.dumps(descripcion, default=str, ensure_ascii=False)
+            return _dumps_compacto(descripcion)
         except TypeError:
             return str(descripcion)
 
@@ -159,6 +343,14 @@ class AuditLogger:
         if not username:
             return 0
 
-        usuario_repo = UsuarioRepositorie(self.db)
-        usuario = usuario_repo.get_by_username(username)
-        return getattr(usuario, "IdUsuario", 0) if usuario else 0
+        memo = self.db.info.setdefault(_SESSION_USUARIOS_KEY, {})
+        if username in memo:
+            return memo[username]
+
+        def _cargar() -> Optional[int]:
+            usuario = UsuarioRepositorie(self.db).get_by_username(username)
+            return getattr(usuario, "IdUsuario", None) if usuario else None
+
+        user_id = _usuario_id_cache.get_or_load(username, _cargar) or 0
+        memo[username] = user_id
+        return user_id
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import extract, func, insert, select
+from sqlalchemy.orm import Session
+
+from backend.database.schema_check import existe
+from backend.models.auditoria_model import Auditoria, AuditoriaArchivo
+
+logger = logging.getLogger(__name__)
+
+AUDITORIA_MESES_CALIENTES = int(os.getenv("AUDITORIA_MESES_CALIENTES", "6"))
+AUDITORIA_ARCHIVO_BATCH = int(os.getenv("AUDITORIA_ARCHIVO_BATCH", "5000"))
+
+
+def _inicio_de_mes(anio: int, mes: int) -> datetime:
+    while mes <= 0:
+        mes += 12
+        anio -= 1
+    return datetime(anio, mes, 1)
+
+
+class AuditoriaArchivoService:
+    """
+    Job de archivado: mueve de AuditoriaTest a AuditoriaTestArchivo los meses completos
+    anteriores a la ventana caliente. Trabaja en lotes por rango de IdAuditoria y confirma
+    cada lote, así nunca bloquea la tabla caliente por mucho tiempo.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def corte(self, meses_calientes: int, ahora: Optional[datetime] = None) -> datetime:
+        """Primer día del mes más viejo que se conserva en la tabla caliente."""
+        ahora = ahora or datetime.now(timezone.utc).replace(tzinfo=None)
+        return _inicio_de_mes(ahora.year, ahora.month - meses_calientes + 1)
+
+    def archivar(
+        self,
+        meses_calientes: int = AUDITORIA_MESES_CALIENTES,
+        batch_size: int = AUDITORIA_ARCHIVO_BATCH,
+    ) -> Dict[str, Any]:
+        if not existe(AuditoriaArchivo.__tablename__):
+            raise ValueError("Falta crear AuditoriaTestArchivo (database/sql/auditoria_archivo.sql)")
+        corte = self.corte(meses_calientes)
+        movidas = 0
+        periodo_expr = extract("year", Auditoria.AudFecha) * 100 + extract("month", Auditoria.AudFecha)
+        columnas = ["Periodo", "IdAuditoria", "Accion", "Entidad", "Descripcion", "AudFecha", "AudUsuario"]
+        try:
+            while True:
+                ids = (
+                    select(Auditoria.IdAuditoria)
+                    .where(Auditoria.AudFecha < corte)
+                    .order_by(Auditoria.IdAuditoria)
+                    .limit(batch_size)
+                    .subquery()
+                )
+                desde_id, hasta_id = self.db.execute(
+                    select(func.min(ids.c.IdAuditoria), func.max(ids.c.IdAuditoria))
+                ).one()
+                if desde_id is None:
+                    break
+                # Rango de ids en lugar de IN: evita el límite de 2100 parámetros de SQL Server
+                en_lote = (
+                    (Auditoria.AudFecha < corte)
+                    & (Auditoria.IdAuditoria >= desde_id)
+                    & (Auditoria.IdAuditoria <= hasta_id)
+                )
+                origen = select(
+                    periodo_expr,
+                    Auditoria.IdAuditoria,
+                    Auditoria.Accion,
+                    Auditoria.Entidad,
+                    Auditoria.Descripcion,
+                    Auditoria.AudFecha,
+                    Auditoria.AudUsuario,
+                ).where(en_lote)
+                self.db.execute(insert(AuditoriaArchivo).from_select(columnas, origen))
+                result = self.db.query(Auditoria).filter(en_lote).delete(synchronize_session=False)
+                self.db.commit()
+                movidas += result
+                logger.info(f"Auditoría archivada: ids {desde_id}-{hasta_id} ({result} registros)")
+        except Exception:
+            self.db.rollback()
+            raise
+        return {"corte": corte, "movidas": movidas}
+
+
+if __name__ == "__main__":
+    # Pensado para correr de noche: python -m backend.services.auditoria_archivo_service
+    from backend.database.connection import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        resultado = AuditoriaArchivoService(db).archivar()
+        print(f"Archivado completo: {resultado['movidas']} registros anteriores a {resultado['corte']:%Y-%m-%d}")
+    finally:
+        db.close()
@@ -0,0 +1,384 @@
+import csv
+import json
+from datetime import datetime
+from io import BytesIO, StringIO
+from typing import Any, Dict, Iterable, Iterator, List
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from backend.schemas.auditoria_schema import AuditoriaExportFilters
+
+
+def _matches_text(value: str | None, filtro: str | None) -> bool:
+    if not filtro:
+        return True
+    return (value or "").lower().find(filtro.lower()) != -1
+
+
+def _matches_date_range(
+    aud_fecha: datetime | None,
+    fecha_desde: datetime | None,
+    fecha_hasta: datetime | None,
+) -> bool:
+    if not fecha_desde and not fecha_hasta:
+        return True
+    if not aud_fecha:
+        return False
+    if fecha_desde and aud_fecha < fecha_desde:
+        return False
+    if fecha_hasta and aud_fecha > fecha_hasta:
+        return False
+    return True
+
+
+def matches_id_transaccion(descripcion: str | None, filtro: str | None) -> bool:
+    if not filtro:
+        return True
+    if not descripcion:
+        return False
+    try:
+        data = json.loads(descripcion)
+    except Exception:
+        # si no es JSON, buscar texto plano
+        return filtro.lower() in descripcion.lower()
+
+    # recorrido recursivo para encontrar cualquier clave que contenga "idtransaccion"
+    def search(obj):
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                if (
+                    "idtransaccion" in str(k).lower()
+                    and filtro.lower() in str(v).lower()
+                ):
+                    return True
+                if search(v):
+                    return True
+        elif isinstance(obj, list):
+            for item in obj:
+                if search(item):
+                    return True
+        return False
+
+    return search(data)
+
+
+def _flatten_descripcion(value, prefix=""):
+    """
+    Aplana la estructura de descripcion (similar al frontend) para poder mostrarla en el PDF.
+    Devuelve una lista de (label, value).
+    """
+    entries = []
+
+    if value is None:
+        return [("Detalle", "Sin datos")]
+
+    if isinstance(value, list) and len(value) == 2 and prefix.startswith("changes."):
+        # Diff de UPDATE: [antes, despues]
+        antes, despues = ("—" if v is None else v for v in value)
+        return [(prefix, f"{antes} → {despues}")]
+
+    if isinstance(value, list):
+        if not value:
+            return [("Detalle", "[]")]
+        for index, item in enumerate(value):
+            new_prefix = f"{prefix}[{index}]" if prefix else f"[{index}]"
+            entries.extend(_flatten_descripcion(item, new_prefix))
+        return entries
+
+    if isinstance(value, dict):
+        for key, val in value.items():
+            new_prefix = f"{prefix}.{key}" if prefix else key
+            entries.extend(_flatten_descripcion(val, new_prefix))
+        return entries
+
+    label = prefix or "Detalle"
+    return [(label, str(value))]
+
+
+def _build_descripcion_text(descripcion: str | None) -> str:
+    if not descripcion:
+        return "Sin detalle disponible"
+
+    try:
+        parsed = json.loads(descripcion)
+        entries = _flatten_descripcion(parsed)
+        # armo un texto tipo "campo: valor" por línea
+        parts = [f"{label}: {val}" for label, val in entries]
+        return "<br/>".join(parts)
+    except Exception:
+        # si no es JSON, devuelvo el texto crudo
+        return descripcion
+
+
+def filtrar_auditorias(
+    items: List[Dict[str, Any]], filtros: AuditoriaExportFilters
+) -> List[Dict[str, Any]]:
+    """Aplica los filtros de exportación sobre las auditorías ya cargadas."""
+    usuario_filter = (filtros.usuario or "").strip().lower() or None
+    entidad_filter = [e.lower() for e in (filtros.entidad or [])]
+    accion_filter = [a.lower() for a in (filtros.accion or [])]
+    id_transaccion_filter = (filtros.idTransaccion or "").strip().lower() or None
+
+    filtered_items = []
+    for item in items:
+        usuario_nombre = item.get("UsuarioNombre") or ""
+        aud_usuario = item.get("AudUsuario")
+        usuario_id = str(aud_usuario) if aud_usuario is not None else ""
+
+        if usuario_filter:
+            if (
+                usuario_filter not in usuario_nombre.lower()
+                and usuario_filter not in usuario_id.lower()
+            ):
+                continue
+
+        if entidad_filter:
+            entidad_val = (item.get("Entidad") or "").lower()
+            if entidad_val not in entidad_filter:
+                continue
+
+        if accion_filter:
+            accion_val = (item.get("Accion") or "").lower()
+            if accion_val not in accion_filter:
+                continue
+
+        if id_transaccion_filter and not matches_id_transaccion(
+            item.get("Descripcion"), id_transaccion_filter
+        ):
+            continue
+
+        aud_fecha = item.get("AudFecha")
+        if isinstance(aud_fecha, str):
+            try:
+                aud_fecha_dt = datetime.fromisoformat(aud_fecha)
+            except Exception:
+                aud_fecha_dt = None
+        else:
+            aud_fecha_dt = aud_fecha
+
+        if not _matches_date_range(aud_fecha_dt, filtros.fechaDesde, filtros.fechaHasta):
+            continue
+
+        filtered_items.append(item)
+
+    return filtered_items
+
+
+def _build_resumen(total: int, filtros: AuditoriaExportFilters) -> str:
+    usuario_filter = (filtros.usuario or "").strip().lower() or None
+    entidad_filter = [e.lower() for e in (filtros.entidad or [])]
+    accion_filter = [a.lower() for a in (filtros.accion or [])]
+    id_transaccion_filter = (filtros.idTransaccion or "").strip().lower() or None
+    fecha_desde = filtros.fechaDesde
+    fecha_hasta = filtros.fechaHasta
+
+    resumen = f"Total de registros: {total}"
+    if (
+        usuario_filter
+        or entidad_filter
+        or accion_filter
+        or id_transaccion_filter
+        or fecha_desde
+        or fecha_hasta
+    ):
+        filtros_text = []
+        if usuario_filter:
+            filtros_text.append(f"Usuario: {usuario_filter}")
+        if entidad_filter:
+            filtros_text.append(f"Entidades: {', '.join(entidad_filter)}")
+        if accion_filter:
+            filtros_text.append(f"Acciones: {', '.join(accion_filter)}")
+        if id_transaccion_filter:
+            filtros_text.append(f"ID Transacción: {id_transaccion_filter}")
+        if fecha_desde:
+            filtros_text.append(f"Desde: {fecha_desde.strftime('%d/%m/%Y')}")
+        if fecha_hasta:
+            filtros_text.append(f"Hasta: {fecha_hasta.strftime('%d/%m/%Y')}")
+        resumen += " | Filtros: " + " - ".join(filtros_text)
+    return resumen
+
+
+def build_auditorias_pdf(
+    items: List[Dict[str, Any]], filtros: AuditoriaExportFilters, output=None
+):
+    """
+    Genera el PDF (versión tabla, ReportLab Platypus) con las auditorías ya filtradas.
+    Escribe sobre `output` (archivo o buffer); si no se indica, devuelve un BytesIO posicionado al inicio.
+    """
+    buffer = output if output is not None else BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=30,
+        rightMargin=30,
+        topMargin=40,
+        bottomMargin=40,
+    )
+    styles = getSampleStyleSheet()
+    elements = []
+
+    # Título
+    title = Paragraph("Reporte de Auditorías", styles["Title"])
+    elements.append(title)
+
+    # Resumen de filtros
+    elements.append(Spacer(1, 8))
+    elements.append(Paragraph(_build_resumen(len(items), filtros), styles["Normal"]))
+    elements.append(Spacer(1, 12))
+
+    # Encabezados de tabla
+    data = [
+        ["ID", "Fecha", "Acción", "Entidad", "Usuario", "Detalle"],
+    ]
+
+    # Filas de datos
+    for item in items:
+        fecha_val = item.get("AudFecha")
+        if isinstance(fecha_val, datetime):
+            fecha_str = fecha_val.strftime("%d/%m/%Y %H:%M:%S")
+        elif isinstance(fecha_val, str):
+            try:
+                fecha_dt = datetime.fromisoformat(fecha_val)
+                fecha_str = fecha_dt.strftime("%d/%m/%Y %H:%M:%S")
+            except Exception:
+                fecha_str = fecha_val
+        else:
+            fecha_str = ""
+
+        usuario_str = item.get("UsuarioNombre") or item.get("AudUsuario") or ""
+
+        desc_html = _build_descripcion_text(item.get("Descripcion"))
+        detalle_para = Paragraph(desc_html, styles["Normal"])
+
+        data.append(
+            [
+                str(item.get("IdAuditoria", "")),
+                fecha_str,
+                item.get("Accion") or "",
+                item.get("Entidad") or "",
+                str(usuario_str),
+                detalle_para,
+            ]
+        )
+
+    # Configuración de tabla
+    table = Table(
+        data,
+        colWidths=[35, 80, 70, 80, 80, 200],
+        repeatRows=1,
+    )
+
+    table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#416759")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, 0), 9),
+                ("FONTSIZE", (0, 1), (-1, -1), 8),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+                (
+                    "ROWBACKGROUNDS",
+                    (0, 1),
+                    (-1, -1),
+                    [colors.whitesmoke, colors.lightgrey],
+                ),
+                ("LEFTPADDING", (0, 0), (-1, -1), 4),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+                ("TOPPADDING", (0, 0), (-1, -1), 2),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ]
+        )
+    )
+
+    elements.append(table)
+
+    doc.build(elements)
+    if output is None:
+        buffer.seek(0)
+    return buffer
+
+
+EXPORT_COLUMNS = ["IdAuditoria", "AudFecha", "Accion", "Entidad", "AudUsuario", "UsuarioNombre", "Descripcion"]
+
+
+def _export_row(item: Dict[str, Any]) -> List[Any]:
+    return [item.get(col) for col in EXPORT_COLUMNS]
+
+
+def iter_auditorias_csv(items: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Genera el CSV fila por fila (con BOM para que Excel respete los acentos).
+    Cada chunk se emite apenas se escribe, así la memoria no depende del volumen exportado.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    for item in items:
+        row = _export_row(item)
+        if isinstance(row[1], datetime):
+            row[1] = row[1].isoformat(sep=" ")
+        writer.writerow(row)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def write_auditorias_xlsx(items: Iterable[Dict[str, Any]], output) -> None:
+    """
+    Escribe el XLSX en modo write-only de openpyxl: las filas se vuelcan a disco a medida
+    que se agregan en lugar de mantener el libro completo en memoria.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Auditorias")
+    ws.append(EXPORT_COLUMNS)
+    for item in items:
+        row = _export_row(item)
+        ws.append(
+            [ILLEGAL_CHARACTERS_RE.sub("", v) if isinstance(v, str) else v for v in row]
+        )
+    wb.save(output)
+
+
+def _iter_export_job_items(params: Dict[str, Any]):
+    from backend.database.connection import SessionLocal
+    from backend.services.auditoria_service import AuditoriaService
+
+    db = SessionLocal()
+    try:
+        yield from AuditoriaService(db).iter_auditorias_export(AuditoriaExportFilters(**params))
+    finally:
+        db.close()
+
+
+def render_auditorias_csv_job(params: Dict[str, Any], output_path: str) -> None:
+    with open(output_path, "w", encoding="utf-8", newline="") as fh:
+        for chunk in iter_auditorias_csv(_iter_export_job_items(params)):
+            fh.write(chunk)
+
+
+def render_auditorias_xlsx_job(params: Dict[str, Any], output_path: str) -> None:
+    write_auditorias_xlsx(_iter_export_job_items(params), output_path)
+
+
+def render_auditorias_pdf_job(params: Dict[str, Any], output_path: str) -> None:
+    """
+    Tarea de reporte en segundo plano (ver report_job_service): lee las auditorías ya
+    filtradas en la base, como el CSV y el XLSX, y escribe el PDF en `output_path`.
+    """
+    filtros = AuditoriaExportFilters(**params)
+    # La tabla del PDF necesita todas las filas (y el total del resumen) antes de armarse
+    items = list(_iter_export_job_items(params))
+    with open(output_path, "wb") as fh:
+        build_auditorias_pdf(items, filtros, output=fh)
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 from backend.repositories.auditoria_repositorie import AuditoriaRepositorie
-from backend.schemas.auditoria_schema import AuditoriaCreate, AuditoriaUpdate
-from typing import List, Dict, Any
+from backend.schemas.auditoria_schema import AuditoriaCreate, AuditoriaUpdate, AuditoriaExportFilters
+from backend.services.auditoria_report_service import matches_id_transaccion
+from datetime import datetime
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 
 class AuditoriaService:
     def __init__(self, db: Session):
@@ -16,6 +18,59 @@ class AuditoriaService:
         """
         return self.repo.get_all(skip, limit)
 
+    def list_auditorias(
+        self,
+        filtros: AuditoriaExportFilters,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+        """
+        Página de auditorías filtradas. Devuelve los items y la clave para pedir la
+        página siguiente (None si no hay más).
+        """
+        id_transaccion = (filtros.idTransaccion or "").strip().lower() or None
+        if not id_transaccion:
+            items = self.repo.get_filtered(filtros, limit=limit + 1, cursor=cursor, offset=offset)
+        else:
+            # El LIKE de la base puede traer falsos positivos: se sigue leyendo por keyset
+            # hasta completar la página con coincidencias exactas.
+            items = []
+            salteados = 0
+            while len(items) <= limit:
+                lote = self.repo.get_filtered(filtros, limit=limit + 1, cursor=cursor)
+                for item in lote:
+                    if not matches_id_transaccion(item.get("Descripcion"), id_transaccion):
+                        continue
+                    if salteados < offset:
+                        salteados += 1
+                        continue
+                    items.append(item)
+                if len(lote) <= limit:
+                    break
+                cursor = (lote[-1]["AudFecha"], lote[-1]["IdAuditoria"])
+        items = items[: limit + 1]
+        siguiente = None
+        if len(items) > limit:
+            items = items[:limit]
+            siguiente = (items[-1]["AudFecha"], items[-1]["IdAuditoria"])
+        return items, siguiente
+
+    def count_auditorias(self, filtros: AuditoriaExportFilters) -> int:
+        if (filtros.idTransaccion or "").strip():
+            return sum(1 for _ in self.iter_auditorias_export(filtros))
+        return self.repo.count_filtered(filtros)
+
+    def iter_auditorias_export(self, filtros: AuditoriaExportFilters) -> Iterator[Dict[str, Any]]:
+        """
+        Itera las auditorías que cumplen los filtros de exportación, en streaming desde la base.
+        """
+        id_transaccion = (filtros.idTransaccion or "").strip().lower() or None
+        for item in self.repo.iter_filtered(filtros):
+            if id_transaccion and not matches_id_transaccion(item.get("Descripcion"), id_transaccion):
+                continue
+            yield item
+
     def create_auditoria(self, auditoria: AuditoriaCreate):
         return self.repo.create(auditoria)
 
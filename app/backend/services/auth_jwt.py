@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from backend.config_jwt import SECRET_KEY, ALGORITHM
@@ -16,6 +16,22 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+def get_current_user_sse(request: Request, token: str = Query(None)):
+    """
+    Igual que get_current_user, pero acepta el token en ?token= porque EventSource
+    no permite mandar el header Authorization.
+    """
+    header = request.headers.get("Authorization", "")
+    if header.lower().startswith("bearer "):
+        token = header[7:]
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return get_current_user(token)
+
 def require_role(required_role: str):
     def role_dependency(current_user=Depends(get_current_user)):
         if current_user.get('rol') != required_role:
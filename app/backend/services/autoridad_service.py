@@ -1,10 +1,20 @@
 from sqlalchemy.orm import Session
 from backend.repositories.autoridad_repositorie import AutoridadRepositorie
 from backend.schemas.autoridad_schema import AutoridadCreate, AutoridadUpdate
+from backend.services.search_service import search_service
 
-def search_autoridades_by_nombre(db: Session, nombre: str):
+def search_autoridades_by_nombre(db: Session, nombre: str, limit: int = 20, min_score: float = 0.5):
+    """
+    Búsqueda aproximada por similitud de trigramas sobre el nombre normalizado (sin
+    acentos ni mayúsculas): tolera errores de tipeo y no recorre la tabla. Devuelve
+    [(autoridad, score)]; mientras el índice se construye cae a un ILIKE sin score.
+    """
     repo = AutoridadRepositorie(db)
-    return repo.search_by_nombre(nombre)
+    coincidencias = search_service.match("autoridad", nombre, limit=limit, min_score=min_score)
+    if coincidencias is None:
+        return [(autoridad, None) for autoridad in repo.search_by_nombre(nombre, limit)]
+    scores = dict(coincidencias)
+    return [(autoridad, scores[autoridad.IdAutoridad]) for autoridad in repo.get_by_ids(list(scores))]
 
 def get_autoridad(db: Session, id: int):
     repo = AutoridadRepositorie(db)
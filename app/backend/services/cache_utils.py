@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+_SIN_VALOR = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    Cache en memoria acotado (LRU) con vencimiento por entrada.
+
+    Es por proceso: con varios workers de uvicorn cada uno tiene su copia, por lo que
+    solo conviene para datos que toleran unos segundos de desfasaje o que se invalidan
+    explícitamente desde el camino de escritura.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            item = self._data.get(key, _SIN_VALOR)
+            if item is _SIN_VALOR:
+                return default
+            expira, value = item
+            if expira <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Optional[V]]) -> Optional[V]:
+        """Devuelve el valor cacheado o lo carga con `loader`. Los `None` no se cachean."""
+        value = self.get(key, _SIN_VALOR)
+        if value is not _SIN_VALOR:
+            return value
+        value = loader()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.database import change_events
+from backend.models.expediente_model import Expediente
+from backend.services.search_index import PrefixIndex
+
+logger = logging.getLogger(__name__)
+
+EXPEDIENTE_SUGGEST_ENABLED = os.getenv("EXPEDIENTE_SUGGEST_ENABLED", "true").lower() in ("1", "true", "si", "yes")
+# Cada worker tiene su propia copia: la recarga periódica trae lo escrito por los demás
+EXPEDIENTE_SUGGEST_RELOAD_SECONDS = int(os.getenv("EXPEDIENTE_SUGGEST_RELOAD_SECONDS", "600"))
+
+
+class ExpedienteSuggestService:
+    """
+    Autocompletado de CodigoExpediente desde memoria. Los códigos se cargan al iniciar,
+    se mantienen con los commits de este proceso y se recargan cada
+    EXPEDIENTE_SUGGEST_RELOAD_SECONDS; una sugerencia nunca consulta la base.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self.indice = PrefixIndex()
+        self.listo = False
+        self.ultima_carga: Optional[datetime] = None
+        self._cargando = False
+        # Cambios que llegan durante una carga: se aplican encima al terminar
+        self._pendientes: List[change_events.ChangeEvent] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def cargando(self) -> bool:
+        return self._cargando
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from backend.database.connection import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def load(self) -> int:
+        with self._lock:
+            self._cargando = True
+            self._pendientes = []
+        db = self._session()
+        try:
+            filas = db.query(
+                Expediente.IdExpediente,
+                Expediente.CodigoExpediente,
+                Expediente.Caratula,
+                Expediente.IdTransaccion,
+            ).all()
+        finally:
+            db.close()
+        self.indice.load(
+            (f.IdExpediente, f.CodigoExpediente, {"Caratula": f.Caratula, "IdTransaccion": f.IdTransaccion})
+            for f in filas
+        )
+        with self._lock:
+            self._cargando = False
+            pendientes, self._pendientes = self._pendientes, []
+        self.aplicar(pendientes)
+        self.listo = True
+        self.ultima_carga = datetime.now()
+        logger.info(f"Autocompletado de expedientes cargado con {len(self.indice)} códigos")
+        return len(self.indice)
+
+    def aplicar(self, cambios: List[change_events.ChangeEvent]) -> None:
+        with self._lock:
+            if self._cargando:
+                self._pendientes.extend(cambios)
+        for cambio in cambios:
+            id_expediente = cambio.valores.get("IdExpediente") or (cambio.identity[0] if cambio.identity else None)
+            if id_expediente is None:
+                continue
+            if cambio.accion == change_events.DELETE:
+                self.indice.remove(id_expediente)
+            else:
+                self.indice.put(
+                    id_expediente,
+                    cambio.valores.get("CodigoExpediente"),
+                    Caratula=cambio.valores.get("Caratula"),
+                    IdTransaccion=cambio.valores.get("IdTransaccion"),
+                )
+
+    def suggest(self, prefijo: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return [
+            {
+                "IdExpediente": id_expediente,
+                "CodigoExpediente": codigo,
+                "Caratula": extra.get("Caratula"),
+                "IdTransaccion": extra.get("IdTransaccion"),
+            }
+            for id_expediente, codigo, extra in self.indice.search(prefijo, limit)
+        ]
+
+    # --- ciclo de vida -------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="expediente-suggest", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            inicio = time.monotonic()
+            try:
+                self.load()
+            except Exception:
+                logger.exception("Error cargando el autocompletado de expedientes")
+            espera = EXPEDIENTE_SUGGEST_RELOAD_SECONDS if self.listo else 30
+            self._stop.wait(max(1.0, espera - (time.monotonic() - inicio)))
+
+
+expediente_suggest_service = ExpedienteSuggestService()
+
+
+@change_events.on_commit
+def _expedientes_modificados(cambios: List[change_events.ChangeEvent]) -> None:
+    cambios = [c for c in cambios if c.entidad == Expediente.__name__]
+    if cambios and (expediente_suggest_service.listo or expediente_suggest_service.cargando):
+        expediente_suggest_service.aplicar(cambios)
+
+
+def start_expediente_suggest() -> None:
+    if EXPEDIENTE_SUGGEST_ENABLED:
+        expediente_suggest_service.start()
+
+
+def stop_expediente_suggest() -> None:
+    expediente_suggest_service.stop()
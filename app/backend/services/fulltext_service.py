@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy.orm import Session
+
+from backend.repositories.fulltext_repositorie import (
+    FUENTES_TEXTO,
+    MODOS,
+    FullTextRepositorie,
+    fts_sidecar,
+    usa_sidecar,
+)
+
+
+class FullTextService:
+    def __init__(self, db: Session):
+        self.repository = FullTextRepositorie(db)
+
+    @property
+    def motor(self) -> str:
+        return self.repository.backend
+
+    def disponible(self) -> bool:
+        return self.repository.disponible()
+
+    def search(self, q: str, tipos: Sequence[str] = (), modo: str = "contains", limit: int = 20) -> List[Dict[str, Any]]:
+        desconocidos = [tipo for tipo in tipos if tipo not in FUENTES_TEXTO]
+        if desconocidos:
+            raise ValueError(f"tipo no soportado: {', '.join(desconocidos)}. Opciones: {', '.join(FUENTES_TEXTO)}")
+        if modo not in MODOS:
+            raise ValueError(f"modo no soportado: {modo}. Opciones: {', '.join(MODOS)}")
+        return self.repository.search(q, tipos=tipos or tuple(FUENTES_TEXTO), modo=modo, limit=limit)
+
+
+def start_fulltext_sidecar() -> None:
+    from backend.database.connection import engine
+
+    if usa_sidecar(engine):
+        fts_sidecar.start()
+
+
+def stop_fulltext_sidecar() -> None:
+    fts_sidecar.stop()
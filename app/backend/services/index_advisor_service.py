@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.database.query_stats import OTRAS, Forma, query_stats
+from backend.repositories.diagnostics_repositorie import DiagnosticsRepositorie
+
+# Porcentaje del tiempo observado que se estima ahorrar cuando SQL Server no da su propio
+# impacto para el índice (otra base, o DMV vacía después de un reinicio)
+INDEX_ADVISOR_DEFAULT_IMPACT = float(os.getenv("INDEX_ADVISOR_DEFAULT_IMPACT", "50"))
+_MUESTRAS = 3
+
+
+@dataclass
+class Sugerencia:
+    tabla: str
+    igualdad: Tuple[str, ...]
+    siguiente: Optional[str] = None  # primera columna de rango u ORDER BY, va después de las de igualdad
+    incluidas: Tuple[str, ...] = ()
+    ejecuciones: int = 0
+    tiempo_observado_ms: float = 0.0
+    consultas: List[Forma] = field(default_factory=list)
+    dmv: Optional[Dict[str, Any]] = None
+
+    @property
+    def clave(self) -> Tuple[str, ...]:
+        return self.igualdad + ((self.siguiente,) if self.siguiente else ())
+
+    @property
+    def origen(self) -> str:
+        if self.dmv is None:
+            return "observado"
+        return "ambos" if self.ejecuciones else "dmv"
+
+    @property
+    def beneficio_estimado_ms(self) -> Optional[float]:
+        if not self.ejecuciones:
+            return None
+        impacto = self.dmv["impacto"] if self.dmv else INDEX_ADVISOR_DEFAULT_IMPACT
+        return round(self.tiempo_observado_ms * impacto / 100, 2)
+
+    @property
+    def ddl(self) -> str:
+        nombre = "_".join((f"IX_{self.tabla}",) + self.clave)[:128]
+        sentencia = f"CREATE NONCLUSTERED INDEX {nombre} ON dbo.{self.tabla} ({', '.join(self.clave)})"
+        if self.incluidas:
+            sentencia += f" INCLUDE ({', '.join(self.incluidas)})"
+        return sentencia
+
+
+def _cubierta(clave: Tuple[str, ...], igualdad: Tuple[str, ...], indices: List[Tuple[str, ...]]) -> bool:
+    """
+    Un índice existente sirve si empieza con las columnas de igualdad (en cualquier orden)
+    y, si la sugerencia tiene una columna de rango u orden, sigue con esa.
+    """
+    n = len(igualdad)
+    for indice in indices:
+        if len(indice) < len(clave) or set(indice[:n]) != set(igualdad):
+            continue
+        if len(clave) == n or indice[n] == clave[n]:
+            return True
+    return False
+
+
+def _consolidar(sugerencias: List[Sugerencia]) -> List[Sugerencia]:
+    """
+    Una sugerencia cuya clave es prefijo de otra de la misma tabla se resuelve con el índice
+    más largo: su tiempo y sus consultas pasan a ese y no se lista por separado.
+    """
+    resultado: List[Sugerencia] = []
+    for sugerencia in sorted(sugerencias, key=lambda s: len(s.clave), reverse=True):
+        n = len(sugerencia.igualdad)
+        mayor = next(
+            (
+                otra for otra in resultado
+                if otra.tabla == sugerencia.tabla
+                and set(otra.clave[:n]) == set(sugerencia.igualdad)
+                and (sugerencia.siguiente is None or otra.clave[n:n + 1] == (sugerencia.siguiente,))
+            ),
+            None,
+        )
+        if mayor is None:
+            resultado.append(sugerencia)
+            continue
+        mayor.ejecuciones += sugerencia.ejecuciones
+        mayor.tiempo_observado_ms += sugerencia.tiempo_observado_ms
+        mayor.consultas.extend(sugerencia.consultas)
+        mayor.incluidas = tuple(
+            dict.fromkeys(mayor.incluidas + tuple(c for c in sugerencia.incluidas if c not in mayor.clave))
+        )
+        if mayor.dmv is None:
+            mayor.dmv = sugerencia.dmv
+    return resultado
+
+
+def _candidatos(forma: Forma) -> List[Tuple[str, Tuple[str, ...], Optional[str]]]:
+    """(tabla, columnas de igualdad, columna siguiente) por cada tabla que filtra la sentencia."""
+    por_tabla: Dict[str, Tuple[List[str], List[str]]] = {}
+    for predicado in forma.predicados:
+        igualdad, rango = por_tabla.setdefault(predicado.tabla, ([], []))
+        (igualdad if predicado.igualdad else rango).append(predicado.columna)
+    candidatos = []
+    for tabla, (igualdad, rango) in por_tabla.items():
+        siguiente = rango[0] if rango else None
+        if siguiente is None and igualdad:
+            # Sin rango, la primera columna del ORDER BY de la misma tabla evita el sort
+            siguiente = next((c for t, c in forma.orden if t == tabla and c not in igualdad), None)
+        candidatos.append((tabla, tuple(sorted(igualdad)), siguiente))
+    return candidatos
+
+
+class IndexAdvisorService:
+    """
+    Cruza las formas de sentencia registradas por backend.database.query_stats con las
+    vistas sys.dm_db_missing_index_* y devuelve índices sugeridos, ordenados por el tiempo
+    que este proceso pasó en las consultas que los usarían.
+    """
+
+    def __init__(self, db: Session):
+        self.repository = DiagnosticsRepositorie(db)
+
+    def queries(self, limit: int = 50, orden: str = "total_ms") -> Dict[str, Any]:
+        return {"desde": query_stats.desde, "formas": query_stats.top(limit=limit, orden=orden)}
+
+    def reset(self) -> None:
+        query_stats.reset()
+
+    def report(self, limit: int = 20, min_ejecuciones: int = 1) -> Dict[str, Any]:
+        formas = [f for f in query_stats.formas() if f.sql != OTRAS and f.ejecuciones >= min_ejecuciones]
+        sugerencias: Dict[Tuple[str, Tuple[str, ...], Optional[str]], Sugerencia] = {}
+        for forma in formas:
+            for tabla, igualdad, siguiente in _candidatos(forma):
+                sugerencia = sugerencias.setdefault(
+                    (tabla, igualdad, siguiente), Sugerencia(tabla, igualdad, siguiente)
+                )
+                # El tiempo de una sentencia con JOIN se cuenta en cada tabla: es una cota superior
+                sugerencia.ejecuciones += forma.ejecuciones
+                sugerencia.tiempo_observado_ms += forma.total_ms
+                sugerencia.consultas.append(forma)
+
+        dmv = self.repository.missing_indexes()
+        tablas = {s.tabla for s in sugerencias.values()} | {d["tabla"] for d in dmv}
+        estructura = self.repository.estructura(tablas)
+
+        for faltante in dmv:
+            igualdad = tuple(sorted(faltante["igualdad"]))
+            siguiente = faltante["desigualdad"][0] if faltante["desigualdad"] else None
+            sugerencia = sugerencias.get((faltante["tabla"], igualdad, siguiente)) or next(
+                (
+                    s for (tabla, ig, _), s in sugerencias.items()
+                    if tabla == faltante["tabla"] and ig == igualdad and s.dmv is None
+                ),
+                None,
+            )
+            if sugerencia is None:
+                sugerencia = sugerencias[(faltante["tabla"], igualdad, siguiente)] = Sugerencia(
+                    faltante["tabla"], igualdad, siguiente
+                )
+            sugerencia.dmv = faltante
+            sugerencia.incluidas = tuple(
+                c for c in faltante["desigualdad"][1:] + faltante["incluidas"] if c not in sugerencia.clave
+            )
+
+        filas = self.repository.filas_por_tabla()
+        resultado = []
+        for sugerencia in sugerencias.values():
+            tabla = estructura.get(sugerencia.tabla)
+            # Tablas o columnas que no existen son ruido del análisis por patrones
+            if tabla is None or not sugerencia.clave or not set(sugerencia.clave) <= tabla["columnas"]:
+                continue
+            if _cubierta(sugerencia.clave, sugerencia.igualdad, tabla["indices"]):
+                continue
+            resultado.append(sugerencia)
+        resultado = _consolidar(resultado)
+
+        resultado.sort(
+            key=lambda s: (
+                s.beneficio_estimado_ms is not None,
+                s.beneficio_estimado_ms or 0,
+                s.dmv["mejora"] if s.dmv else 0,
+            ),
+            reverse=True,
+        )
+        return {
+            "desde": query_stats.desde,
+            "motor": self.repository.db.get_bind().dialect.name,
+            "formas_analizadas": len(formas),
+            "sugerencias": [self._snapshot(s, filas.get(s.tabla)) for s in resultado[:limit]],
+        }
+
+    @staticmethod
+    def _snapshot(sugerencia: Sugerencia, filas_tabla: Optional[int]) -> Dict[str, Any]:
+        consultas = sorted(sugerencia.consultas, key=lambda f: f.total_ms, reverse=True)
+        return {
+            "tabla": sugerencia.tabla,
+            "columnas": list(sugerencia.clave),
+            "incluidas": list(sugerencia.incluidas),
+            "origen": sugerencia.origen,
+            "ejecuciones": sugerencia.ejecuciones,
+            "tiempo_observado_ms": round(sugerencia.tiempo_observado_ms, 2),
+            "beneficio_estimado_ms": sugerencia.beneficio_estimado_ms,
+            "dmv_usos": sugerencia.dmv["usos"] if sugerencia.dmv else None,
+            "dmv_impacto": sugerencia.dmv["impacto"] if sugerencia.dmv else None,
+            "dmv_mejora": round(sugerencia.dmv["mejora"], 2) if sugerencia.dmv else None,
+            "filas_tabla": filas_tabla,
+            "consultas": [f.sql for f in consultas[:_MUESTRAS]],
+            "ddl": sugerencia.ddl,
+        }
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from backend.database.chunks import chunked
+from backend.models.expediente_model import Expediente
+from backend.models.integridad_model import IntegridadCheckpoint
+from backend.models.propiedad_minera_model import PropiedadMinera
+from backend.models.titular_minero_model import TitularMinero
+from backend.models.transaccion_model import Transaccion
+from backend.repositories.transaccion_repositorie import TABLAS
+
+logger = logging.getLogger(__name__)
+
+INTEGRIDAD_BATCH = int(os.getenv("INTEGRIDAD_BATCH", "2000"))
+INTEGRIDAD_MAX_HALLAZGOS = int(os.getenv("INTEGRIDAD_MAX_HALLAZGOS", "1000"))
+CHECKPOINT_TRANSACCIONES = "transacciones"
+# Uno por tabla; en estos UltimoIdTransaccion guarda la última clave primaria revisada
+CHECKPOINT_SIN_TRANSACCION = "sin_transaccion:{tabla}"
+
+# Tipos de hallazgo
+REGISTRO_INEXISTENTE = "registro_inexistente"      # la fila de Tabla/IdRegistro fue borrada
+TABLA_DESCONOCIDA = "tabla_desconocida"
+SIN_TRANSACCION = "entidad_sin_transaccion"        # la entidad tiene IdTransaccion NULL
+VINCULO_INCONSISTENTE = "vinculo_inconsistente"    # la entidad apunta a otra transacción
+PADRE_INEXISTENTE = "padre_inexistente"            # IdTransaccionPadre apunta a una transacción borrada
+
+# Tabla -> (columna en la entidad, modelo padre, columna del padre) para deducir IdTransaccionPadre
+PADRES = {
+    "PropiedadMinera": ("IdTitular", TitularMinero, "IdTitular"),
+    "Expediente": ("IdPropiedadMinera", PropiedadMinera, "IdPropiedadMinera"),
+    "Acta": ("IdExpediente", Expediente, "IdExpediente"),
+    "Resolucion": ("IdExpediente", Expediente, "IdExpediente"),
+    "Notificacion": ("CodExp", Expediente, "CodigoExpediente"),
+}
+
+
+def _pk(model):
+    return inspect(model).primary_key[0]
+
+
+class IntegridadService:
+    """
+    Barrido incremental de la jerarquía de Transaccion: recorre las transacciones por
+    IdTransaccion en lotes, cruza cada lote con la tabla de su registro y guarda el último
+    id revisado. Con `reparar` corrige lo que se puede deducir sin ambigüedad (vínculos
+    NULL y padres borrados que se pueden reconstruir desde la entidad); las transacciones
+    cuyo registro ya no existe solo se informan, nunca se borran.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._hallazgos: List[Dict[str, Any]] = []
+        self._conteo: Counter = Counter()
+        self._reparados: Counter = Counter()
+        self._sin_transaccion_vistas: set = set()
+
+    def _registrar(self, tipo: str, reparado: bool = False, **detalle) -> None:
+        self._conteo[tipo] += 1
+        if reparado:
+            self._reparados[tipo] += 1
+        if len(self._hallazgos) < INTEGRIDAD_MAX_HALLAZGOS:
+            self._hallazgos.append({"tipo": tipo, "reparado": reparado, **detalle})
+
+    def _checkpoint(self, nombre: str = CHECKPOINT_TRANSACCIONES) -> IntegridadCheckpoint:
+        checkpoint = self.db.get(IntegridadCheckpoint, nombre)
+        if checkpoint is None:
+            checkpoint = IntegridadCheckpoint(Nombre=nombre, UltimoIdTransaccion=0)
+            self.db.add(checkpoint)
+        return checkpoint
+
+    def _avanzar(self, checkpoint: IntegridadCheckpoint, ultimo: int) -> IntegridadCheckpoint:
+        """Guarda `ultimo` junto con las reparaciones pendientes y devuelve el checkpoint recargado."""
+        checkpoint.UltimoIdTransaccion = ultimo
+        checkpoint.AudFecha = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.db.commit()
+        return self._checkpoint(checkpoint.Nombre)
+
+    def _existentes(self, ids: Sequence[int]) -> set:
+        existentes = set()
+        for chunk in chunked(list(ids)):
+            existentes.update(
+                row[0]
+                for row in self.db.query(Transaccion.IdTransaccion)
+                .filter(Transaccion.IdTransaccion.in_(chunk))
+                .all()
+            )
+        return existentes
+
+    def _padres_deducidos(self, tabla: str, entidades: Dict[int, Any]) -> Dict[int, int]:
+        """IdRegistro -> IdTransaccion del padre según la clave de dominio de la entidad."""
+        if tabla not in PADRES:
+            return {}
+        columna, modelo_padre, clave_padre = PADRES[tabla]
+        claves = {getattr(e, columna) for e in entidades.values()} - {None}
+        transaccion_por_clave = {}
+        for chunk in chunked(list(claves)):
+            columna_padre = getattr(modelo_padre, clave_padre)
+            for clave, id_transaccion in (
+                self.db.query(columna_padre, modelo_padre.IdTransaccion)
+                .filter(columna_padre.in_(chunk))
+                .all()
+            ):
+                transaccion_por_clave[clave] = id_transaccion
+        return {
+            id_registro: transaccion_por_clave[getattr(e, columna)]
+            for id_registro, e in entidades.items()
+            if transaccion_por_clave.get(getattr(e, columna))
+        }
+
+    def _revisar_lote(self, lote: List[Transaccion], reparar: bool) -> None:
+        ids_padre = {
+            t.IdTransaccionPadre for t in lote
+            if t.IdTransaccionPadre and t.IdTransaccionPadre != t.IdTransaccion
+        }
+        padres_existentes = self._existentes(ids_padre)
+
+        por_tabla: Dict[str, List[Transaccion]] = defaultdict(list)
+        for t in lote:
+            por_tabla[t.Tabla].append(t)
+
+        for tabla, transacciones in por_tabla.items():
+            model = TABLAS.get(tabla)
+            if model is None:
+                for t in transacciones:
+                    self._registrar(TABLA_DESCONOCIDA, IdTransaccion=t.IdTransaccion, Tabla=tabla)
+                continue
+            pk = _pk(model)
+            entidades: Dict[int, Any] = {}
+            for chunk in chunked([t.IdRegistro for t in transacciones]):
+                for entidad in self.db.query(model).filter(pk.in_(chunk)).all():
+                    entidades[getattr(entidad, pk.key)] = entidad
+            padres = self._padres_deducidos(tabla, entidades)
+
+            for t in transacciones:
+                entidad = entidades.get(t.IdRegistro)
+                detalle = {"IdTransaccion": t.IdTransaccion, "Tabla": tabla, "IdRegistro": t.IdRegistro}
+                if entidad is None:
+                    self._registrar(REGISTRO_INEXISTENTE, **detalle)
+                elif entidad.IdTransaccion is None:
+                    self._sin_transaccion_vistas.add((tabla, t.IdRegistro))
+                    if reparar:
+                        entidad.IdTransaccion = t.IdTransaccion
+                    self._registrar(SIN_TRANSACCION, reparado=reparar, **detalle)
+                elif entidad.IdTransaccion != t.IdTransaccion:
+                    self._registrar(
+                        VINCULO_INCONSISTENTE, IdTransaccionEntidad=entidad.IdTransaccion, **detalle
+                    )
+
+                padre = t.IdTransaccionPadre
+                if padre and padre != t.IdTransaccion and padre not in padres_existentes:
+                    deducido = padres.get(t.IdRegistro)
+                    reparado = bool(reparar and deducido and deducido != padre)
+                    if reparado:
+                        t.IdTransaccionPadre = deducido
+                    self._registrar(
+                        PADRE_INEXISTENTE, reparado=reparado, IdTransaccionPadre=padre,
+                        IdTransaccionPadreDeducido=deducido, **detalle,
+                    )
+
+    def _revisar_entidades_sin_transaccion(self, reparar: bool, batch_size: int, desde_cero: bool) -> None:
+        """
+        Entidades con IdTransaccion NULL cuya transacción no se encontró por el barrido por id.
+        Cada tabla se recorre por clave primaria (keyset) desde su propio checkpoint, de a
+        `batch_size` filas, por el índice filtrado de integridad_checkpoint.sql. Las que no
+        se pudieron reparar se vuelven a informar solo con `desde_cero`.
+        """
+        for tabla, model in TABLAS.items():
+            pk = _pk(model)
+            checkpoint = self._checkpoint(CHECKPOINT_SIN_TRANSACCION.format(tabla=tabla))
+            ultimo = 0 if desde_cero else (checkpoint.UltimoIdTransaccion or 0)
+            while True:
+                entidades = (
+                    self.db.query(model)
+                    .filter(model.IdTransaccion.is_(None), pk > ultimo)
+                    .order_by(pk)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not entidades:
+                    break
+                ultimo = getattr(entidades[-1], pk.key)
+                self._revisar_sin_transaccion(tabla, pk, entidades, reparar)
+                checkpoint = self._avanzar(checkpoint, ultimo)
+                # Las entidades ya revisadas no hacen falta en la sesión
+                for entidad in entidades:
+                    self.db.expunge(entidad)
+
+    def _revisar_sin_transaccion(self, tabla: str, pk, entidades: List[Any], reparar: bool) -> None:
+        por_registro = {getattr(e, pk.key): e for e in entidades}
+        transacciones = {}
+        for chunk in chunked(list(por_registro)):
+            for id_registro, id_transaccion in (
+                self.db.query(Transaccion.IdRegistro, Transaccion.IdTransaccion)
+                .filter(Transaccion.Tabla == tabla, Transaccion.IdRegistro.in_(chunk))
+                .order_by(Transaccion.IdTransaccion)
+                .all()
+            ):
+                transacciones.setdefault(id_registro, id_transaccion)
+        for id_registro, entidad in por_registro.items():
+            if (tabla, id_registro) in self._sin_transaccion_vistas:
+                continue
+            id_transaccion = transacciones.get(id_registro)
+            reparado = bool(reparar and id_transaccion)
+            if reparado:
+                entidad.IdTransaccion = id_transaccion
+            self._registrar(
+                SIN_TRANSACCION, reparado=reparado, Tabla=tabla, IdRegistro=id_registro,
+                IdTransaccion=id_transaccion,
+            )
+
+    def barrer(
+        self,
+        reparar: bool = False,
+        desde_cero: bool = False,
+        batch_size: int = INTEGRIDAD_BATCH,
+    ) -> Dict[str, Any]:
+        checkpoint = self._checkpoint()
+        desde = 0 if desde_cero else (checkpoint.UltimoIdTransaccion or 0)
+        ultimo = desde
+        revisadas = 0
+        try:
+            while True:
+                lote = (
+                    self.db.query(Transaccion)
+                    .filter(Transaccion.IdTransaccion > ultimo)
+                    .order_by(Transaccion.IdTransaccion)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not lote:
+                    break
+                self._revisar_lote(lote, reparar)
+                ultimo = lote[-1].IdTransaccion
+                revisadas += len(lote)
+                # El checkpoint avanza junto con las reparaciones del lote
+                checkpoint = self._avanzar(checkpoint, ultimo)
+                logger.info(f"Integridad: transacciones revisadas hasta {ultimo}")
+            self._revisar_entidades_sin_transaccion(reparar, batch_size, desde_cero)
+        except Exception:
+            self.db.rollback()
+            raise
+        return {
+            "desde": desde,
+            "hasta": ultimo,
+            "revisadas": revisadas,
+            "reparar": reparar,
+            "conteo": dict(self._conteo),
+            "reparados": dict(self._reparados),
+            "hallazgos": self._hallazgos,
+            "hallazgos_truncados": sum(self._conteo.values()) > len(self._hallazgos),
+        }
+
+
+if __name__ == "__main__":
+    # Pensado para correr de noche: python -m backend.services.integridad_service [--reparar] [--desde-cero]
+    import sys
+
+    from backend.database.connection import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        resultado = IntegridadService(db).barrer(
+            reparar="--reparar" in sys.argv, desde_cero="--desde-cero" in sys.argv
+        )
+        print(
+            f"Integridad: {resultado['revisadas']} transacciones revisadas "
+            f"({resultado['desde']}-{resultado['hasta']}), hallazgos: {resultado['conteo']}, "
+            f"reparados: {resultado['reparados']}"
+        )
+    finally:
+        db.close()
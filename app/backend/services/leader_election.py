@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# auto: sp_getapplock si la base es SQL Server, si no un lock de archivo (un solo host)
+LEADER_BACKEND = os.getenv("LEADER_BACKEND", "auto").lower()
+LEADER_RENEW_SECONDS = float(os.getenv("LEADER_RENEW_SECONDS", "5"))
+# Solo lo usa el lock de archivo; directorio propio, aparte de los reportes en report_jobs/
+LEADER_LOCK_DIR = os.getenv("LEADER_LOCK_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "locks"
+)
+
+
+class SqlServerLease:
+    """
+    Lock de aplicación de SQL Server con owner = sesión, sobre una conexión dedicada.
+    El lock vive mientras la conexión esté abierta: si el proceso muere, SQL Server
+    lo libera solo y otro worker lo toma en la siguiente ronda.
+    """
+
+    nombre_backend = "sqlserver"
+
+    def __init__(self, recurso: str, engine=None):
+        self.recurso = recurso
+        self._engine = engine
+        self._conn = None
+
+    def _get_engine(self):
+        if self._engine is None:
+            from backend.database.connection import engine
+
+            self._engine = engine
+        return self._engine
+
+    def acquire(self) -> bool:
+        try:
+            if self._conn is None:
+                self._conn = self._get_engine().connect().execution_options(isolation_level="AUTOCOMMIT")
+            resultado = self._conn.execute(
+                text(
+                    "SET NOCOUNT ON; DECLARE @r INT; "
+                    "EXEC @r = sp_getapplock @Resource = :recurso, @LockMode = 'Exclusive', "
+                    "@LockOwner = 'Session', @LockTimeout = 0; "
+                    "SELECT @r"
+                ),
+                {"recurso": self.recurso},
+            ).scalar()
+            return resultado is not None and resultado >= 0
+        except Exception as e:
+            logger.warning(f"No se pudo pedir el lock {self.recurso}: {e}")
+            self.release()
+            return False
+
+    def still_held(self) -> bool:
+        if self._conn is None:
+            return False
+        try:
+            modo = self._conn.execute(
+                text("SELECT APPLOCK_MODE('public', :recurso, 'Session')"), {"recurso": self.recurso}
+            ).scalar()
+            return modo == "Exclusive"
+        except Exception as e:
+            logger.warning(f"Se perdió la conexión del lock {self.recurso}: {e}")
+            self.release()
+            return False
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            # Cerrar la conexión libera el lock de sesión aunque falle el release explícito
+            self._conn.execute(
+                text("EXEC sp_releaseapplock @Resource = :recurso, @LockOwner = 'Session'"),
+                {"recurso": self.recurso},
+            )
+        except Exception:
+            pass
+        finally:
+            try:
+                self._conn.invalidate()
+            except Exception:
+                pass
+            self._conn = None
+
+
+class FileLease:
+    """Lock exclusivo sobre un archivo: alcanza para varios workers en un mismo host."""
+
+    nombre_backend = "file"
+
+    def __init__(self, recurso: str, directorio: str = LEADER_LOCK_DIR):
+        self.recurso = recurso
+        self.path = os.path.join(directorio, f"{recurso}.leader.lock")
+        self._fh = None
+
+    def acquire(self) -> bool:
+        import fcntl
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fh = open(self.path, "a+")
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        fh.seek(0)
+        fh.truncate()
+        fh.write(f"{socket.gethostname()}:{os.getpid()}\n")
+        fh.flush()
+        self._fh = fh
+        return True
+
+    def still_held(self) -> bool:
+        return self._fh is not None
+
+    def release(self) -> None:
+        if self._fh is None:
+            return
+        import fcntl
+
+        try:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+
+def build_lease(recurso: str, backend: str = LEADER_BACKEND):
+    if backend == "auto":
+        from backend.database.connection import engine
+
+        backend = "sqlserver" if engine.dialect.name == "mssql" else "file"
+    if backend == "sqlserver":
+        return SqlServerLease(recurso)
+    if backend == "file":
+        return FileLease(recurso)
+    raise ValueError(f"LEADER_BACKEND '{backend}' no soportado (auto, sqlserver, file)")
+
+
+class LeaderElector:
+    """
+    Hilo que intenta tomar el lease cada LEADER_RENEW_SECONDS. Quien lo obtiene ejecuta
+    `on_elected`; si después lo pierde (conexión caída) ejecuta `on_revoked` y vuelve
+    a competir. Solo un proceso es líder a la vez y la conmutación tarda como mucho
+    un intervalo después de que el líder anterior suelta el lock.
+    """
+
+    def __init__(
+        self,
+        recurso: str,
+        on_elected: Callable[[], None],
+        on_revoked: Callable[[], None],
+        lease=None,
+        intervalo: float = LEADER_RENEW_SECONDS,
+    ):
+        self.recurso = recurso
+        self._on_elected = on_elected
+        self._on_revoked = on_revoked
+        self._lease = lease
+        self.intervalo = intervalo
+        self.es_lider = False
+        self.lider_desde: Optional[datetime] = None
+        self.ultimo_chequeo: Optional[datetime] = None
+        self.ultimo_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        if self._lease is None:
+            self._lease = build_lease(self.recurso)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.recurso}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.intervalo + 5)
+            self._thread = None
+        self._revocar()
+        if self._lease is not None:
+            self._lease.release()
+
+    def _revocar(self) -> None:
+        if not self.es_lider:
+            return
+        self.es_lider = False
+        self.lider_desde = None
+        logger.info(f"Se dejó de ser líder de {self.recurso}")
+        try:
+            self._on_revoked()
+        except Exception:
+            logger.exception(f"Error al liberar el liderazgo de {self.recurso}")
+
+    def check(self) -> bool:
+        """Una ronda de elección/renovación. Devuelve si este proceso es líder."""
+        self.ultimo_chequeo = datetime.now()
+        if self.es_lider:
+            if self._lease.still_held():
+                return True
+            self._revocar()
+            self._lease.release()
+        if self._lease.acquire():
+            self.es_lider = True
+            self.lider_desde = datetime.now()
+            logger.info(f"Proceso {os.getpid()} elegido líder de {self.recurso}")
+            try:
+                self._on_elected()
+            except Exception as e:
+                self.ultimo_error = str(e)
+                logger.exception(f"Error al iniciar como líder de {self.recurso}")
+        return self.es_lider
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.check()
+                self.ultimo_error = None
+            except Exception as e:
+                self.ultimo_error = str(e)
+                logger.exception(f"Error en la elección de líder de {self.recurso}")
+            self._stop.wait(self.intervalo)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "recurso": self.recurso,
+            "backend": getattr(self._lease, "nombre_backend", None),
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "lider": self.es_lider,
+            "lider_desde": self.lider_desde,
+            "ultimo_chequeo": self.ultimo_chequeo,
+            "ultimo_error": self.ultimo_error,
+            "activo": bool(self._thread and self._thread.is_alive()),
+        }
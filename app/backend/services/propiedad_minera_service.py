@@ -1,5 +1,11 @@
 from sqlalchemy.orm import Session
+from backend.database.chunks import chunked
 from backend.repositories.propiedad_minera_repositorie import PropiedadMineraRepositorie
+from backend.repositories.propiedad_minera_listado_repositorie import (
+    PropiedadMineraListadoRepositorie,
+    listado_disponible,
+)
+from backend.models.titular_minero_model import TitularMinero
 
 from backend.schemas.propiedad_minera_schema import PropiedadMineraCreate
 from backend.repositories.titular_minero_repositorie import TitularMineroRepository
@@ -8,19 +14,36 @@ from backend.schemas.transaccion_schema import TransaccionCreate
 from datetime import datetime
 
 class PropiedadMineraService:
-    def get_filtered_paginated(self, filters=None, offset=0, limit=10):
-        items, total = self.repository.get_filtered_paginated(filters, offset, limit)
-        for propiedad in items:
-            propiedad.TitularNombre = propiedad.get_titular_nombre(self.repository.db)
+    def get_filtered_paginated(self, filtro=None, offset=0, limit=10):
+        if listado_disponible():
+            # La proyección ya trae TitularNombre, CantidadExpedientes y UltimoMovimiento
+            return PropiedadMineraListadoRepositorie(self.repository.db).get_filtered_paginated(filtro, offset, limit)
+        items, total = self.repository.get_filtered_paginated(filtro, offset, limit)
+        self._asignar_titulares(items)
         return items, total
+
+    def _asignar_titulares(self, propiedades):
+        """TitularNombre de todas las propiedades con una consulta por cada mil titulares."""
+        ids = sorted({p.IdTitular for p in propiedades if p.IdTitular})
+        nombres = {}
+        for chunk in chunked(ids):
+            nombres.update(
+                self.repository.db.query(TitularMinero.IdTitular, TitularMinero.Nombre)
+                .filter(TitularMinero.IdTitular.in_(chunk))
+                .all()
+            )
+        for propiedad in propiedades:
+            propiedad.TitularNombre = nombres.get(propiedad.IdTitular)
+
+    def reconstruir_listado(self) -> int:
+        return PropiedadMineraListadoRepositorie(self.repository.db).reconstruir()
     def __init__(self, db: Session):
         self.repository = PropiedadMineraRepositorie(db)
 
     def get_all(self):
         propiedades = self.repository.get_all()
         # Agregar nombre del titular a cada propiedad
-        for propiedad in propiedades:
-            propiedad.TitularNombre = propiedad.get_titular_nombre(self.repository.db)
+        self._asignar_titulares(propiedades)
         return propiedades
 
     def get_by_id(self, id_propiedad: int):
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from backend.services.auditoria_report_service import (
+    render_auditorias_csv_job,
+    render_auditorias_pdf_job,
+    render_auditorias_xlsx_job,
+)
+
+logger = logging.getLogger(__name__)
+
+REPORT_JOBS_DIR = os.getenv("REPORT_JOBS_DIR")
+if REPORT_JOBS_DIR:
+    REPORT_JOBS_DIR = os.path.normpath(REPORT_JOBS_DIR)
+else:
+    REPORT_JOBS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "report_jobs")
+REPORT_JOBS_TTL_SECONDS = int(os.getenv("REPORT_JOBS_TTL_SECONDS", "3600"))
+REPORT_JOBS_WORKERS = int(os.getenv("REPORT_JOBS_WORKERS", "2"))
+
+ESTADO_PENDIENTE = "pendiente"
+ESTADO_EN_PROCESO = "en_proceso"
+ESTADO_LISTO = "listo"
+ESTADO_ERROR = "error"
+ESTADOS_ACTIVOS = (ESTADO_PENDIENTE, ESTADO_EN_PROCESO)
+
+# Tipos de reporte disponibles: (función de render, media type, nombre del archivo descargado).
+# La función debe ser de nivel módulo para poder enviarse al proceso hijo.
+REPORT_TYPES: Dict[str, tuple[Callable[[Dict[str, Any], str], None], str, str]] = {
+    "auditorias_pdf": (render_auditorias_pdf_job, "application/pdf", "auditorias.pdf"),
+    "auditorias_csv": (render_auditorias_csv_job, "text/csv; charset=utf-8", "auditorias.csv"),
+    "auditorias_xlsx": (
+        render_auditorias_xlsx_job,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "auditorias.xlsx",
+    ),
+}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _now_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _meta_path(job_id: str) -> str:
+    return os.path.join(REPORT_JOBS_DIR, f"{job_id}.json")
+
+
+def _result_path(job_id: str) -> str:
+    return os.path.join(REPORT_JOBS_DIR, f"{job_id}.bin")
+
+
+def _active_path(firma: str) -> str:
+    return os.path.join(REPORT_JOBS_DIR, f"activo-{firma}.lock")
+
+
+def _write_meta(meta: Dict[str, Any]) -> None:
+    """Escritura atómica del estado del job: el disco es la fuente de verdad compartida entre workers."""
+    meta["actualizado"] = _now_utc().isoformat()
+    tmp_path = f"{_meta_path(meta['job_id'])}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, ensure_ascii=False)
+    os.replace(tmp_path, _meta_path(meta["job_id"]))
+
+
+def _read_meta(job_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_meta_path(job_id), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _run_job(job_id: str, tipo: str, params: Dict[str, Any]) -> None:
+    """Se ejecuta en el proceso hijo: renderiza el reporte y actualiza su estado en disco."""
+    meta = _read_meta(job_id) or {"job_id": job_id, "tipo": tipo}
+    meta["estado"] = ESTADO_EN_PROCESO
+    _write_meta(meta)
+    render, _, _ = REPORT_TYPES[tipo]
+    tmp_output = f"{_result_path(job_id)}.tmp"
+    try:
+        render(params, tmp_output)
+        os.replace(tmp_output, _result_path(job_id))
+        meta["estado"] = ESTADO_LISTO
+    except Exception as e:
+        _remove_quietly(tmp_output)
+        meta["estado"] = ESTADO_ERROR
+        meta["error"] = str(e)
+        raise
+    finally:
+        _write_meta(meta)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: los hijos no heredan el pool de conexiones ni los hilos del servidor
+            _executor = ProcessPoolExecutor(
+                max_workers=REPORT_JOBS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _firma(tipo: str, params: Dict[str, Any], usuario: Optional[str]) -> str:
+    # El usuario forma parte de la firma: cada uno solo puede descargar sus propios reportes
+    payload = json.dumps(
+        {"tipo": tipo, "params": params, "usuario": usuario}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_expired(meta: Dict[str, Any]) -> bool:
+    expira = meta.get("expira")
+    return bool(expira) and datetime.fromisoformat(expira) <= _now_utc()
+
+
+def purge_expired() -> int:
+    """Elimina del disco los jobs cuyo TTL venció. Devuelve la cantidad eliminada."""
+    if not os.path.isdir(REPORT_JOBS_DIR):
+        return 0
+    removed = 0
+    for name in os.listdir(REPORT_JOBS_DIR):
+        if not name.endswith(".json"):
+            continue
+        job_id = name[: -len(".json")]
+        meta = _read_meta(job_id)
+        if meta is None or not _is_expired(meta) or meta.get("estado") in ESTADOS_ACTIVOS:
+            continue
+        _remove_quietly(_result_path(job_id))
+        _remove_quietly(_meta_path(job_id))
+        removed += 1
+    return removed
+
+
+class ReportJobService:
+    """
+    Cola local de reportes pesados: el request solo encola y devuelve un job_id,
+    un pool de procesos renderiza el archivo y el resultado queda en disco hasta que vence su TTL.
+    """
+
+    def submit(self, tipo: str, params: Dict[str, Any], usuario: Optional[str] = None) -> Dict[str, Any]:
+        if tipo not in REPORT_TYPES:
+            raise ValueError(f"Tipo de reporte '{tipo}' no soportado")
+        os.makedirs(REPORT_JOBS_DIR, exist_ok=True)
+        purge_expired()
+
+        firma = _firma(tipo, params, usuario)
+        existing = self._active_job(firma)
+        if existing is not None:
+            return existing
+
+        job_id = uuid.uuid4().hex
+        owns_lock = True
+        try:
+            # O_EXCL hace atómica la deduplicación aunque haya varios workers de uvicorn
+            fd = os.open(_active_path(firma), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            existing = self._active_job(firma)
+            if existing is not None:
+                return existing
+            # Otro worker está registrando la misma firma en este instante: se encola sin marca
+            owns_lock = False
+        if owns_lock:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(job_id)
+
+        ahora = _now_utc()
+        meta = {
+            "job_id": job_id,
+            "tipo": tipo,
+            "estado": ESTADO_PENDIENTE,
+            "firma": firma,
+            "usuario": usuario,
+            "creado": ahora.isoformat(),
+            "expira": datetime.fromtimestamp(
+                ahora.timestamp() + REPORT_JOBS_TTL_SECONDS, tz=timezone.utc
+            ).isoformat(),
+            "error": None,
+        }
+        _write_meta(meta)
+
+        try:
+            future = _get_executor().submit(_run_job, job_id, tipo, params)
+        except Exception:
+            if owns_lock:
+                _remove_quietly(_active_path(firma))
+            meta["estado"] = ESTADO_ERROR
+            meta["error"] = "No se pudo encolar el reporte"
+            _write_meta(meta)
+            raise
+        future.add_done_callback(lambda f: self._on_done(job_id, firma if owns_lock else None, f))
+        return meta
+
+    def _active_job(self, firma: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(_active_path(firma), "r", encoding="utf-8") as fh:
+                job_id = fh.read().strip()
+        except FileNotFoundError:
+            return None
+        if not job_id:
+            # Marca recién creada por otro worker, todavía sin contenido
+            return None
+        meta = _read_meta(job_id)
+        if meta and meta.get("estado") in ESTADOS_ACTIVOS and not _is_expired(meta):
+            return meta
+        # Marca huérfana (proceso caído o job ya finalizado): se libera la firma
+        _remove_quietly(_active_path(firma))
+        return None
+
+    def _on_done(self, job_id: str, firma: Optional[str], future) -> None:
+        if firma:
+            _remove_quietly(_active_path(firma))
+        error = future.exception()
+        if error is None:
+            return
+        logger.error(f"Fallo el reporte en segundo plano {job_id}: {error}")
+        meta = _read_meta(job_id)
+        if meta and meta.get("estado") != ESTADO_ERROR:
+            # p.ej. BrokenProcessPool: el hijo no llegó a registrar el error
+            meta["estado"] = ESTADO_ERROR
+            meta["error"] = str(error)
+            _write_meta(meta)
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        meta = _read_meta(job_id)
+        if meta is None or _is_expired(meta):
+            return None
+        return meta
+
+    def get_result(self, job_id: str) -> Optional[tuple[str, str, str]]:
+        """Devuelve (ruta, media type, nombre de archivo) si el reporte está listo."""
+        meta = self.get_status(job_id)
+        if meta is None or meta.get("estado") != ESTADO_LISTO:
+            return None
+        _, media_type, filename = REPORT_TYPES[meta["tipo"]]
+        path = _result_path(job_id)
+        if not os.path.exists(path):
+            return None
+        return path, media_type, filename
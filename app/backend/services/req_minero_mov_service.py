@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from backend.repositories.req_minero_mov_repositorie import ReqMineroMovRepository
 from backend.repositories.propiedad_minera_repositorie import PropiedadMineraRepositorie
-from backend.schemas.req_minero_mov_schema import ReqMineroMovCreate, ReqMineroMovUpdate, ReqMineroMovFilter
+from backend.schemas.req_minero_mov_schema import ReqMineroMovCreate, ReqMineroMovUpdate
 from typing import List, Optional
 from backend.models.req_minero_mov_model import ReqMineroMov
 
@@ -44,36 +44,18 @@ class ReqMineroMovService:
     def get_count_by_propiedad(self, id_propiedad_minera: int) -> int:
         return self.repository.get_count_by_propiedad(id_propiedad_minera)
 
-    def search_with_filters(self, filters: ReqMineroMovFilter) -> dict:
-        # Convertir filtros a diccionario
-        filter_dict = {}
-        
-        if filters.IdPropiedadMinera:
-            filter_dict['IdPropiedadMinera'] = filters.IdPropiedadMinera
-        
-        if filters.IdReqMinero:
-            filter_dict['IdReqMinero'] = filters.IdReqMinero
-        
-        if filters.Descripcion:
-            filter_dict['Descripcion'] = filters.Descripcion
-        
-        if filters.FechaDesde:
-            filter_dict['FechaDesde'] = filters.FechaDesde
-        
-        if filters.FechaHasta:
-            filter_dict['FechaHasta'] = filters.FechaHasta
-        
+    def search_with_filters(self, filtro=None, rango: Optional[list] = None) -> dict:
         # Manejar paginación
         skip = 0
         limit = 100
         
-        if filters.range and len(filters.range) == 2:
-            skip = filters.range[0]
-            limit = filters.range[1] - filters.range[0] + 1
+        if rango and len(rango) == 2:
+            skip = rango[0]
+            limit = rango[1] - rango[0] + 1
         
         # Buscar datos
-        data = self.repository.search(filter_dict, skip, limit)
-        total = self.repository.search_count(filter_dict)
+        data = self.repository.search(filtro, skip, limit)
+        total = self.repository.search_count(filtro)
         
         return {
             'data': data,
@@ -14,6 +14,9 @@ class ResolucionService:
     def get_all(self):
         return self.repository.get_all(self.db)
 
+    def get_filtered_paginated(self, filtro=None, offset=0, limit=None):
+        return self.repository.get_filtered_paginated(self.db, filtro, offset, limit)
+
     def get_by_id(self, id_resolucion: int):
         return self.repository.get_by_id(self.db, id_resolucion)
 
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+# Los mismos separadores que quita la columna TitularMinero.DniCuitNormalizado
+_SEPARADORES_DOCUMENTO = re.compile(r"[-./ ]")
+_DOCUMENTO = re.compile(r"^[0-9 ./-]+$")
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas, sin acentos y con todo lo que no es letra o dígito convertido en espacio."""
+    texto = unicodedata.normalize("NFKD", str(texto or ""))
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+def normalizar_documento(valor: Optional[str]) -> str:
+    """DNI/CUIT sin separadores: "20-12.345.678-9" -> "20123456789"."""
+    return _SEPARADORES_DOCUMENTO.sub("", str(valor or "").strip())
+
+
+def parece_documento(valor: Optional[str]) -> bool:
+    """Solo dígitos y separadores, con al menos 7 dígitos (un DNI)."""
+    valor = str(valor or "").strip()
+    return bool(_DOCUMENTO.match(valor)) and len(normalizar_documento(valor)) >= 7
+
+
+def trigramas_documento(texto_normalizado: str) -> Set[str]:
+    """
+    Trigramas de cada palabra con relleno ("  ab", " abc", "bc "): el relleno marca
+    inicio y fin de palabra, así las búsquedas de 1-2 caracteres se resuelven como prefijo.
+    """
+    grams: Set[str] = set()
+    for palabra in texto_normalizado.split():
+        relleno = f"  {palabra} "
+        grams.update(relleno[i : i + 3] for i in range(len(relleno) - 2))
+    return grams
+
+
+def trigramas_consulta(texto_normalizado: str) -> Tuple[List[str], List[str]]:
+    """
+    (obligatorios, de bonificación). Las palabras de 3+ caracteres aportan sus trigramas
+    internos (coinciden en cualquier posición, útil para códigos parciales) y los de
+    inicio/fin de palabra como bonificación; las más cortas solo se buscan como prefijo.
+    """
+    obligatorios: List[str] = []
+    bonus: List[str] = []
+    for palabra in texto_normalizado.split():
+        if len(palabra) < 3:
+            relleno = f"  {palabra}"
+            obligatorios.extend(relleno[i : i + 3] for i in range(len(relleno) - 2))
+            continue
+        obligatorios.extend(palabra[i : i + 3] for i in range(len(palabra) - 2))
+        bonus.extend((f"  {palabra[0]}", f" {palabra[:2]}", f"{palabra[-2:]} "))
+    return list(dict.fromkeys(obligatorios)), list(dict.fromkeys(bonus))
+
+
+@dataclass
+class Documento:
+    clave: Hashable
+    titulo: str
+    subtitulo: Optional[str]
+    titulo_normalizado: str
+    grams: Set[str]
+    extra: Dict[str, Any]
+
+
+@dataclass
+class Resultado:
+    clave: Hashable
+    titulo: str
+    subtitulo: Optional[str]
+    score: float
+    extra: Dict[str, Any]
+
+
+class TrigramIndex:
+    """
+    Índice invertido trigrama -> documentos, en memoria y seguro entre hilos.
+    Un documento puede indexar varios textos; el título pesa además en el ranking.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[int]] = {}
+        self._docs: Dict[int, Documento] = {}
+        self._por_clave: Dict[Hashable, int] = {}
+        self._siguiente = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(
+        self,
+        clave: Hashable,
+        titulo: Optional[str],
+        textos: Iterable[Optional[str]] = (),
+        subtitulo: Optional[str] = None,
+        **extra,
+    ) -> None:
+        """Agrega o reemplaza el documento `clave`."""
+        titulo_normalizado = normalizar(titulo)
+        grams = trigramas_documento(titulo_normalizado)
+        for texto in textos:
+            grams |= trigramas_documento(normalizar(texto))
+        with self._lock:
+            self.remove(clave)
+            if not grams:
+                return
+            doc_id = self._siguiente
+            self._siguiente += 1
+            self._docs[doc_id] = Documento(clave, titulo or "", subtitulo, titulo_normalizado, grams, extra)
+            self._por_clave[clave] = doc_id
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, clave: Hashable) -> None:
+        with self._lock:
+            doc_id = self._por_clave.pop(clave, None)
+            if doc_id is None:
+                return
+            doc = self._docs.pop(doc_id)
+            for gram in doc.grams:
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(doc_id)
+                    if not posting:
+                        del self._postings[gram]
+
+    def get(self, clave: Hashable) -> Optional[Documento]:
+        with self._lock:
+            doc_id = self._por_clave.get(clave)
+            return self._docs.get(doc_id) if doc_id is not None else None
+
+    def search(
+        self,
+        consulta: str,
+        limit: int = 20,
+        min_score: float = 0.5,
+        filtro=None,
+    ) -> List[Resultado]:
+        """
+        Documentos ordenados por score. El score base es la fracción de trigramas de la
+        consulta presentes en el documento (tolera errores de tipeo); se suma un extra si
+        el título coincide exacto, empieza con la consulta o la contiene.
+        """
+        normalizada = normalizar(consulta)
+        obligatorios, bonus = trigramas_consulta(normalizada)
+        if not obligatorios:
+            return []
+        with self._lock:
+            conteo: Counter = Counter()
+            for gram in obligatorios:
+                conteo.update(self._postings.get(gram, ()))
+            minimo = max(1, int(len(obligatorios) * min_score + 0.999999))
+            resultados: List[Resultado] = []
+            for doc_id, coincidencias in conteo.items():
+                if coincidencias < minimo:
+                    continue
+                doc = self._docs[doc_id]
+                if filtro is not None and not filtro(doc):
+                    continue
+                score = coincidencias / len(obligatorios)
+                if bonus:
+                    score += 0.1 * sum(1 for gram in bonus if gram in doc.grams) / len(bonus)
+                if doc.titulo_normalizado == normalizada:
+                    score += 1.0
+                elif doc.titulo_normalizado.startswith(normalizada):
+                    score += 0.5
+                elif normalizada in doc.titulo_normalizado:
+                    score += 0.25
+                resultados.append(Resultado(doc.clave, doc.titulo, doc.subtitulo, round(score, 4), doc.extra))
+        resultados.sort(key=lambda r: (-r.score, len(r.titulo)))
+        return resultados[:limit]
+
+    def replace_with(self, otro: "TrigramIndex") -> None:
+        """Toma el contenido de un índice reconstruido en otro hilo."""
+        with self._lock:
+            self._postings, self._docs = otro._postings, otro._docs
+            self._por_clave, self._siguiente = otro._por_clave, otro._siguiente
+
+
+class PrefixIndex:
+    """
+    Claves normalizadas en una lista ordenada de tuplas (clave, id): una búsqueda por
+    prefijo es un bisect más un recorrido de los resultados, sin estructuras por nodo.
+    Cada id guarda además su valor original y los datos extra que se quieran devolver.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._claves: List[Tuple[str, Hashable]] = []
+        self._por_id: Dict[Hashable, Tuple[str, str, Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._por_id)
+
+    @staticmethod
+    def normalizar(valor: Optional[str]) -> str:
+        return " ".join(str(valor or "").split()).casefold()
+
+    def load(self, filas: Iterable[Tuple[Hashable, Optional[str], Dict[str, Any]]]) -> None:
+        """Reemplaza todo el contenido con (id, valor, extra); ordena una sola vez."""
+        claves: List[Tuple[str, Hashable]] = []
+        por_id: Dict[Hashable, Tuple[str, str, Dict[str, Any]]] = {}
+        for id_registro, valor, extra in filas:
+            clave = self.normalizar(valor)
+            if not clave:
+                continue
+            claves.append((clave, id_registro))
+            por_id[id_registro] = (clave, valor, extra)
+        claves.sort()
+        with self._lock:
+            self._claves, self._por_id = claves, por_id
+
+    def put(self, id_registro: Hashable, valor: Optional[str], **extra) -> None:
+        clave = self.normalizar(valor)
+        with self._lock:
+            self.remove(id_registro)
+            if not clave:
+                return
+            bisect.insort(self._claves, (clave, id_registro))
+            self._por_id[id_registro] = (clave, valor, extra)
+
+    def remove(self, id_registro: Hashable) -> None:
+        with self._lock:
+            actual = self._por_id.pop(id_registro, None)
+            if actual is None:
+                return
+            i = bisect.bisect_left(self._claves, (actual[0], id_registro))
+            if i < len(self._claves) and self._claves[i] == (actual[0], id_registro):
+                del self._claves[i]
+
+    def search(self, prefijo: str, limit: int = 10) -> List[Tuple[Hashable, str, Dict[str, Any]]]:
+        """(id, valor, extra) cuyo valor empieza con `prefijo`, en orden alfabético."""
+        prefijo = self.normalizar(prefijo)
+        if not prefijo:
+            return []
+        resultados = []
+        with self._lock:
+            i = bisect.bisect_left(self._claves, (prefijo,))
+            while i < len(self._claves) and len(resultados) < limit:
+                clave, id_registro = self._claves[i]
+                if not clave.startswith(prefijo):
+                    break
+                _, valor, extra = self._por_id[id_registro]
+                resultados.append((id_registro, valor, extra))
+                i += 1
+        return resultados
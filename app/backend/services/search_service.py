@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from backend.database import change_events
+from backend.database.chunks import chunked
+from backend.models.acta_model import Acta
+from backend.models.autoridad_model import Autoridad
+from backend.models.expediente_model import Expediente
+from backend.models.propiedad_minera_model import PropiedadMinera
+from backend.models.resolucion_model import Resolucion
+from backend.models.titular_minero_model import TitularMinero
+from backend.services.search_index import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "true").lower() in ("1", "true", "si", "yes")
+# Cada worker tiene su propio índice: la reconstrucción periódica trae lo escrito por los demás
+SEARCH_REBUILD_SECONDS = int(os.getenv("SEARCH_REBUILD_SECONDS", "600"))
+# Los textos largos se indexan recortados; la búsqueda en contenido completo es otra cosa
+SEARCH_MAX_TEXT_LEN = int(os.getenv("SEARCH_MAX_TEXT_LEN", "300"))
+_BATCH = 5000
+
+
+@dataclass(frozen=True)
+class Fuente:
+    tipo: str
+    modelo: Any
+    titulo: str
+    textos: Tuple[str, ...] = ()
+    subtitulo: Optional[str] = None
+
+    @property
+    def pk(self):
+        return inspect(self.modelo).primary_key[0]
+
+    def columnas(self):
+        nombres = dict.fromkeys((self.pk.key, "IdTransaccion", self.titulo, *self.textos, self.subtitulo))
+        # Autoridad no cuelga de una transacción: solo se piden las columnas que existen
+        return [getattr(self.modelo, nombre) for nombre in nombres if nombre and hasattr(self.modelo, nombre)]
+
+
+FUENTES: Dict[str, Fuente] = {
+    f.tipo: f
+    for f in (
+        Fuente("expediente", Expediente, "CodigoExpediente", ("Caratula", "PrimerDueno"), "Caratula"),
+        Fuente("propiedad", PropiedadMinera, "Nombre", ("Provincia",), "Provincia"),
+        Fuente("titular", TitularMinero, "Nombre", ("DniCuit",), "DniCuit"),
+        Fuente("autoridad", Autoridad, "Nombre", ("Abrev",), "Abrev"),
+        Fuente("acta", Acta, "Descripcion", ("Lugar",), "Lugar"),
+        Fuente("resolucion", Resolucion, "Numero", ("Titulo", "Descripcion"), "Titulo"),
+    )
+}
+_FUENTE_POR_ENTIDAD = {f.modelo.__name__: f for f in FUENTES.values()}
+
+
+def _recortar(texto: Any) -> Optional[str]:
+    if texto is None:
+        return None
+    texto = str(texto)
+    return texto if len(texto) <= SEARCH_MAX_TEXT_LEN else texto[:SEARCH_MAX_TEXT_LEN]
+
+
+def _indexar(indice: TrigramIndex, fuente: Fuente, fila: Dict[str, Any]) -> None:
+    id_registro = fila[fuente.pk.key]
+    # El título de las actas es su Descripcion, que puede ser larga
+    titulo = _recortar(fila.get(fuente.titulo))
+    indice.add(
+        (fuente.tipo, id_registro),
+        titulo if titulo is not None else "",
+        [_recortar(fila.get(campo)) for campo in fuente.textos],
+        subtitulo=_recortar(fila.get(fuente.subtitulo)) if fuente.subtitulo else None,
+        IdTransaccion=fila.get("IdTransaccion"),
+    )
+
+
+class SearchService:
+    """
+    Búsqueda global sobre expedientes, propiedades, titulares, autoridades, actas y
+    resoluciones con un índice de trigramas en memoria. Se construye al iniciar (en un
+    hilo, sin demorar el arranque), se actualiza con los commits de este proceso y se
+    reconstruye cada SEARCH_REBUILD_SECONDS para tomar lo escrito por otros workers.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self.indice = TrigramIndex()
+        self.listo = False
+        self.ultima_construccion: Optional[datetime] = None
+        self._construyendo = False
+        # Claves cambiadas durante una reconstrucción: se vuelven a leer al terminar
+        self._pendientes: Set[Tuple[str, Any]] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def construyendo(self) -> bool:
+        return self._construyendo
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from backend.database.connection import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def build(self) -> int:
+        nuevo = TrigramIndex()
+        with self._lock:
+            self._construyendo = True
+            self._pendientes.clear()
+        db = self._session()
+        try:
+            for fuente in FUENTES.values():
+                ultimo = None
+                # Lectura por keyset para no cargar tablas enteras en una sola consulta
+                while True:
+                    query = db.query(*fuente.columnas()).order_by(fuente.pk)
+                    if ultimo is not None:
+                        query = query.filter(fuente.pk > ultimo)
+                    filas = query.limit(_BATCH).all()
+                    for fila in filas:
+                        _indexar(nuevo, fuente, dict(fila._mapping))
+                    if len(filas) < _BATCH:
+                        break
+                    ultimo = getattr(filas[-1], fuente.pk.key)
+        finally:
+            db.close()
+        with self._lock:
+            self.indice.replace_with(nuevo)
+            self._construyendo = False
+            pendientes, self._pendientes = self._pendientes, set()
+        if pendientes:
+            self.reindexar(pendientes)
+        self.listo = True
+        self.ultima_construccion = datetime.now()
+        logger.info(f"Índice de búsqueda construido con {len(self.indice)} documentos")
+        return len(self.indice)
+
+    def reindexar(self, claves: Sequence[Tuple[str, Any]]) -> None:
+        """Vuelve a leer de la base los registros indicados ((tipo, id)) o los quita si no existen."""
+        with self._lock:
+            if self._construyendo:
+                self._pendientes.update(claves)
+        por_tipo: Dict[str, List[Any]] = {}
+        for tipo, id_registro in claves:
+            por_tipo.setdefault(tipo, []).append(id_registro)
+        db = self._session()
+        try:
+            for tipo, ids in por_tipo.items():
+                fuente = FUENTES[tipo]
+                filas = []
+                for chunk in chunked(ids):
+                    filas.extend(db.query(*fuente.columnas()).filter(fuente.pk.in_(chunk)).all())
+                encontrados = set()
+                for fila in filas:
+                    datos = dict(fila._mapping)
+                    encontrados.add(datos[fuente.pk.key])
+                    _indexar(self.indice, fuente, datos)
+                for id_registro in set(ids) - encontrados:
+                    self.indice.remove((tipo, id_registro))
+        finally:
+            db.close()
+
+    def search(
+        self,
+        q: str,
+        tipos: Sequence[str] = (),
+        limit: int = 20,
+        min_score: float = 0.5,
+    ) -> List[Dict[str, Any]]:
+        desconocidos = [tipo for tipo in tipos if tipo not in FUENTES]
+        if desconocidos:
+            raise ValueError(f"tipo no soportado: {', '.join(desconocidos)}. Opciones: {', '.join(FUENTES)}")
+        filtro = None
+        if tipos:
+            permitidos = set(tipos)
+            filtro = lambda doc: doc.clave[0] in permitidos  # noqa: E731
+        return [
+            {
+                "tipo": r.clave[0],
+                "id": r.clave[1],
+                "titulo": r.titulo,
+                "subtitulo": r.subtitulo,
+                "score": r.score,
+                "IdTransaccion": r.extra.get("IdTransaccion"),
+            }
+            for r in self.indice.search(q, limit=limit, min_score=min_score, filtro=filtro)
+        ]
+
+    def match(
+        self,
+        tipo: str,
+        q: str,
+        limit: int = 20,
+        min_score: float = 0.5,
+    ) -> Optional[List[Tuple[Any, float]]]:
+        """(id, score) de un solo tipo, o None si el índice todavía no está construido."""
+        if not self.listo:
+            return None
+        return [(hit["id"], hit["score"]) for hit in self.search(q, tipos=(tipo,), limit=limit, min_score=min_score)]
+
+    # --- ciclo de vida -------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            inicio = time.monotonic()
+            try:
+                self.build()
+            except Exception:
+                logger.exception("Error construyendo el índice de búsqueda")
+            espera = SEARCH_REBUILD_SECONDS if self.listo else 30
+            self._stop.wait(max(1.0, espera - (time.monotonic() - inicio)))
+
+
+search_service = SearchService()
+
+
+@change_events.on_commit
+def _registros_modificados(cambios: List[change_events.ChangeEvent]) -> None:
+    if not search_service.listo and not search_service.construyendo:
+        return
+    claves = []
+    for cambio in cambios:
+        fuente = _FUENTE_POR_ENTIDAD.get(cambio.entidad)
+        if fuente is None:
+            continue
+        id_registro = cambio.valores.get(fuente.pk.key)
+        if id_registro is None and cambio.identity:
+            id_registro = cambio.identity[0]
+        # Los borrados también pasan por reindexar: el registro ya no está y se quita
+        claves.append((fuente.tipo, id_registro))
+    if claves:
+        search_service.reindexar(claves)
+
+
+def start_search_index() -> None:
+    if SEARCH_INDEX_ENABLED:
+        search_service.start()
+
+
+def stop_search_index() -> None:
+    search_service.stop()
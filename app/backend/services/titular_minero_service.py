@@ -3,6 +3,8 @@ from backend.repositories.titular_minero_repositorie import TitularMineroReposit
 from backend.repositories.transaccion_repositorie import TransaccionRepositorie
 from backend.schemas.titular_minero_schema import TitularMineroCreate
 from backend.schemas.transaccion_schema import TransaccionCreate
+from backend.services.search_index import normalizar_documento, parece_documento
+from backend.services.search_service import search_service
 from datetime import datetime
 
 class TitularMineroService:
@@ -16,6 +18,27 @@ class TitularMineroService:
     def get_by_id(self, id_titular: int):
         return self.repository.get_by_id(id_titular)
 
+    def get_by_dni_cuit(self, dni_cuit: str):
+        """Titulares con ese DNI/CUIT, escrito tal cual o con otros separadores."""
+        normalizado = normalizar_documento(dni_cuit)
+        if not normalizado:
+            raise ValueError("DNI/CUIT vacío")
+        return self.repository.get_by_dni_cuit(dni_cuit.strip(), normalizado)
+
+    def search(self, q: str, limit: int = 20, min_score: float = 0.5):
+        """
+        [(titular, score)]. Si `q` parece un documento se busca por DniCuit; si no, por
+        similitud de trigramas sobre el nombre normalizado (sin acentos, tolera errores de
+        tipeo). Mientras el índice se construye cae a un ILIKE sin score.
+        """
+        if parece_documento(q):
+            return [(titular, 1.0) for titular in self.get_by_dni_cuit(q)[:limit]]
+        coincidencias = search_service.match("titular", q, limit=limit, min_score=min_score)
+        if coincidencias is None:
+            return [(titular, None) for titular in self.repository.search_by_nombre(q, limit)]
+        scores = dict(coincidencias)
+        return [(titular, scores[titular.IdTitular]) for titular in self.repository.get_by_ids(list(scores))]
+
     def create(self, titular_data: TitularMineroCreate):
         # Crear una nueva transacción si no se proporciona IdTransaccion
         if not titular_data.IdTransaccion:
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from backend.database.chunks import chunked
+from backend.models.alerta_model import Alerta
+from backend.models.archivo_model import Archivo
+from backend.models.observaciones_model import Observaciones
+from backend.repositories.transaccion_repositorie import TABLAS, TransaccionRepositorie
+
+# Entidades colgadas de cualquier nodo por IdTransaccion
+INCLUDES = {
+    "alertas": Alerta,
+    "observaciones": Observaciones,
+    "archivos": Archivo,
+}
+
+
+def _to_dict(obj) -> Dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def parse_includes(include: Optional[str]) -> List[str]:
+    """Convierte 'alertas,archivos' en una lista validada; lanza ValueError si hay nombres desconocidos."""
+    if not include:
+        return []
+    nombres = [nombre.strip().lower() for nombre in include.split(",") if nombre.strip()]
+    desconocidos = [nombre for nombre in nombres if nombre not in INCLUDES]
+    if desconocidos:
+        raise ValueError(
+            f"include no soportado: {', '.join(desconocidos)}. Opciones: {', '.join(INCLUDES)}"
+        )
+    return list(dict.fromkeys(nombres))
+
+
+class TransaccionArbolService:
+    """
+    Arma el legajo completo debajo de una transacción (titular, propiedad, expediente...)
+    con una consulta por la jerarquía y una consulta IN por cada tabla involucrada,
+    en lugar de recorrerlo nivel por nivel desde el frontend.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = TransaccionRepositorie(db)
+
+    def _load_by_transaccion(self, model, ids: Sequence[int]) -> Iterable[Any]:
+        for chunk in chunked(ids):
+            yield from self.db.query(model).filter(model.IdTransaccion.in_(chunk)).all()
+
+    def get_tree(
+        self,
+        id_transaccion: int,
+        depth: Optional[int] = None,
+        includes: Sequence[str] = (),
+    ) -> Optional[Dict[str, Any]]:
+        raiz = self.repo.get(id_transaccion)
+        if raiz is None:
+            return None
+
+        # Una sola consulta sobre la tabla de clausura resuelve todo el subárbol
+        filas = [(raiz, 0)] + self.repo.get_descendants(id_transaccion, max_depth=depth)
+
+        ids_por_tabla: Dict[str, List[int]] = defaultdict(list)
+        for transaccion, _ in filas:
+            ids_por_tabla[transaccion.Tabla].append(transaccion.IdTransaccion)
+
+        registros: Dict[int, Dict[str, Any]] = {}
+        for tabla, ids in ids_por_tabla.items():
+            model = TABLAS.get(tabla)
+            if model is None:
+                continue
+            for obj in self._load_by_transaccion(model, ids):
+                registros[obj.IdTransaccion] = _to_dict(obj)
+
+        todos_los_ids = [transaccion.IdTransaccion for transaccion, _ in filas]
+        adjuntos: Dict[str, Dict[int, List[Dict[str, Any]]]] = {}
+        for nombre in includes:
+            por_transaccion: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+            for obj in self._load_by_transaccion(INCLUDES[nombre], todos_los_ids):
+                por_transaccion[obj.IdTransaccion].append(_to_dict(obj))
+            adjuntos[nombre] = por_transaccion
+
+        nodos: Dict[int, Dict[str, Any]] = {}
+        for transaccion, profundidad in filas:
+            nodo = {
+                "IdTransaccion": transaccion.IdTransaccion,
+                "IdTransaccionPadre": transaccion.IdTransaccionPadre,
+                "Tabla": transaccion.Tabla,
+                "IdRegistro": transaccion.IdRegistro,
+                "Descripcion": transaccion.Descripcion,
+                "Profundidad": profundidad,
+                "registro": registros.get(transaccion.IdTransaccion),
+                "hijos": [],
+            }
+            for nombre in includes:
+                nodo[nombre] = adjuntos[nombre].get(transaccion.IdTransaccion, [])
+            nodos[transaccion.IdTransaccion] = nodo
+
+        # Las filas vienen ordenadas por profundidad: el padre siempre está antes que sus hijos
+        for transaccion, profundidad in filas[1:]:
+            padre = nodos.get(transaccion.IdTransaccionPadre)
+            if padre is not None:
+                padre["hijos"].append(nodos[transaccion.IdTransaccion])
+        return nodos[raiz.IdTransaccion]
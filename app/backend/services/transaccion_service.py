@@ -1,7 +1,76 @@
+import os
+import threading
 from sqlalchemy.orm import Session
+from backend.database import change_events
 from backend.repositories.transaccion_repositorie import TransaccionRepositorie
 from backend.schemas.transaccion_schema import TransaccionCreate, TransaccionUpdate
-from typing import List, Dict, Any
+from backend.services.cache_utils import TTLCache
+from typing import Iterable, List, Dict, Any, Optional, Set, Tuple
+
+INFO_TRANSACCION_CACHE_TTL_SECONDS = int(os.getenv("INFO_TRANSACCION_CACHE_TTL_SECONDS", "60"))
+INFO_TRANSACCION_CACHE_MAX = int(os.getenv("INFO_TRANSACCION_CACHE_MAX", "2048"))
+
+
+class InformacionTransaccionCache:
+    """
+    Resultados de InformacionTransaccion por (tabla, id_transaccion).
+
+    Cada entrada recuerda los ids de su subárbol (tabla de clausura) para poder
+    invalidarla cuando cambia cualquier fila colgada de él, sin consultar la base
+    en el momento del commit. Es por proceso: en otros workers vence por TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._cache: TTLCache[List[Dict[str, Any]]] = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._por_transaccion: Dict[int, Set[Tuple[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tabla: str, id_transaccion: int) -> Optional[List[Dict[str, Any]]]:
+        return self._cache.get((tabla, id_transaccion))
+
+    def set(self, tabla: str, id_transaccion: int, filas: List[Dict[str, Any]], subarbol: Iterable[int]) -> None:
+        key = (tabla, id_transaccion)
+        with self._lock:
+            if len(self._por_transaccion) > self._cache.maxsize * 20:
+                # El índice inverso no se entera de los desalojos del LRU: se reinicia entero
+                self._por_transaccion.clear()
+                self._cache.clear()
+            for id_nodo in subarbol:
+                self._por_transaccion.setdefault(id_nodo, set()).add(key)
+            self._cache.set(key, filas)
+
+    def invalidate(self, ids_transaccion: Iterable[int]) -> None:
+        with self._lock:
+            for id_nodo in ids_transaccion:
+                for key in self._por_transaccion.pop(id_nodo, ()):
+                    self._cache.invalidate(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._por_transaccion.clear()
+            self._cache.clear()
+
+
+informacion_cache = InformacionTransaccionCache(
+    maxsize=INFO_TRANSACCION_CACHE_MAX, ttl_seconds=INFO_TRANSACCION_CACHE_TTL_SECONDS
+)
+
+
+@change_events.on_commit
+def _invalidar_informacion(cambios: List[change_events.ChangeEvent]) -> None:
+    ids: Set[int] = set()
+    for cambio in cambios:
+        if cambio.entidad == "Transaccion":
+            # Un nodo nuevo o movido cambia el subárbol de su padre (actual y anterior)
+            ids.add(cambio.valores.get("IdTransaccion"))
+            ids.add(cambio.valores.get("IdTransaccionPadre"))
+            ids.add(cambio.anteriores.get("IdTransaccionPadre"))
+        else:
+            ids.add(cambio.valores.get("IdTransaccion"))
+            ids.add(cambio.anteriores.get("IdTransaccion"))
+    ids.discard(None)
+    if ids:
+        informacion_cache.invalidate(ids)
 
 class TransaccionService:
     def __init__(self, db: Session):
@@ -22,8 +91,42 @@ class TransaccionService:
     def delete_transaccion(self, id_transaccion: int):
         return self.repo.delete(id_transaccion)
     
+    def get_descendants(self, id_transaccion: int, max_depth: Optional[int] = None, tabla: Optional[str] = None):
+        return self.repo.get_descendants(id_transaccion, max_depth, tabla)
+
+    def get_ancestors(self, id_transaccion: int):
+        return self.repo.get_ancestors(id_transaccion)
+
     def get_informacion_transaccion(self, tabla: str, id_transaccion: int) -> List[Dict[str, Any]]:
         """
-        Obtiene información de transacciones usando el procedure InformacionTransaccion
+        Obtiene información de transacciones usando el procedure InformacionTransaccion,
+        con cache por (tabla, id_transaccion) que se invalida al cambiar el subárbol.
+        """
+        filas = informacion_cache.get(tabla, id_transaccion)
+        if filas is None:
+            filas = self.repo.get_informacion_transaccion(tabla, id_transaccion)
+            informacion_cache.set(tabla, id_transaccion, filas, self.repo.get_descendant_ids(id_transaccion))
+        return filas
+
+    def get_informacion_transacciones(self, tabla: str, ids_transaccion: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Variante por lote para los listados: los ids que no están en cache se resuelven
+        juntos, con un batch de EXEC y una consulta de subárboles por tanda, y recién
+        después se guardan en cache uno por uno.
         """
-        return self.repo.get_informacion_transaccion(tabla, id_transaccion)
+        ids = list(dict.fromkeys(ids_transaccion))
+        resultado: Dict[int, List[Dict[str, Any]]] = {}
+        faltantes: List[int] = []
+        for id_transaccion in ids:
+            filas = informacion_cache.get(tabla, id_transaccion)
+            if filas is None:
+                faltantes.append(id_transaccion)
+            else:
+                resultado[id_transaccion] = filas
+        if faltantes:
+            nuevas = self.repo.get_informacion_transacciones(tabla, faltantes)
+            subarboles = self.repo.get_descendant_ids_lote(faltantes)
+            for id_transaccion in faltantes:
+                informacion_cache.set(tabla, id_transaccion, nuevas[id_transaccion], subarboles[id_transaccion])
+                resultado[id_transaccion] = nuevas[id_transaccion]
+        return {id_transaccion: resultado[id_transaccion] for id_transaccion in ids}
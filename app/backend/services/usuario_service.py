@@ -3,6 +3,7 @@ from backend.repositories.usuario_repositorie import UsuarioRepositorie
 from backend.schemas.usuario_schema import UsuarioCreate, UsuarioUpdate, UsuarioLogin
 from backend.models.usuario_model import Usuario
 from datetime import datetime
+from backend.services.audit_logger import invalidar_cache_usuario
 
 def get_usuario(db: Session, id: int):
     repo = UsuarioRepositorie(db)
@@ -50,11 +51,15 @@ def update_usuario(db: Session, id: int, usuario_update: UsuarioUpdate):
         if existing_email and existing_email.IdUsuario != id:
             raise ValueError("El email ya existe")
     
-    return repo.update(id, usuario_update.dict(exclude_unset=True))
+    usuario = repo.update(id, usuario_update.dict(exclude_unset=True))
+    invalidar_cache_usuario(id)
+    return usuario
 
 def delete_usuario(db: Session, id: int):
     repo = UsuarioRepositorie(db)
-    return repo.delete(id)
+    eliminado = repo.delete(id)
+    invalidar_cache_usuario(id)
+    return eliminado
 
 def authenticate_usuario(db: Session, usuario_login: UsuarioLogin):
     """Autentica por nombre de usuario o email y actualiza última conexión"""
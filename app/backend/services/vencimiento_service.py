@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from backend.repositories.vencimiento_repositorie import TIPOS, VencimientoRepositorie
+
+VENTANA_POR_DEFECTO_DIAS = 7
+
+
+class VencimientoService:
+    def __init__(self, db: Session):
+        self.repo = VencimientoRepositorie(db)
+
+    def list_vencimientos(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        limit: int = 100,
+        cursor=None,
+        tipos: Sequence[str] = TIPOS,
+        id_estado: Optional[int] = None,
+        cod_exp: Optional[str] = None,
+    ):
+        """Por defecto, lo que vence desde ahora hasta dentro de una semana."""
+        desde = desde or datetime.now()
+        hasta = hasta or desde + timedelta(days=VENTANA_POR_DEFECTO_DIAS)
+        if hasta <= desde:
+            raise ValueError("'hasta' debe ser posterior a 'desde'")
+        desconocidos = [tipo for tipo in tipos if tipo not in TIPOS]
+        if desconocidos:
+            raise ValueError(f"tipo no soportado: {', '.join(desconocidos)}. Opciones: {', '.join(TIPOS)}")
+        return self.repo.get_page(desde, hasta, limit, cursor, tipos or TIPOS, id_estado, cod_exp)
@@ -268,9 +268,15 @@ export class ActasComponent implements OnInit {
   }
 
   onEditarActa(acta: Acta) {
-    this.actaEdit = { ...acta };
-    this.editando = true;
-    this.mostrarFormulario = true;
+    // El listado no trae Obs: se edita sobre el detalle completo
+    this.actaService.getById(acta.IdActa).subscribe({
+      next: (detalle) => {
+        this.actaEdit = { ...detalle };
+        this.editando = true;
+        this.mostrarFormulario = true;
+      },
+      error: (error) => console.error('Error al cargar acta:', error)
+    });
   }
 
   onActualizarActa(acta: Acta) {
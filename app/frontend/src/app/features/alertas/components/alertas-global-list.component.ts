@@ -1,4 +1,6 @@
-import { Component, OnInit } from '@angular/core';
+import { Component, OnDestroy, OnInit } from '@angular/core';
+import { Subscription } from 'rxjs';
+import { debounceTime } from 'rxjs/operators';
 import { CommonModule } from '@angular/common';
 import { FormsModule } from '@angular/forms';
 import { MatTableModule } from '@angular/material/table';
@@ -9,6 +11,7 @@ import { MatFormFieldModule } from '@angular/material/form-field';
 import { MatButtonModule } from '@angular/material/button';
 import { MatIconModule } from '@angular/material/icon';
 import { AlertaGlobalService } from '../services/alerta-global.service';
+import { AlertaEventsService } from '../services/alerta-events.service';
 import { EstadoAlertaService } from '../services/estado-alerta.service';
 import { EstadoAlerta } from '../models/estado-alerta.model';
 
@@ -142,7 +145,7 @@ import { EstadoAlerta } from '../models/estado-alerta.model';
     .no-data { color: #888; font-style: italic; margin-top: 16px; }
   `]
 })
-export class AlertasGlobalListComponent implements OnInit {
+export class AlertasGlobalListComponent implements OnInit, OnDestroy {
   alertas: any[] = [];
   totalAlertas = 0;
   pageSize = 10;
@@ -162,14 +165,31 @@ export class AlertasGlobalListComponent implements OnInit {
     return Math.ceil(this.totalAlertas / this.pageSize);
   }
 
+  private eventosSub?: Subscription;
+
   constructor(
     private alertaGlobalService: AlertaGlobalService,
-    private estadoAlertaService: EstadoAlertaService
+    private estadoAlertaService: EstadoAlertaService,
+    private alertaEventsService: AlertaEventsService
   ) {}
 
   ngOnInit() {
     this.loadEstadosAlerta();
     this.loadAlertas();
+    this.suscribirEventos();
+  }
+
+  ngOnDestroy() {
+    this.eventosSub?.unsubscribe();
+  }
+
+  // Recarga la página actual cuando el backend avisa cambios, en lugar de re-consultar periódicamente
+  suscribirEventos() {
+    this.eventosSub?.unsubscribe();
+    this.eventosSub = this.alertaEventsService
+      .stream({ idEstado: this.selectedEstado })
+      .pipe(debounceTime(300))
+      .subscribe(() => this.loadAlertas(this.currentPage, this.pageSize));
   }
 
   loadEstadosAlerta() {
@@ -213,6 +233,7 @@ export class AlertasGlobalListComponent implements OnInit {
   onFilterChange() {
     this.currentPage = 0;
     this.loadAlertas(0, this.pageSize);
+    this.suscribirEventos();
   }
 
   clearFilter() {
@@ -1,4 +1,6 @@
-import { Component, Input, OnInit, OnChanges, SimpleChanges } from '@angular/core';
+import { Component, Input, OnInit, OnChanges, OnDestroy, SimpleChanges } from '@angular/core';
+import { Subscription } from 'rxjs';
+import { debounceTime } from 'rxjs/operators';
 import { CommonModule } from '@angular/common';
 import { MatTableModule, MatTableDataSource } from '@angular/material/table';
 import { MatButtonModule } from '@angular/material/button';
@@ -10,6 +12,7 @@ import { MatPaginatorModule, PageEvent } from '@angular/material/paginator';
 import { AlertaCreateComponent } from '../components/alerta-create.component';
 import { AlertaEditComponent } from './alerta-edit.component';
 import { AlertaService } from '../services/alerta.service';
+import { AlertaEventsService } from '../services/alerta-events.service';
 import { EstadoAlertaService } from '../services/estado-alerta.service';
 import type { EstadoAlerta } from '../models/estado-alerta.model';
 
@@ -142,7 +145,7 @@ import type { EstadoAlerta } from '../models/estado-alerta.model';
     .clickable-row:hover { background: #e6f2ed; }
   `]
 })
-export class AlertasListComponent implements OnInit, OnChanges {
+export class AlertasListComponent implements OnInit, OnChanges, OnDestroy {
   alertas: any[] = [];
   dataSource = new MatTableDataSource<any>([]);
   totalAlertas = 0;
@@ -167,9 +170,12 @@ export class AlertasListComponent implements OnInit, OnChanges {
   alertaEdit: any = null;
   displayedColumns: string[] = ['Fecha de Creación', 'Estado', 'Asunto', 'Mensaje', 'Medio','Destinatarios', 'actions'];
 
+  private eventosSub?: Subscription;
+
   constructor(
     private alertaService: AlertaService,
-    private estadoAlertaService: EstadoAlertaService
+    private estadoAlertaService: EstadoAlertaService,
+    private alertaEventsService: AlertaEventsService
   ) {}
 
   ngOnInit() {
@@ -178,6 +184,7 @@ export class AlertasListComponent implements OnInit, OnChanges {
     });
     if (this.idTransaccion) {
       this.loadAlertas();
+      this.suscribirEventos();
     }
   }
 
@@ -185,9 +192,24 @@ export class AlertasListComponent implements OnInit, OnChanges {
     if (changes['idTransaccion'] && changes['idTransaccion'].currentValue) {
       this.currentPage = 0;
       this.loadAlertas(0, this.pageSize);
+      this.suscribirEventos();
     }
   }
 
+  ngOnDestroy() {
+    this.eventosSub?.unsubscribe();
+  }
+
+  // Solo los cambios de alertas de esta transacción recargan la lista
+  suscribirEventos() {
+    this.eventosSub?.unsubscribe();
+    if (!this.idTransaccion) return;
+    this.eventosSub = this.alertaEventsService
+      .stream({ idTransaccion: this.idTransaccion })
+      .pipe(debounceTime(300))
+      .subscribe(() => this.loadAlertas(this.currentPage, this.pageSize));
+  }
+
   loadAlertas(page: number = 0, size: number = this.pageSize) {
     if (!this.idTransaccion) return;
     this.loading = true;
@@ -250,9 +272,15 @@ export class AlertasListComponent implements OnInit, OnChanges {
   }
 
   onEditarAlerta(alerta: any) {
-    this.alertaEdit = { ...alerta };
-    this.editando = true;
-    this.mostrarFormulario = true;
+    // El listado no trae Obs: se edita sobre la alerta completa
+    this.alertaService.getAlerta(alerta.idAlerta).subscribe({
+      next: (detalle) => {
+        this.alertaEdit = { ...detalle };
+        this.editando = true;
+        this.mostrarFormulario = true;
+      },
+      error: (error) => console.error('Error al cargar alerta:', error)
+    });
   }
 
   getEstadoNombre(idEstado: number): string {
@@ -0,0 +1,48 @@
+import { Injectable } from '@angular/core';
+import { Observable } from 'rxjs';
+import { API_BASE_URL } from '../../../core/api.constants';
+
+export interface AlertaEvento {
+  IdEvento: number;
+  Tipo: 'alerta_creada' | 'alerta_modificada' | 'alerta_estado' | 'alerta_eliminada';
+  IdAlerta: number;
+  Fecha: string;
+  IdEstadoAnterior?: number | null;
+  IdEstado?: number | null;
+  IdTransaccion?: number | null;
+  Asunto?: string | null;
+}
+
+const TIPOS_EVENTO = ['alerta_creada', 'alerta_modificada', 'alerta_estado', 'alerta_eliminada'];
+
+@Injectable({ providedIn: 'root' })
+export class AlertaEventsService {
+  private readonly baseUrl = `${API_BASE_URL}/alertas/stream`;
+
+  /**
+   * Cambios de alertas por server-sent events. EventSource reconecta solo y manda
+   * Last-Event-ID, así el backend reenvía lo que pasó mientras estuvo desconectado.
+   */
+  stream(filtros: { idEstado?: number | string | null; idTransaccion?: number | null } = {}): Observable<AlertaEvento> {
+    return new Observable<AlertaEvento>((subscriber) => {
+      const params = new URLSearchParams();
+      const token = localStorage.getItem('jwt_token');
+      if (token) params.set('token', token);
+      if (filtros.idEstado !== undefined && filtros.idEstado !== null && filtros.idEstado !== '') {
+        params.set('id_estado', String(filtros.idEstado));
+      }
+      if (filtros.idTransaccion) params.set('id_transaccion', String(filtros.idTransaccion));
+
+      const source = new EventSource(`${this.baseUrl}?${params.toString()}`);
+      const onEvent = (event: MessageEvent) => {
+        try {
+          subscriber.next(JSON.parse(event.data));
+        } catch {
+          // evento malformado: se ignora
+        }
+      };
+      TIPOS_EVENTO.forEach((tipo) => source.addEventListener(tipo, onEvent as EventListener));
+      return () => source.close();
+    });
+  }
+}
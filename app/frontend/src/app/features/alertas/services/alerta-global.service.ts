@@ -13,7 +13,9 @@ export class AlertaGlobalService {
   getAllPaginated(page: number = 0, size: number = 10, idEstado?: string): Observable<{ data: any[]; total: number }> {
     const start = page * size;
     const end = start + size - 1;
-    let params = new HttpParams().set('range', `[${start},${end}]`);
+    let params = new HttpParams()
+      .set('range', `[${start},${end}]`)
+      .set('sort', '["AudFecha","DESC"]'); // mismo orden que muestra la tabla
     
     // Agregar filtro por estado si existe
     if (idEstado && idEstado !== '') {
@@ -19,6 +19,10 @@ export class AlertaService {
     return this.http.post<any>(`${API_BASE_URL}/notificaciones/${idNotificacion}/alertas`, alerta);
   }
 
+  getAlerta(id: number): Observable<any> {
+    return this.http.get<any>(`${this.baseUrl}/${id}`);
+  }
+
   updateAlerta(id: number, alerta: Partial<AlertaCreate>): Observable<any> {
     return this.http.put<any>(`${this.baseUrl}/${id}`, alerta);
   }
@@ -26,7 +30,9 @@ export class AlertaService {
   getByActaId(idActa: number, page: number = 0, size: number = 10, idEstado?: number): Observable<{ data: any[]; total: number }> {
     const start = page * size;
     const end = start + size - 1;
-    let params = new HttpParams().set('range', `[${start},${end}]`);
+    let params = new HttpParams()
+      .set('range', `[${start},${end}]`)
+      .set('sort', '["AudFecha","DESC"]'); // mismo orden que muestra la tabla
     if (idEstado !== undefined) {
       params = params.set('id_estado', idEstado.toString());
     }
@@ -44,7 +50,9 @@ export class AlertaService {
   getByResolucionId(idResolucion: number, page: number = 0, size: number = 10): Observable<{ data: any[]; total: number }> {
     const start = page * size;
     const end = start + size - 1;
-    let params = new HttpParams().set('range', `[${start},${end}]`);
+    let params = new HttpParams()
+      .set('range', `[${start},${end}]`)
+      .set('sort', '["AudFecha","DESC"]'); // mismo orden que muestra la tabla
     return this.http
       .get<any[]>(`${this.baseUrl}/by-parent?tipo_padre=resolucion&id_padre=${idResolucion}`, { params, observe: 'response' })
       .pipe(
@@ -59,7 +67,9 @@ export class AlertaService {
   getByParent(tipoPadre: string, idPadre: number, page: number = 0, size: number = 10): Observable<{ data: any[]; total: number }> {
     const start = page * size;
     const end = start + size - 1;
-    let params = new HttpParams().set('range', `[${start},${end}]`);
+    let params = new HttpParams()
+      .set('range', `[${start},${end}]`)
+      .set('sort', '["AudFecha","DESC"]'); // mismo orden que muestra la tabla
     return this.http
       .get<any[]>(`${this.baseUrl}/by-parent?tipo_padre=${tipoPadre}&id_padre=${idPadre}`, { params, observe: 'response' })
       .pipe(
@@ -74,7 +84,9 @@ export class AlertaService {
   getByTransaccion(idTransaccion: number, page: number = 0, size: number = 10): Observable<{ data: any[]; total: number }> {
     const start = page * size;
     const end = start + size - 1;
-    let params = new HttpParams().set('range', `[${start},${end}]`);
+    let params = new HttpParams()
+      .set('range', `[${start},${end}]`)
+      .set('sort', '["AudFecha","DESC"]'); // mismo orden que muestra la tabla
     return this.http
       .get<any[]>(`${this.baseUrl}/by-transaccion/${idTransaccion}`, { params, observe: 'response' })
       .pipe(
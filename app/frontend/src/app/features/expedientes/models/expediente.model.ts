@@ -67,3 +67,10 @@ export interface ExpedienteResponse {
   total: number;
   range: string;
 }
+
+export interface ExpedienteSuggest {
+  IdExpediente: number;
+  CodigoExpediente: string;
+  Caratula?: string;
+  IdTransaccion?: number;
+}
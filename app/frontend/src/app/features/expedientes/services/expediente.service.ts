@@ -2,7 +2,7 @@ import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams, HttpResponse } from '@angular/common/http';
 import { Observable } from 'rxjs';
 import { map } from 'rxjs/operators';
-import { Expediente, ExpedienteCreate, ExpedienteFilter, ExpedienteResponse } from '../models/expediente.model';
+import { Expediente, ExpedienteCreate, ExpedienteFilter, ExpedienteResponse, ExpedienteSuggest } from '../models/expediente.model';
 import { API_BASE_URL } from '../../../core/api.constants';
 
 @Injectable({
@@ -61,6 +61,14 @@ export class ExpedienteService {
     );
   }
 
+  /**
+   * Sugerencias de expedientes cuyo código empieza con el prefijo (resueltas en memoria en el backend)
+   */
+  suggestExpedientes(prefix: string, limit: number = 10): Observable<ExpedienteSuggest[]> {
+    const params = new HttpParams().set('prefix', prefix).set('limit', limit.toString());
+    return this.http.get<ExpedienteSuggest[]>(`${this.baseUrl}/suggest`, { params });
+  }
+
   /**
    * Obtiene un expediente por ID
    */
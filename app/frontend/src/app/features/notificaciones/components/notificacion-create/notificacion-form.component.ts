@@ -13,7 +13,7 @@ import { MatIconModule } from '@angular/material/icon';
 import { ExpedienteService } from '../../../expedientes/services/expediente.service';
 import { TitularMineroService } from '../../../titulares/services/titular.service';
 import { Observable, of } from 'rxjs';
-import { debounceTime, switchMap, startWith, map } from 'rxjs/operators';
+import { debounceTime, switchMap, startWith, map, catchError, tap } from 'rxjs/operators';
 
 @Component({
   selector: 'app-notificacion-form',
@@ -592,7 +592,6 @@ export class NotificacionFormComponent implements OnInit {
 
   ngOnInit() {
     this.initForm();
-    this.loadExpedientes();
     this.loadTitulares();
     this.setupExpedienteAutocomplete();
     this.setupTitularAutocomplete();
@@ -649,19 +648,6 @@ export class NotificacionFormComponent implements OnInit {
     });
   }
 
-  private loadExpedientes() {
-    this.expedienteService.getExpedientes(0, 1000).subscribe({
-      next: (response) => {
-        this.expedientes = response.data || [];
-        console.log('[DEBUG] Expedientes cargados:', response.data);
-      },
-      error: (error) => {
-        console.error('Error al cargar expedientes:', error);
-        this.expedientes = [];
-      }
-    });
-  }
-
   private loadTitulares() {
     console.log('Cargando titulares...');
     this.titularService.getAll().subscribe({
@@ -689,27 +675,25 @@ export class NotificacionFormComponent implements OnInit {
   }
 
   private setupExpedienteAutocomplete() {
+    // Las sugerencias salen de /expedientes/suggest, que responde desde memoria
     this.expedientesFiltrados$ = this.expedienteControl.valueChanges.pipe(
-      startWith(''),
-      debounceTime(300),
-      map(value => this.filtrarExpedientes(value || ''))
+      debounceTime(150),
+      switchMap(value => {
+        const prefijo = (value || '').trim();
+        if (!prefijo || this.modo === 'editar') {
+          return of([]);
+        }
+        return this.expedienteService.suggestExpedientes(prefijo).pipe(
+          catchError(error => {
+            console.error('Error al buscar expedientes:', error);
+            return of([]);
+          })
+        );
+      }),
+      tap(sugerencias => this.expedientes = sugerencias)
     );
   }
 
-  private filtrarExpedientes(valor: string): any[] {
-    if (!valor || !this.expedientes.length) {
-      return this.expedientes.slice(0, 10); // Mostrar primeros 10
-    }
-
-    const filtro = valor.toLowerCase();
-    return this.expedientes
-      .filter(exp => 
-        exp.CodigoExpediente?.toLowerCase().includes(filtro) ||
-        exp.Caratula?.toLowerCase().includes(filtro)
-      )
-      .slice(0, 10);
-  }
-
   onExpedienteSelected(event: any) {
     const codigoSeleccionado = event.option.value;
     this.expedienteSeleccionado = this.expedientes.find(exp => 
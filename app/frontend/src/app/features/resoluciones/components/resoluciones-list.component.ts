@@ -264,9 +264,15 @@ export class ResolucionesListComponent implements OnInit {
     this.router.navigate(['/expedientes', this.idExpediente, 'resolucion', resolucion.IdResolucion]);
   }
   editarResolucion(resolucion: Resolucion) {
-    this.resolucionEdit = { ...resolucion };
-    this.editando = true;
-    this.mostrarFormulario = true;
+    // El listado no trae Contenido, Descripcion ni Observaciones: se edita sobre el detalle completo
+    this.resolucionService.getResolucionById(resolucion.IdResolucion).subscribe({
+      next: (detalle) => {
+        this.resolucionEdit = { ...detalle };
+        this.editando = true;
+        this.mostrarFormulario = true;
+      },
+      error: (error) => console.error('Error al cargar resolución:', error)
+    });
   }
   onActualizarResolucion(resolucion: Resolucion) {
     if (!resolucion.IdResolucion) return;
@@ -20,6 +20,16 @@ from backend.controllers.req_minero_mov_controller import router as req_minero_m
 from backend.controllers.req_minero_controller import router as req_minero_router
 from backend.controllers.periodicidad_alerta_controller import router as periodicidad_alerta_router
 from backend.controllers.usuario_controller import router as usuario_router
+from backend.controllers.report_job_controller import router as report_job_router
+from backend.controllers.health_controller import router as health_router
+from backend.controllers.vencimiento_controller import router as vencimiento_router
+from backend.controllers.search_controller import router as search_router
+from backend.controllers.diagnostics_controller import router as diagnostics_router
+from backend.services.report_job_service import shutdown_executor as shutdown_report_jobs
+from backend.services.alerta_scheduler import start_alert_scheduler, stop_alert_scheduler
+from backend.services.search_service import start_search_index, stop_search_index
+from backend.services.fulltext_service import start_fulltext_sidecar, stop_fulltext_sidecar
+from backend.services.expediente_suggest_service import start_expediente_suggest, stop_expediente_suggest
 
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -35,7 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Range"],
+    expose_headers=["Content-Range", "X-Next-Cursor"],
 )
 
 
@@ -60,3 +70,53 @@ app.include_router(req_minero_mov_router)
 app.include_router(req_minero_router)
 app.include_router(periodicidad_alerta_router)
 app.include_router(usuario_router)
+app.include_router(report_job_router)
+app.include_router(health_router)
+app.include_router(vencimiento_router)
+app.include_router(search_router)
+app.include_router(diagnostics_router)
+
+
+@app.on_event("startup")
+def _start_alert_scheduler():
+    start_alert_scheduler()
+
+
+@app.on_event("shutdown")
+def _shutdown_report_jobs():
+    shutdown_report_jobs()
+
+
+@app.on_event("shutdown")
+def _stop_alert_scheduler():
+    stop_alert_scheduler()
+
+
+@app.on_event("startup")
+def _start_search_index():
+    start_search_index()
+
+
+@app.on_event("shutdown")
+def _stop_search_index():
+    stop_search_index()
+
+
+@app.on_event("startup")
+def _start_fulltext_sidecar():
+    start_fulltext_sidecar()
+
+
+@app.on_event("shutdown")
+def _stop_fulltext_sidecar():
+    stop_fulltext_sidecar()
+
+
+@app.on_event("startup")
+def _start_expediente_suggest():
+    start_expediente_suggest()
+
+
+@app.on_event("shutdown")
+def _stop_expediente_suggest():
+    stop_expediente_suggest()